@@ -17,17 +17,51 @@
 # along with this code.  If not, see <http://www.gnu.org/licenses/>.
 # ------------------------------------------------------------------------
 
+from multiprocessing import Pool, cpu_count
+
 from pyisc import AnomalyDetector, SklearnClassifier
 from sklearn import utils
 import numpy as np
 
 
+# The clustering and the data used by the restarts in a worker process, set once per process by _init_restart_worker
+_worker_clustering = None
+_worker_X = None
+
+
+def _init_restart_worker(clustering_type, n_clusters, ad_parms0, ad_parms1, settings, X):
+    global _worker_clustering, _worker_X
+    _worker_clustering = clustering_type(n_clusters, 1, *ad_parms0, **ad_parms1)
+    for name, value in settings.items():
+        setattr(_worker_clustering, name, value)
+    _worker_X = X
+
+
+def _run_restart(args):
+    seed, verbose = args
+    np.random.seed(seed)
+    return _worker_clustering._restart(_worker_X, verbose)
+
+
 class AnomalyClustering(AnomalyDetector):
     max_num_of_iterations = 1000
+    # If True, only the rows that are moved to another cluster are untrained and trained in each iteration
+    incremental_reassignment = True
 
-    def __init__(self, n_clusters=2, n_repeat=10, *anomaly_detector_params0, **anomaly_detector_params1):
+    def __init__(self, n_clusters=2, n_repeat=10, *anomaly_detector_params0, n_jobs=1, **anomaly_detector_params1):
+        '''
+        Clusters the data so that the log likelihood of the data given an anomaly detector trained with the clusters as
+        classes is maximized.
+
+        :param n_clusters: the number of clusters
+        :param n_repeat: the number of times the clustering is restarted from a random clustering
+        :param anomaly_detector_params0: the same parameters as in the pyisc.AnomalyDetector
+        :param n_jobs: the number of processes used for running the restarts, -1 means using all processors
+        :param anomaly_detector_params1: the same parameters as in the pyisc.AnomalyDetector
+        '''
         self.n_clusters = n_clusters
         self.n_repeat = n_repeat
+        self.n_jobs = n_jobs
         self.ad_parms0 = anomaly_detector_params0
         self.ad_parms1 = anomaly_detector_params1
         self.clf_ = None
@@ -40,15 +74,25 @@ class AnomalyClustering(AnomalyDetector):
         return AnomalyDetector.fit(self, X, y)
 
     def fit(self,X,verbose=False):
-        ss =[]
-        labels_list = []
-        for i in range(self.n_repeat):
-            od = self._create_detector(*self.ad_parms0, **self.ad_parms1)
-            labels = self._train_clf(od, X, self.n_clusters,verbose=verbose)
-
-            ss += [od.loglikelihood(X,labels)]
-
-            labels_list += [labels]
+        n_jobs = cpu_count() + 1 + self.n_jobs if self.n_jobs < 0 else self.n_jobs
+        if n_jobs > 1 and self.n_repeat > 1:
+            # Each restart is run in its own process with its own random seed. Only the constructor parameters and the
+            # data are sent to the processes, once per process, instead of the whole clustering for each restart.
+            seeds = np.random.randint(0, 2**31 - 1, self.n_repeat)
+            settings = {'incremental_reassignment': self.incremental_reassignment,
+                        'max_num_of_iterations': self.max_num_of_iterations}
+            pool = Pool(min(n_jobs, self.n_repeat), _init_restart_worker,
+                        (type(self), self.n_clusters, self.ad_parms0, self.ad_parms1, settings, X))
+            try:
+                results = pool.map(_run_restart, [(seed, verbose) for seed in seeds])
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [self._restart(X, verbose) for _ in range(self.n_repeat)]
+
+        ss = [loglikelihood for loglikelihood, _ in results]
+        labels_list = [labels for _, labels in results]
 
         #print ss, labels
 
@@ -60,6 +104,12 @@ class AnomalyClustering(AnomalyDetector):
 
 
 
+    def _restart(self, X, verbose=False):
+        od = self._create_detector(*self.ad_parms0, **self.ad_parms1)
+        labels = self._train_clf(od, X, self.n_clusters,verbose=verbose)
+
+        return od.loglikelihood(X,labels), labels
+
     def _train_clf(self, ad, X, k=None, default_labels=None, verbose=False):
         '''
 
@@ -70,6 +120,7 @@ class AnomalyClustering(AnomalyDetector):
         :return:
         '''
         cluster_labels = default_labels
+        trained_labels = None # the labels that ad is currently trained with
 
         count_equal_movements = 0
         num_of_last_movements = 5  # the last 5 number of moments are stored
@@ -81,12 +132,24 @@ class AnomalyClustering(AnomalyDetector):
                 cluster_labels = np.array(utils.shuffle(np.mod(np.array(list(range(len(X)))), k))) if k > 1 else np.array([0 for _ in range(len(X))])
                 last_movements = [-1 for _ in range(num_of_last_movements)]
                 num_of_iterations = 0
+                trained_labels = None
                 if verbose:
                     print("Initialized clusters",np.unique(cluster_labels))
 
-            ad.fit(X, cluster_labels)
-            if ad.classes_ == []:
-                ad.fit(X, np.zeros((len(X)),))
+            # Refit when a cluster has become empty, so that it is removed from the classes as when always refitting
+            if trained_labels is None or not self.incremental_reassignment or \
+                    len(np.unique(cluster_labels)) != len(np.unique(trained_labels)):
+                ad.fit(X, cluster_labels)
+                trained_labels = cluster_labels
+                if ad.classes_ == []:
+                    trained_labels = np.zeros((len(X)),)
+                    ad.fit(X, trained_labels)
+            else:
+                moved = cluster_labels != trained_labels
+                if moved.any():
+                    ad.unfit_incrementally(X[moved], trained_labels[moved])
+                    ad.fit_incrementally(X[moved], cluster_labels[moved])
+                trained_labels = cluster_labels
 
             clf = SklearnClassifier.clf(ad)
             cluster_labels_new = clf.predict(X)
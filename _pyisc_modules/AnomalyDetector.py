@@ -20,35 +20,113 @@ The Python Wrapper of all ISC anomaly scoring methods.
 # along with this code.  If not, see <http://www.gnu.org/licenses/>.
 # --------------------------------------------------------------------------
 
-from numpy import ndarray, array
+from multiprocessing import cpu_count
+import numpy
+from numpy import ndarray, array, empty, double, intc
 
 from pyisc import BaseISC, _JSonExporter
 
 import pyisc
+from _pyisc_modules.Instrumentation import _start_stage, _record_stage
 
 
 class AnomalyDetector(BaseISC):
 
+    _scorer = None
+    score_memo_size = 0
+
     def anomaly_score(self,X, y=None, n_jobs=1):
         '''
         Score each row in X,y with an anomaly score.
         :param X: a single array, an array of arrays, or an instance of pyisc DataObject
         :param y: must be an array,list or None, cannot be a column_index as when fitting the data
+        :param n_jobs: the number of threads used for scoring the rows, -1 means using all processors.
         :return:
         '''
 
         if isinstance(X, pyisc.DataObject):
-            return self._anomaly_detector._CalcAnomaly(X,X.size())
+            if n_jobs < 0:
+                n_jobs = max(cpu_count() + 1 + n_jobs, 1)
+            start = _start_stage(self)
+            if n_jobs > 1:
+                scores = self._anomaly_detector._CalcAnomalyInParallel(X, n_jobs, X.size())
+            else:
+                scores = self._anomaly_detector._CalcAnomaly(X,X.size())
+            _record_stage('CalcAnomaly', start, X.size())
+            return scores
         elif isinstance(X, ndarray) or isinstance(X, list):
             data_object = self._convert_to_data_object_in_scoring(array(X), y)
 
             if data_object is not None:
-                return self.anomaly_score(data_object)
+                return self.anomaly_score(data_object, n_jobs=n_jobs)
 
         raise ValueError("Unknown type of data to score X, y", type(X), type(y))
 
 
-    def anomaly_score_details(self,X,y=None,index=None):
+    def score_one(self, x, y=None):
+        '''
+        Scores a single row with the same anomaly score as anomaly_score, but much faster since the row is converted
+        directly into a preallocated native buffer by a scorer that is cached between calls.
+        :param x: a 1-D array or sequence of numbers
+        :param y: None or the class of the row, if the detector was trained with classes
+        :return: the anomaly score of the row
+        '''
+        x = numpy.asarray(x, dtype=double)
+        if y is not None:
+            if self.class_column != len(x):
+                raise ValueError("A class can only be given if the detector was trained with the class in the column after the features")
+            scorer = self._get_scorer(len(x) + 1)
+            x = numpy.append(x, scorer[3].get(y, -1))
+        else:
+            if self.class_column is not None:
+                raise ValueError("The class of the row must be given since the detector was trained with classes")
+            scorer = self._get_scorer(len(x))
+
+        return scorer[2]._ScoreOne(x)
+
+    def _get_scorer(self, num_of_columns):
+        # The scorer is recreated when the inner detector is replaced, e.g. when unpickled or a snapshot is published,
+        # or the classes have changed. The returned tuple keeps the inner detector alive as long as its scorer is used.
+        inner_detector = self._anomaly_detector
+        scorer = self._scorer
+        classes = None if self.classes_ is None else list(self.classes_)
+        if scorer is None or scorer[0] is not inner_detector or scorer[1] != num_of_columns or scorer[4] != classes:
+            format = pyisc.Format()
+            for col in range(num_of_columns):
+                format.addColumn("Column %i" % col, pyisc.Format.Symbol if col == self.class_column else pyisc.Format.Continuous)
+            class_index = {} if classes is None else dict((c, i) for i, c in enumerate(classes))
+            scorer = (inner_detector, num_of_columns, pyisc._Scorer(inner_detector, format), class_index, classes)
+            self._scorer = scorer
+        return scorer
+
+    def __getstate__(self):
+        odict = BaseISC.__getstate__(self)
+        odict.pop('_scorer', None)
+        return odict
+
+    def __setstate__(self, dict):
+        BaseISC.__setstate__(self, dict)
+        if self.score_memo_size > 0:
+            self._anomaly_detector._SetScoreMemoSize(self.score_memo_size)
+
+    def set_score_memo_size(self, max_entries):
+        '''
+        Makes anomaly_score remember the scores of at most max_entries distinct rows, so that repeated rows, like
+        small counts and periods scored by P_Poisson, P_PoissonOnesided or P_Gamma, are scored by a table lookup. The
+        detector has a single table, which is keyed by all values of a row including the class column, and which can be
+        used by several threads concurrently. Hence, it only helps when whole rows are repeated, which is rare if a row
+        has a continuous column such as one scored by P_Gaussian. It is only used by anomaly_score when n_jobs is 1, not
+        by score_one, anomaly_score_details or the parallel scoring. The remembered scores are forgotten when the model
+        is trained, reset or imported, and all of them are forgotten when the table is full.
+
+        :param max_entries: the maximum number of remembered rows, 0 turns it off
+        :return: self
+        '''
+        self.score_memo_size = max_entries
+        self._anomaly_detector._SetScoreMemoSize(max_entries)
+        return self
+
+    def anomaly_score_details(self,X,y=None,index=None,as_arrays=False):
         '''
         Computes the detailed anomaly scores of each element in X, that is, anomaly score for each used statistical component\n
         :param X: is a DataObject or numpy array or list\n
@@ -64,7 +142,20 @@ class AnomalyDetector(BaseISC):
                 an array with the least acceptable value for each feature column,\n
                 an array with the largest acceptable value for each feature column\n
                 ]
+        :param as_arrays: if True, the details of all elements in X are computed in a single call and returned as a
+                dict of numpy arrays with one row per element in X and the keys 'anomaly_score', 'class', 'cluster',
+                'deviations', 'peak', 'min' and 'max'. The index must then be None.
         '''
+        if as_arrays:
+            assert index is None
+            if isinstance(X, pyisc._DataObject) and y is None:
+                return self._anomaly_score_details_arrays(X)
+            elif isinstance(X, ndarray) or isinstance(X, list):
+                data_object = self._convert_to_data_object_in_scoring(array(X), y)
+                if data_object is not None:
+                    return self._anomaly_score_details_arrays(data_object)
+            raise ValueError("Unknown type of data to score X, y", type(X), type(y))
+
         if isinstance(X, pyisc._DataObject) and y is None:
             if isinstance(index,int):
                 return self._anomaly_score_intfloat(X._get_intfloat(index),X.length(), X)
@@ -82,6 +173,31 @@ class AnomalyDetector(BaseISC):
 
 
 
+    def _anomaly_score_details_arrays(self, data_object):
+        num_of_rows = data_object.size()
+        num_of_columns = data_object.length()
+
+        details = {
+            'anomaly_score': empty(num_of_rows, dtype=double),
+            'class': empty(num_of_rows, dtype=intc),
+            'cluster': empty(num_of_rows, dtype=intc),
+            'deviations': empty((num_of_rows, self.num_of_partitions), dtype=double),
+            'peak': empty((num_of_rows, num_of_columns), dtype=double),
+            'min': empty((num_of_rows, num_of_columns), dtype=double),
+            'max': empty((num_of_rows, num_of_columns), dtype=double)
+        }
+
+        if not self._anomaly_detector._CalcAnomalyDetailsOfData(data_object,
+                                                                details['anomaly_score'],
+                                                                details['class'],
+                                                                details['cluster'],
+                                                                details['deviations'],
+                                                                details['peak'],
+                                                                details['min'],
+                                                                details['max']):
+            raise ValueError("The detail arrays do not match the number of rows, components or columns of the data")
+        return details
+
     def _anomaly_score_intfloat(self, x_intfloat, length, data_object):
         deviations = pyisc._double_array(self.num_of_partitions)
         min = pyisc._intfloat_array(length)
@@ -93,7 +209,8 @@ class AnomalyDetector(BaseISC):
 
         self._anomaly_detector._CalcAnomalyDetails(x_intfloat,anom, cla, clu, deviations, peak, min, max)
 
-        if self.is_clustering and self.class_column > -1:
+        has_classes = self.class_column is not None and self.class_column > -1
+        if self.is_clustering and has_classes:
             result = [pyisc._get_double_value(anom,0),
                     pyisc._get_int_value(cla,0),
                     pyisc._get_int_value(clu,0),
@@ -108,7 +225,7 @@ class AnomalyDetector(BaseISC):
                     list(data_object._convert_to_numpyarray(peak, length)),
                     list(data_object._convert_to_numpyarray(min, length)),
                     list(data_object._convert_to_numpyarray(max, length))]
-        elif self.class_column > -1:
+        elif has_classes:
             result = [pyisc._get_double_value(anom,0),
                     pyisc._get_int_value(cla,0),
                     list(pyisc._to_numpy_array(deviations,self.num_of_partitions)),
@@ -21,8 +21,11 @@ The Python Wrapper of all ISC anomaly detector training methods.
 # --------------------------------------------------------------------------
 from _pyisc import _to_cpp_array
 from abc import abstractmethod
+import copy
+import threading
+from timeit import default_timer
 import numpy
-from numpy import ndarray, array, c_
+from numpy import ndarray, array, c_, frombuffer, uint8
 from pyisc import _to_cpp_array_int, _AnomalyDetector, \
     _IscMultiGaussianMicroModel, \
     _IscPoissonMicroModel, \
@@ -33,6 +36,7 @@ from pyisc import _to_cpp_array_int, _AnomalyDetector, \
     _IscMarkovGaussCombinerMicroModel, \
     _IscMarkovGaussMatrixMicroModel
 import pyisc
+from _pyisc_modules.Instrumentation import _Instrumented, _start_stage, _record_stage
 
 __author__ = 'tol'
 
@@ -235,8 +239,19 @@ class P_ConditionalGaussianDependencyMatrix(P_ProbabilityModel):
         pyisc._free_array_int(value_array)
         return self._saved_model
 
-class BaseISC(object):
+class BaseISC(_Instrumented):
     component_models = None
+    snapshot_mode = False
+    # In snapshot mode, the number of trained rows or the number of seconds after which the changes are published
+    publish_rows = None
+    publish_seconds = None
+    _snapshot_lock = None
+    _writer = None
+    _unpublished = False
+    _unpublished_rows = 0
+    _published_time = None
+    # The number of columns of the data the detector is trained on, None until the detector is trained
+    _num_of_columns = None
 
     def __init__(self, component_models=P_Gaussian(0), output_combination_rule=cr_max, anomaly_threshold = 0.0):
         '''
@@ -329,16 +344,22 @@ class BaseISC(object):
 
             assert y is None # Contained in the data object
             self.class_column = X.class_column
-            if self.class_column >= 0:
+            if self.class_column is not None and self.class_column >= 0:
                 self.classes_ = X.classes_
 
-            self._anomaly_detector._SetParams(
-                0,
-                -1 if X.class_column is None else X.class_column,
-                self.anomaly_threshold,
-                1 if self.is_clustering else 0
-            )
-            self._anomaly_detector._TrainData(X)
+            def train(detector):
+                detector._SetParams(
+                    0,
+                    -1 if X.class_column is None else X.class_column,
+                    self.anomaly_threshold,
+                    1 if self.is_clustering else 0
+                )
+                detector._TrainData(X)
+
+            start = _start_stage(self)
+            self._update_model(train, X.size(), publish=True)
+            _record_stage('TrainData', start, X.size())
+            self._num_of_columns = X.length()
             return self
         if isinstance(X, ndarray):
 
@@ -349,6 +370,7 @@ class BaseISC(object):
                 max_class_column = X.shape[1]
             else:
                 max_class_column = 1
+            start = _start_stage(self)
             if isinstance(y, list) or isinstance(y, ndarray):
                 assert len(X) == len(y)
                 class_column = max_class_column
@@ -356,6 +378,7 @@ class BaseISC(object):
             elif y is None or int(y) == y and y > -1 and y <= max_class_column:
                 self.class_column = y
                 data_object = pyisc.DataObject(X,class_column=y)
+            _record_stage('convert_to_data_object', start, len(X), X.nbytes)
 
             if data_object is not None:
                 assert self._max_index < data_object.length()  # ensure that data distribution has not to large index into the data
@@ -364,6 +387,138 @@ class BaseISC(object):
 
         raise ValueError("Unknown type of data to fit X, y:", type(X), type(y))
 
+    def fit_stream(self, chunks, chunk_rows=10000, classes=None):
+        '''
+        Train the anomaly detector from an iterable of chunks of data, so that the whole data set does not have to fit
+        in memory. The rows are copied into a single preallocated buffer of chunk_rows rows that is reused for all
+        chunks. Any previously learned model is reset. The first buffer of rows is trained with the same batch training
+        as fit, so that the model is initialised as by fit, and the following buffers are trained incrementally on top
+        of it. In snapshot mode, the model is published when all chunks have been trained.
+
+        :param chunks: an iterable of numpy arrays or pandas data frames, or of tuples (X, y) where y is an array with
+        the classes of the rows in X
+        :param chunk_rows: the number of rows in the buffer, larger chunks are trained in several steps
+        :param classes: None or a list of classes, classes in y that are not in the list are appended to it
+        :return: self
+        '''
+        data_object = None
+        for chunk in chunks:
+            if isinstance(chunk, tuple):
+                X, y = chunk
+            else:
+                X, y = chunk, None
+            X = numpy.asarray(X)
+            if X.ndim == 1:
+                X = X.reshape((-1, 1))
+            assert X.ndim == 2
+            if y is not None:
+                y = numpy.asarray(y)
+                assert len(X) == len(y)
+
+            if data_object is None:
+                num_of_features = X.shape[1]
+                class_column = None if y is None else num_of_features
+                num_of_columns = num_of_features if y is None else num_of_features + 1
+                assert self._max_index < num_of_columns  # ensure that data distribution has not to large index into the data
+
+                self.class_column = class_column
+                self.classes_ = None if y is None else ([] if classes is None else list(classes))
+
+                # The rows are stored as intfloat values, continuous features as float32 and classes as int32
+                buffer = numpy.zeros((chunk_rows, num_of_columns), dtype=numpy.int32)
+                feature_buffer = buffer.view(numpy.float32)
+                format = pyisc.Format()
+                for col in range(num_of_columns):
+                    format.addColumn("Column %i" % col, pyisc.Format.Symbol if col == class_column else pyisc.Format.Continuous)
+                # The data object sees the buffer with the element type of each column, which must match the format
+                column_dtypes = [('c%i' % col, numpy.int32 if col == class_column else numpy.float32) for col in range(num_of_columns)]
+                rows = buffer.view(numpy.dtype(column_dtypes)).reshape(chunk_rows)
+                data_object = pyisc.DataObject(rows, format=format, class_column=class_column, classes=self.classes_, copy=False)
+
+                def train_first(detector):
+                    detector._SetParams(
+                        0,
+                        -1 if class_column is None else class_column,
+                        self.anomaly_threshold,
+                        1 if self.is_clustering else 0
+                    )
+                    detector._Reset()
+                    detector._TrainData(data_object)
+
+                train = train_first
+                self._num_of_columns = num_of_columns
+
+            assert X.shape[1] == num_of_features and (y is None) == (class_column is None)
+
+            for start in range(0, len(X), chunk_rows):
+                num_of_rows = min(chunk_rows, len(X) - start)
+                feature_buffer[:num_of_rows, :num_of_features] = X[start:start + num_of_rows]
+                if class_column is not None:
+                    buffer[:num_of_rows, class_column] = \
+                        pyisc.DataObject._class_ids(y[start:start + num_of_rows], self.classes_, add_new_classes=True)
+                data_object._setBufferSize(num_of_rows)
+                self._update_model(train, num_of_rows, publish=False)
+                train = lambda detector: detector._TrainDataIncrementally(data_object)
+
+        return self.publish()
+
+    def _partial_fit(self, X, y=None, classes=None):
+        '''
+        Incrementally train the anomaly detector on a batch of rows. The first call on a detector that has not been
+        trained sets up the detector for the number of columns in X and whether there is a y, and trains it on the
+        batch as fit does, so that no prior call to fit is required. Classes in y or classes that are not in classes_
+        are appended to it.
+
+        :param X: an array of arrays
+        :param y: None or an array with the classes of the rows in X
+        :param classes: None or a list of classes
+        :return: self
+        '''
+        is_trained = self._num_of_columns is not None
+        return self._partial_fit_data_object(self._to_partial_fit_data_object(X, y, classes), is_trained)
+
+    def _partial_fit_data_object(self, data_object, is_trained):
+        if is_trained:
+            return BaseISC.fit_incrementally(self, data_object)
+        return self._fit(data_object)
+
+    def _to_partial_fit_data_object(self, X, y=None, classes=None):
+        '''
+        Returns a DataObject with the rows of X and the classes in y, and sets up the detector on the first call as
+        described in _partial_fit. New classes are appended to classes_.
+        '''
+        X = numpy.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape((-1, 1))
+        assert X.ndim == 2
+        num_of_features = X.shape[1]
+        num_of_columns = num_of_features if y is None else num_of_features + 1
+
+        if self._num_of_columns is None:
+            assert self._max_index < num_of_columns  # ensure that data distribution has not to large index into the data
+            self.class_column = None if y is None else num_of_features
+            self.classes_ = None if y is None else list(self.classes_ if self.classes_ is not None else [])
+            self._num_of_columns = num_of_columns
+        assert num_of_columns == self._num_of_columns and \
+               (y is None) == (self.class_column is None) and (y is None or self.class_column == num_of_features), \
+            "The rows must have the same features and class column in all calls"
+
+        format = pyisc.Format()
+        for col in range(num_of_features):
+            format.addColumn("Column %i" % col, pyisc.Format.Continuous)
+        if y is not None:
+            assert len(X) == len(y)
+            for c in (classes if classes is not None else []):
+                if c not in self.classes_:
+                    self.classes_.append(c)
+            class_ids = pyisc.DataObject._class_ids(numpy.asarray(y), self.classes_, add_new_classes=True)
+            format.addColumn("Column %i" % num_of_features, pyisc.Format.Symbol)
+            X = numpy.c_[X, class_ids]
+
+        data_object = pyisc.DataObject(X.astype(float), format=format, class_column=self.class_column)
+        data_object.classes_ = self.classes_
+        return data_object
+
     def fit_incrementally(self, X, y=None):
         '''
         Incrementally train the anomaly detector. Call reset() to restart learning. Requires being trained using the fit
@@ -380,7 +535,9 @@ class BaseISC(object):
 
             assert self._max_index < X.length()  # enusre that data distribution has not to large index into the data
 
-            self._anomaly_detector._TrainDataIncrementally(X)
+            start = _start_stage(self)
+            self._update_model(lambda detector: detector._TrainDataIncrementally(X), X.size())
+            _record_stage('TrainDataIncrementally', start, X.size())
             return self
         elif isinstance(X, ndarray) or isinstance(X, list):
 
@@ -395,7 +552,9 @@ class BaseISC(object):
 
     def unfit_incrementally(self, X, y=None):
         if isinstance(X, pyisc.DataObject) and y is None and X.class_column == self.class_column:
-            self._anomaly_detector._UntrainDataIncrementally(X)
+            start = _start_stage(self)
+            self._update_model(lambda detector: detector._UntrainDataIncrementally(X), X.size())
+            _record_stage('UntrainDataIncrementally', start, X.size())
             return self
         elif isinstance(X, ndarray) or isinstance(X, list):
             data_object = self._convert_to_data_object_in_scoring(array(X), y)
@@ -405,7 +564,37 @@ class BaseISC(object):
 
         raise ValueError("Unknown type of data to fit X, y", type(X), type(y))
 
+    def merge(self, other):
+        '''
+        Merges the model of another detector into this detector, so that the result is the same as if this detector was
+        trained on the data of both detectors. This makes it possible to train detectors on partitions of the data in
+        separate processes or machines and combine them afterwards. Both detectors must have been created with the same
+        component models, output combination rule and anomaly threshold, and trained with the same class column and
+        classes, for instance by providing the classes explicitly in a DataObject. The component models must export
+        their training statistics, which are combined by addition.
+
+        :param other: a fitted detector of the same type as this detector
+        :return: self
+        '''
+        assert isinstance(other, BaseISC)
+        assert self.num_of_partitions == other.num_of_partitions and \
+               self.output_combination_rule == other.output_combination_rule and \
+               self.anomaly_threshold == other.anomaly_threshold
+        assert self.class_column == other.class_column, "The detectors must be trained with the same class column"
+        assert self.classes_ is None or other.classes_ is None or list(self.classes_) == list(other.classes_), \
+            "The detectors must be trained with the same classes"
+
+        if not self._update_model(lambda detector: detector._Merge(other._anomaly_detector), publish=True):
+            raise ValueError("The models cannot be merged since their parameters are incompatible, for instance since an "
+                             "integer parameter differs between them, or since some parts of the models cannot be exported")
+
+        if self.classes_ is None:
+            self.classes_ = other.classes_
+
+        return self
+
     def _convert_to_data_object_in_scoring(self, X, y):
+        start = _start_stage(self)
         data_object = None
         if isinstance(y, list) or isinstance(y, ndarray):
             assert X.ndim == 2 and self.class_column == X.shape[1] or X.ndim == 1 and self.class_column == 1
@@ -413,10 +602,113 @@ class BaseISC(object):
         else:
             assert self.class_column == y
             data_object = pyisc.DataObject(X, class_column=self.class_column,classes=self.classes_ if y is not None else None)
+        _record_stage('convert_to_data_object', start, len(X), X.nbytes)
         return data_object
 
     def reset(self):
-        self._anomaly_detector._Reset();
+        self._update_model(lambda detector: detector._Reset(), publish=True)
+
+    def set_snapshot_mode(self, enabled=True, publish_rows=None, publish_seconds=None):
+        '''
+        In snapshot mode, all training, i.e. fit, fit_incrementally, unfit_incrementally, merge, reset and the imports,
+        changes a private copy of the model, which is then copied and published by replacing the model used for scoring
+        in a single assignment. Hence, other threads can score with the published model without locking while the
+        detector is trained, and their scoring is not slowed down by the training. The published models are never
+        changed, so scoring always uses a consistent model, and threads that score concurrently with the same published
+        model use separate replicas of it. The training calls are serialized by a lock. Requires that all component
+        models can be exported.
+
+        Since copying the model takes time proportional to the size of the model, the incremental training can publish
+        its changes only after publish_rows rows have been trained or publish_seconds seconds have passed since the
+        last publication, whichever comes first. The other training methods always publish their changes, and publish
+        can be called to publish the pending changes at any time.
+
+        :param enabled: True to enable snapshot mode, False to disable it, which publishes any pending changes
+        :param publish_rows: None or the number of incrementally trained rows after which the changes are published
+        :param publish_seconds: None or the number of seconds after which incrementally trained changes are published
+        when the detector is trained next time. If both are None, the changes are published after each call.
+        :return: self
+        '''
+        if publish_rows is not None and publish_rows <= 0 or publish_seconds is not None and publish_seconds <= 0:
+            raise ValueError("The number of rows and seconds between publications must be larger than zero")
+        self.publish()
+        self.snapshot_mode = enabled
+        self.publish_rows = publish_rows if enabled else None
+        self.publish_seconds = publish_seconds if enabled else None
+        self._snapshot_lock = threading.Lock() if enabled else None
+        self._writer = None
+        self._unpublished = False
+        self._unpublished_rows = 0
+        self._published_time = default_timer()
+        return self
+
+    def publish(self):
+        '''
+        In snapshot mode, publishes the changes of the model that have not yet been published, so that they are used
+        by the following scoring. Does nothing otherwise.
+
+        :return: self
+        '''
+        if self.snapshot_mode:
+            with self._snapshot_lock:
+                if self._unpublished:
+                    self._publish()
+        return self
+
+    def _publish(self):
+        self._anomaly_detector = self._clone_inner_detector(self._writer)
+        self._unpublished = False
+        self._unpublished_rows = 0
+        self._published_time = default_timer()
+
+    def _update_model(self, update, num_of_rows=0, publish=None):
+        '''
+        Applies update to the inner detector and returns its result. In snapshot mode, the update is applied to the
+        private copy of the model, which is published if publish is True, or, if publish is None, when enough rows have
+        been trained or enough time has passed since the last publication.
+        '''
+        if not self.snapshot_mode:
+            return update(self._anomaly_detector)
+        with self._snapshot_lock:
+            if self._writer is None:
+                self._writer = self._clone_inner_detector(self._anomaly_detector)
+            result = update(self._writer)
+            self._unpublished = True
+            self._unpublished_rows += num_of_rows
+            if publish is None:
+                publish = self.publish_rows is None and self.publish_seconds is None or \
+                          self.publish_rows is not None and self._unpublished_rows >= self.publish_rows or \
+                          self.publish_seconds is not None and \
+                          default_timer() - self._published_time >= self.publish_seconds
+            if publish:
+                self._publish()
+            return result
+
+    def clone(self):
+        '''
+        Returns a copy of this detector with a copy of the learned model, which is copied natively without serializing
+        it, so that the copy can be trained and scored independently of this detector. For instance, a trained baseline
+        can cheaply be copied and then trained further on the data of different entities.
+
+        :return: a new detector of the same type as this detector
+        '''
+        self.publish()
+        clone = copy.copy(self)
+        clone.__dict__.pop('_scorer', None)
+        clone.__dict__.pop('_instrumentation', None)
+        clone._anomaly_detector = self._clone_inner_detector(self._anomaly_detector)
+        clone._writer = None
+        clone._snapshot_lock = threading.Lock() if self.snapshot_mode else None
+        clone._published_time = default_timer()
+        if self.classes_ is not None:
+            clone.classes_ = list(self.classes_)
+        return clone
+
+    def _clone_inner_detector(self, inner_detector):
+        clone = inner_detector._Clone()
+        if clone is None:
+            raise Exception("The model cannot be copied since some of the component models cannot be exported")
+        return clone
 
 
     def compute_logp(self, X1):
@@ -431,16 +723,16 @@ class BaseISC(object):
                 data_object = self. \
                     _convert_to_data_object_in_scoring(
                     X1,
-                    y=array([None] * len(X1))
+                    # The class column is not used when computing the log probabilities of all classes, so it is
+                    # filled with an unknown class that keeps the data numeric
+                    y=numpy.full(len(X1), numpy.nan)
                 )
-            logps = []
-            clss = list(self.classes_)
-            for clazz in self.classes_:
-                pyisc._DataObject.set_column_values(data_object, self.class_column, [clss.index(clazz)] * len(data_object))
-
-                logps += [self._anomaly_detector._LogProbabilityOfData(data_object, len(X1))]
+            # The log probabilities of all classes are computed in a single pass, one row per class is returned
+            logps = numpy.empty((len(data_object), len(self.classes_)))
+            if not self._anomaly_detector._LogProbabilityOfDataPerClass(data_object, logps):
+                raise ValueError("The log probability array does not match the number of rows or classes of the data")
 
-            return logps
+            return logps.T
         else:
             data_object = pyisc.DataObject(X1) if not isinstance(X1, pyisc._DataObject) else X1
             return self._anomaly_detector._LogProbabilityOfData(data_object, len(X1))
@@ -480,21 +772,64 @@ class BaseISC(object):
         importer = pyisc._JSonImporter()
         success = importer.parseJSon(json)
         if success:
-            self._anomaly_detector.importModel(importer)
+            self._update_model(lambda detector: detector.importModel(importer), publish=True)
+        return success
+
+
+    def exportBinary(self):
+        '''
+        Export the learned model to the compact binary format, a versioned header followed by the parameters as raw
+        little-endian arrays. It is much smaller and faster to export and import than JSon.
+        :return: bytes with the binary model
+        '''
+        exporter = pyisc._BinaryExporter()
+        self._anomaly_detector.exportModel(exporter)
+        if not exporter.isImplemented():
+            raise NotImplementedError("Some of the component models cannot be exported to the binary format")
+        return exporter._getBinaryData(exporter.getBinaryLength()).tobytes()
+
+    def importBinary(self, binary):
+        '''
+        Parses and imports a learned model from the binary format created by exportBinary.
+
+        As for importJSon, the constructor arguments of the anomaly detector must be known and defined before importing.
+
+        :param binary: bytes
+        :return: True if successful, False otherwise
+        '''
+        importer = pyisc._BinaryImporter()
+        success = importer.parseBinary(frombuffer(binary, dtype=uint8))
+        if success:
+            self._update_model(lambda detector: detector.importModel(importer), publish=True)
         return success
 
 
-    # The getstate setstate let us handle the pickleing of the swig object using json instead
+    # The getstate setstate let us handle the pickleing of the swig object using the binary format instead,
+    # pickles with the model as json are still supported and used when some part of the model cannot be exported to
+    # the binary format
     def __getstate__(self):
+        self.publish()
         odict = self.__dict__.copy() # copy the dict since we change it
         del odict['_anomaly_detector']              # remove swig object entry
-        odict['_anomaly_detector_json'] = self.exportJSon()
+        odict.pop('_writer', None)
+        odict.pop('_snapshot_lock', None)
+        odict.pop('_instrumentation', None)
+        try:
+            odict['_anomaly_detector_binary'] = self.exportBinary()
+        except NotImplementedError:
+            odict['_anomaly_detector_json'] = self.exportJSon()
         return odict
 
     def __setstate__(self, dict):
-        _anomaly_detector_json = dict['_anomaly_detector_json']
-        del dict['_anomaly_detector_json']
+        _anomaly_detector_binary = dict.pop('_anomaly_detector_binary', None)
+        _anomaly_detector_json = dict.pop('_anomaly_detector_json', None)
         self.__dict__.update(dict)   # update attributes
+        if self.snapshot_mode:
+            self._snapshot_lock = threading.Lock()
+            self._published_time = default_timer()
         self._create_inner_anomaly_detector(False, self.num_of_partitions, 0, self.output_combination_rule, -1, self.anomaly_threshold)
-        if not self.importJSon(_anomaly_detector_json):
+        if _anomaly_detector_binary is not None:
+            if not self.importBinary(_anomaly_detector_binary):
+                raise Exception("Import of binary model did not work properly")
+        elif not self.importJSon(_anomaly_detector_json):
             raise Exception("Import of JSON did not work properly")
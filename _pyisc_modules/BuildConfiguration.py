@@ -0,0 +1,37 @@
+"""
+Reports how the native extension of pyisc was built.
+"""
+# --------------------------------------------------------------------------
+# Copyright (C) 2014, 2015, 2016, 2017 SICS Swedish ICT AB
+#
+# Main author: Tomas Olsson <tol@sics.se>
+#
+# This code is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This code is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this code.  If not, see <http://www.gnu.org/licenses/>.
+# --------------------------------------------------------------------------
+
+
+import pyisc
+
+
+def build_configuration():
+    '''
+    Returns how the native extension was built, as set by the environment variables of setup.py, e.g.
+    {'profile': 'optimized', 'lto': True, 'march': 'native', 'pgo': 'use', 'compiler': 'gcc 12.2.0',
+    'compiled_simd': 'avx2'}. The march and pgo keys are only present if they were used.
+
+    :return: a dict
+    '''
+    configuration = dict(item.split('=', 1) for item in pyisc._buildConfiguration().split(';'))
+    configuration['lto'] = configuration['lto'] == '1'
+    return configuration
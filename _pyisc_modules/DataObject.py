@@ -21,15 +21,17 @@ The Python Wrapper of all ISC DataObject methods.
 # --------------------------------------------------------------------------
 
 
-from numpy import ndarray, array
+from numpy import ndarray, array, asarray, empty, float32, int32, argsort, generic
+from numpy import unique as unique_with_index
 from numpy.ma.extras import unique
 
 import pyisc
 from pyisc import Format
+from _pyisc_modules.Instrumentation import _Instrumented, _start_stage, _record_stage
 
 __author__ = 'tol'
 
-class DataObject(pyisc._DataObject):
+class DataObject(pyisc._DataObject, _Instrumented):
 
     '''
     The classes_ used to generate indexes into the class_column
@@ -40,7 +42,7 @@ class DataObject(pyisc._DataObject):
     '''
     class_column = None
 
-    def __init__(self, X, format=None, class_column=None, classes='auto'):
+    def __init__(self, X, format=None, class_column=None, classes='auto', copy=True):
         '''
         The DataObject class represents the data analysed using a AnomalyDetector.
 
@@ -56,6 +58,9 @@ class DataObject(pyisc._DataObject):
         :param format: None or a pyisc Format instance
         :param class_column: None or an integer
         :param classes: 'auto' or a list of elements in X[class_column]
+        :param copy: if False, X must be a C-contiguous float32 or int32 array, or a structured array with only float32
+        and int32 fields, that is used as row storage without being copied. Float32 elements are used as continuous
+        values and int32 elements as discrete values, where the class_column must contain indexes into classes.
         :return:
         '''
         self.class_column = class_column
@@ -64,6 +69,9 @@ class DataObject(pyisc._DataObject):
             pyisc._DataObject.__init__(self,X)
             return
         elif isinstance(X, ndarray):
+            if not copy:
+                self._init_from_buffer(X, format, class_column, classes)
+                return
             if format is None:
                 format = Format()
                 num_cols = len(X.T)
@@ -74,40 +82,184 @@ class DataObject(pyisc._DataObject):
                         format.addColumn("Column %i"%col, Format.Continuous)
                     else:
                         format.addColumn("Column %i"%col, Format.Symbol)
-                        A =  X.T.copy()
+                        labels = X[:, class_column] if X.ndim == 2 else X
                         if classes == 'auto':
-                            self.classes_ =  list(sorted(unique(A[class_column])))
+                            self.classes_ =  list(sorted(unique(labels)))
                         else:
                             self.classes_ = classes
-                        class_col = format.get_nth_column(class_column)
-                        for c in self.classes_:
-                            class_col.add("Class %i"%c if isinstance(c, int) else "Class %s"%c if isinstance(c, str) and len(c) == 1 else str(c))
-                        A[class_column] = [self.classes_.index(v) if v in self.classes_ else -1 for v in A[class_column]]
-                        X = A.T
+                        self._add_class_names(format.get_nth_column(class_column))
                 self._format = format
-                if X.ndim == 1: # This fixes a problem of converting it to c++ data object
-                    X = array([X.copy()]).T
 
-                pyisc._DataObject.__init__(self,format,X.astype(float))
+                start = _start_stage(self)
+                if class_column is not None:
+                    # Only the class column is encoded, the other columns are converted directly into the float array
+                    class_start = _start_stage(self)
+                    class_ids = self._class_ids(labels, self.classes_)
+                    _record_stage('class_mapping', class_start, len(class_ids))
+                    A = empty((len(X), num_cols), dtype=float)
+                    if X.ndim == 2:
+                        other_columns = [col for col in range(num_cols) if col != class_column]
+                        A[:, other_columns] = X[:, other_columns]
+                    A[:, class_column] = class_ids
+                    X = A
+                elif X.ndim == 1: # This fixes a problem of converting it to c++ data object
+                    X = array([X.astype(float)]).T
+                else:
+                    X = X.astype(float)
+                pyisc._DataObject.__init__(self,format,X)
+                _record_stage('DataObject', start, len(X), X.nbytes)
                 return
             elif isinstance(format, pyisc.Format):
                 self._format = format
+                start = _start_stage(self)
                 pyisc._DataObject.__init__(self,format,X)
+                _record_stage('DataObject', start, len(X), X.nbytes)
                 return
         pyisc._DataObject.__init__(self,X)
 
-    def as_1d_array(self):
-        array1D = self._as1DArray(self.size()*self.length()).astype(object)
+    @staticmethod
+    def _class_ids(values, classes, add_new_classes=False):
+        '''
+        Maps each value to its index in classes, or -1 if it is not contained in classes.
+
+        :param values: an array or list of class labels
+        :param classes: a list of class labels
+        :param add_new_classes: if True, values not contained in classes are appended to the classes list
+        :return: an int32 numpy array with an index per value
+        '''
+        values = values if isinstance(values, ndarray) else asarray(values, dtype=object)
+        try:
+            # Only the distinct labels are looked up, new labels are added in order of their first appearance
+            distinct, first_index, inverse = unique_with_index(values, return_index=True, return_inverse=True)
+        except TypeError: # Labels that cannot be sorted, like None mixed with strings, are looked up one by one
+            return DataObject._class_ids_of_each(values, classes, add_new_classes)
+        class_index = dict((c, i) for i, c in enumerate(classes))
+        distinct_ids = empty(len(distinct), dtype=int32)
+        for j in argsort(first_index, kind='stable'):
+            v = distinct[j].item() if isinstance(distinct[j], generic) else distinct[j]
+            class_id = class_index.get(v, -1)
+            if class_id == -1 and add_new_classes:
+                class_id = len(classes)
+                class_index[v] = class_id
+                classes.append(v)
+            distinct_ids[j] = class_id
+        return distinct_ids[inverse.reshape(-1)]
+
+    @staticmethod
+    def _class_ids_of_each(values, classes, add_new_classes):
+        class_index = dict((c, i) for i, c in enumerate(classes))
+        ids = empty(len(values), dtype=int32)
+        for i, v in enumerate(values):
+            class_id = class_index.get(v, -1)
+            if class_id == -1 and add_new_classes:
+                class_id = len(classes)
+                class_index[v] = class_id
+                classes.append(v)
+            ids[i] = class_id
+        return ids
+
+    def _add_class_names(self, class_col):
+        for c in self.classes_:
+            class_col.add("Class %i"%c if isinstance(c, int) else "Class %s"%c if isinstance(c, str) and len(c) == 1 else str(c))
+
+    def _init_from_buffer(self, X, format, class_column, classes):
+        assert X.flags['C_CONTIGUOUS'], "Only C-contiguous arrays can be used without copying"
+        if X.dtype.names is not None:
+            assert X.ndim == 1
+            column_types = [X.dtype.fields[name][0] for name in X.dtype.names]
+            assert X.dtype.itemsize == 4 * len(column_types), "Structured arrays must not contain padding"
+        else:
+            assert X.ndim == 2
+            column_types = [X.dtype] * X.shape[1]
+        assert all([t == float32 or t == int32 for t in column_types]), "Only float32 and int32 elements can be used without copying"
+        num_rows = len(X)
+        num_cols = len(column_types)
+
+        if class_column is not None:
+            assert class_column >= 0 and class_column < num_cols and column_types[class_column] == int32
+            if classes == 'auto':
+                class_ids = X[X.dtype.names[class_column]] if X.dtype.names is not None else X[:, class_column]
+                self.classes_ = list(range(class_ids.max() + 1)) if num_rows > 0 else []
+            else:
+                self.classes_ = classes
+
+        if format is None:
+            format = Format()
+            for col in range(num_cols):
+                if col == class_column:
+                    format.addColumn("Column %i" % col, Format.Symbol)
+                    self._add_class_names(format.get_nth_column(class_column))
+                elif column_types[col] == float32:
+                    format.addColumn("Column %i" % col, Format.Continuous)
+                else:
+                    format.addColumn("Column %i" % col, Format.Discrete)
+        else:
+            assert format.size() == num_cols
+            # The elements are used as they are, so a float32 column must be continuous and an int32 column must not be
+            for col in range(num_cols):
+                if (column_types[col] == float32) != bool(format._isContinuousColumn(col)):
+                    raise ValueError("Column %i is %s in the array, but %s in the format" %
+                                     (col, column_types[col], "continuous" if column_types[col] != float32 else "not continuous"))
+
+        self._format = format
+        self._buffer = X # Keeps the wrapped array alive as long as this object
+        pyisc._DataObject.__init__(self, format)
+        self._wrapBuffer(X.view(int32).reshape((num_rows, num_cols)))
+
+    def save_binary(self, filename):
+        '''
+        Writes the format and the rows to a binary row file that can be memory-mapped with DataObject.load_binary.
+
+        :param filename: path of the file to write
+        :return:
+        '''
+        if not self._writeBinaryFile(filename):
+            raise IOError("Could not write binary row file %s" % filename)
+
+    @staticmethod
+    def load_binary(filename, class_column=None, classes=None):
+        '''
+        Creates a read-only DataObject that memory-maps the rows of a binary row file written by save_binary, so that
+        the file is opened without reading it and its pages are shared by all processes that load the same file.
+
+        :param filename: path of a binary row file
+        :param class_column: None or the index of the class column
+        :param classes: None or the classes_ list the class column indexes into, if None the class indexes are used
+        :return: a DataObject
+        '''
+        format = Format()
+        data_object = DataObject(format, class_column=class_column)
+        if not data_object._mapBinaryFile(filename):
+            raise IOError("Could not map binary row file %s" % filename)
+        if class_column is not None:
+            assert class_column >= 0 and class_column < format.size()
+            data_object.classes_ = classes if classes is not None else list(range(format.get_nth_column(class_column).getnum()))
+        return data_object
+
+    def as_1d_array(self, numeric=False):
+        '''
+        Returns the rows as a 1D array. If numeric is False, the class column contains the elements of classes_ and
+        None for unknown classes, so an object array is returned, otherwise a float array is returned where the class
+        column contains the indexes into classes_.
+
+        :param numeric: True or False
+        :return: a numpy array
+        '''
+        array1D = self._as1DArray(self.size()*self.length())
+        if numeric or self.class_column is None:
+            return array1D if numeric else array1D.astype(object)
 
-        #print self.class_column, self.classes_, unique(array1D[range(self.class_column,len(array1D),self.length())])
-        if self.class_column is not None:
-            array1D[list(range(self.class_column,len(array1D),self.length()))] = \
-                [self.classes_[int(c)] if int(c) != -1 else None for c in array1D[list(range(self.class_column,len(array1D),self.length()))] ]
+        class_ids = array1D[self.class_column::self.length()].astype(int)
+        labels = empty(len(self.classes_) + 1, dtype=object) # The last element is used for the unknown class -1
+        for i, c in enumerate(self.classes_):
+            labels[i] = c
+        array1D = array1D.astype(object)
+        array1D[self.class_column::self.length()] = labels[class_ids]
 
         return array1D
 
-    def as_2d_array(self):
-        array1D = self.as_1d_array()
+    def as_2d_array(self, numeric=False):
+        array1D = self.as_1d_array(numeric)
         return array1D.reshape((self.size(),self.length()))
 
     def set_column_values(self, column_index, values):
@@ -118,7 +270,9 @@ class DataObject(pyisc._DataObject):
         :return:
         '''
         if column_index == self.class_column:
-            values = [self.classes_.index(c) for c in values]
+            values = self._class_ids(values, self.classes_)
+            if (values == -1).any():
+                raise ValueError("The class column values must be contained in classes_")
         pyisc._DataObject.set_column_values(self, column_index, array(values).astype(float))
 
 
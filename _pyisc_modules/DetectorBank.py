@@ -0,0 +1,204 @@
+"""
+The Python Wrapper of a bank of ISC anomaly detectors, one per entity.
+"""
+# --------------------------------------------------------------------------
+# Copyright (C) 2014, 2015, 2016, 2017 SICS Swedish ICT AB
+#
+# Main author: Tomas Olsson <tol@sics.se>
+#
+# This code is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This code is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this code.  If not, see <http://www.gnu.org/licenses/>.
+# --------------------------------------------------------------------------
+
+import copy
+
+import numpy
+from numpy import c_, frombuffer, uint8
+
+import pyisc
+from pyisc import _IscMicroModelVector, _DetectorBank
+from _pyisc_modules.BaseISC import P_ProbabilityModel, P_Gaussian, cr_min, cr_max, cr_plus
+
+
+class DetectorBank(object):
+
+    def __init__(self, component_models=P_Gaussian(0), output_combination_rule=cr_max, anomaly_threshold=0.0):
+        '''
+        A bank of anomaly detectors with the same component models, one per entity such as a host or a customer, that
+        are all kept in a single native container. The rows of a data set are routed to the detector of their entity,
+        so that a mixed batch of rows is trained or scored in a single call. A detector is only created when its entity
+        is first trained, and only holds the trained model of the entity. The bank must not be used by several threads
+        concurrently.
+
+        :param component_models: the same parameter as in the pyisc.AnomalyDetector
+        :param output_combination_rule: the same parameter as in the pyisc.AnomalyDetector
+        :param anomaly_threshold: the same parameter as in the pyisc.AnomalyDetector
+        '''
+        assert isinstance(anomaly_threshold, float) and anomaly_threshold >= 0
+        assert isinstance(component_models, P_ProbabilityModel) or \
+               isinstance(component_models, list) and len(component_models) > 0 and \
+               all([isinstance(m, P_ProbabilityModel) for m in component_models])
+        assert output_combination_rule in [cr_min, cr_max, cr_plus]
+
+        if isinstance(component_models, P_ProbabilityModel):
+            component_models = [component_models]
+
+        self.component_models = component_models
+        self.output_combination_rule = output_combination_rule
+        self.anomaly_threshold = anomaly_threshold
+        self.num_of_partitions = len(component_models)
+        self._max_index = numpy.vstack([numpy.max(_.get_column_index()) for _ in component_models]).flatten().max()
+        self.entities_ = []
+        self._create_detector_bank()
+
+    def _create_detector_bank(self):
+        comp_distributions = _IscMicroModelVector()
+        for i in range(self.num_of_partitions):
+            comp_distributions.push_back(self.component_models[i].create_micromodel())
+        self._detector_bank = _DetectorBank(0, -1, self.anomaly_threshold, 0, self.output_combination_rule, comp_distributions)
+
+    def fit(self, X, entities):
+        '''
+        Trains the detector of each row's entity incrementally, new entities are added to entities_.
+
+        :param X: an array of arrays, or a pyisc DataObject
+        :param entities: an array with the entity of each row in X, or if X is a DataObject, the index of the column
+        in X that contains the index of each row's entity in entities_
+        :return: self
+        '''
+        data_object, entity_column = self._entity_data_object(X, entities, True)
+        self._detector_bank._TrainData(data_object, entity_column)
+        return self
+
+    def unfit(self, X, entities):
+        '''
+        Untrains the rows in X from the detector of each row's entity.
+
+        :param X: an array of arrays, or a pyisc DataObject
+        :param entities: as in fit
+        :return: self
+        '''
+        data_object, entity_column = self._entity_data_object(X, entities, False)
+        self._detector_bank._UntrainData(data_object, entity_column)
+        return self
+
+    def anomaly_score(self, X, entities):
+        '''
+        Computes the anomaly score of each row in X using the detector of the row's entity.
+
+        :param X: an array of arrays, or a pyisc DataObject
+        :param entities: as in fit
+        :return: an array with an anomaly score per row, or NaN for rows whose entity has not been trained
+        '''
+        data_object, entity_column = self._entity_data_object(X, entities, False)
+        return self._detector_bank._CalcAnomaly(data_object, entity_column, data_object.size())
+
+    def is_trained(self, entity):
+        '''
+        :param entity: an entity
+        :return: True if the detector of the entity has been trained
+        '''
+        return entity in self.entities_ and self._detector_bank._IsTrained(self.entities_.index(entity)) == 1
+
+    def reset_entity(self, entity):
+        '''
+        Removes the learned model of an entity.
+
+        :param entity: an entity
+        :return: self
+        '''
+        if entity in self.entities_:
+            self._detector_bank._ResetEntity(self.entities_.index(entity))
+        return self
+
+    def reset(self):
+        '''
+        Removes the learned models of all entities.
+
+        :return: self
+        '''
+        self._detector_bank._Reset()
+        self.entities_ = []
+        return self
+
+    def clone(self):
+        '''
+        Returns a copy of this bank with a copy of the learned models, which is copied through the binary model format.
+
+        :return: a new DetectorBank
+        '''
+        clone = copy.copy(self)
+        clone.entities_ = list(self.entities_)
+        clone._create_detector_bank()
+        if not clone.importBinary(self.exportBinary()):
+            raise Exception("The detector bank cannot be copied")
+        return clone
+
+    def exportBinary(self):
+        '''
+        Export the learned models of all entities to the compact binary format, see BaseISC.exportBinary. The entities_
+        are not exported.
+        :return: bytes with the binary model
+        '''
+        exporter = pyisc._BinaryExporter()
+        self._detector_bank.exportModel(exporter)
+        if not exporter.isImplemented():
+            raise NotImplementedError("Some of the component models cannot be exported to the binary format")
+        return exporter._getBinaryData(exporter.getBinaryLength()).tobytes()
+
+    def importBinary(self, binary):
+        '''
+        Parses and imports the learned models created by exportBinary, replacing the models of all entities.
+
+        :param binary: bytes
+        :return: True if successful, False otherwise
+        '''
+        importer = pyisc._BinaryImporter()
+        success = importer.parseBinary(frombuffer(binary, dtype=uint8))
+        if success:
+            self._detector_bank.importModel(importer)
+        return success
+
+    def __getstate__(self):
+        odict = self.__dict__.copy() # copy the dict since we change it
+        del odict['_detector_bank']              # remove swig object entry
+        odict['_detector_bank_binary'] = self.exportBinary()
+        return odict
+
+    def __setstate__(self, dict):
+        _detector_bank_binary = dict.pop('_detector_bank_binary')
+        self.__dict__.update(dict)   # update attributes
+        self._create_detector_bank()
+        if not self.importBinary(_detector_bank_binary):
+            raise Exception("Import of binary model did not work properly")
+
+    def _entity_data_object(self, X, entities, add_new_entities):
+        if isinstance(X, pyisc._DataObject):
+            assert isinstance(entities, int) and entities >= 0 and entities < X.length()
+            assert self._max_index < X.length()  # ensure that data distribution has not to large index into the data
+            return X, entities
+
+        X = numpy.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape((-1, 1))
+        assert X.ndim == 2 and len(X) == len(entities)
+        assert self._max_index < X.shape[1]  # ensure that data distribution has not to large index into the data
+
+        entity_ids = pyisc.DataObject._class_ids(entities, self.entities_, add_new_classes=add_new_entities)
+
+        # The entity index is stored in an extra last column, so the column indexes of the component models are unchanged
+        format = pyisc.Format()
+        for col in range(X.shape[1]):
+            format.addColumn("Column %i" % col, pyisc.Format.Continuous)
+        format.addColumn("Entity", pyisc.Format.Discrete)
+        return pyisc.DataObject(c_[X, entity_ids], format=format), X.shape[1]
@@ -0,0 +1,206 @@
+"""
+Opt-in timing instrumentation and counters of the stages in pyisc's data conversion, training and scoring.
+"""
+# --------------------------------------------------------------------------
+# Copyright (C) 2014, 2015, 2016, 2017 SICS Swedish ICT AB
+#
+# Main author: Tomas Olsson <tol@sics.se>
+#
+# This code is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This code is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this code.  If not, see <http://www.gnu.org/licenses/>.
+# --------------------------------------------------------------------------
+
+import threading
+from timeit import default_timer
+
+
+class _Instrumentation(object):
+    '''
+    Collects the wall time, number of calls, rows and bytes per stage. The time of a stage excludes the time of the
+    stages that are nested in it, e.g. the DataObject construction in convert_to_data_object, so that the times of all
+    stages add up to the total time. The time including the nested stages is also kept. Updates are locked, so that
+    stages can be recorded from several threads.
+    '''
+
+    def __init__(self):
+        self.enabled = False
+        self.stats = {}
+        self.callbacks = []
+        self._lock = threading.Lock()
+
+    def enable(self, callback=None):
+        with self._lock:
+            if callback is not None:
+                self.callbacks = self.callbacks + [callback]
+            self.enabled = True
+
+    def disable(self):
+        with self._lock:
+            self.enabled = False
+            self.callbacks = []
+
+    def get_stats(self):
+        with self._lock:
+            return dict((stage, dict(stats)) for stage, stats in self.stats.items())
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+
+    def add(self, stage, seconds, inclusive_seconds, rows, num_of_bytes):
+        with self._lock:
+            stats = self.stats.get(stage)
+            if stats is None:
+                stats = self.stats[stage] = {'calls': 0, 'seconds': 0.0, 'inclusive_seconds': 0.0, 'rows': 0, 'bytes': 0}
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            stats['inclusive_seconds'] += inclusive_seconds
+            stats['rows'] += rows
+            stats['bytes'] += num_of_bytes
+            callbacks = self.callbacks
+        for callback in callbacks:
+            callback(stage, seconds, rows, num_of_bytes)
+
+
+# The collector of all stages in the process
+_instrumentation = _Instrumentation()
+
+# The stages that are currently running in each thread, innermost last
+_running_stages = threading.local()
+
+
+class _Stage(object):
+    __slots__ = ('start', 'nested_seconds', 'collectors')
+
+    def __init__(self, collectors):
+        self.collectors = collectors
+        self.nested_seconds = 0.0
+        self.start = default_timer()
+
+
+def _start_stage(instrumented=None):
+    '''
+    Starts timing a stage of the instrumented object, a BaseISC or DataObject. The stage is recorded by the process
+    wide collector, by the collector of the object, and by the collectors of the stage it is nested in, so that e.g.
+    the DataObject created when a detector converts its data is also recorded by the detector. When no collector is
+    enabled, None is returned and nothing is timed.
+
+    :param instrumented: None or an object with an _instrumentation attribute
+    :return: None or the started stage, which must be passed to _record_stage
+    '''
+    stack = getattr(_running_stages, 'stack', None)
+    own = getattr(instrumented, '_instrumentation', None)
+    if not stack and not _instrumentation.enabled and (own is None or not own.enabled):
+        return None
+    collectors = list(stack[-1].collectors) if stack else []
+    if _instrumentation.enabled and _instrumentation not in collectors:
+        collectors.append(_instrumentation)
+    if own is not None and own.enabled and own not in collectors:
+        collectors.append(own)
+    if not collectors:
+        return None
+    if stack is None:
+        stack = _running_stages.stack = []
+    stage = _Stage(collectors)
+    stack.append(stage)
+    return stage
+
+
+def _record_stage(stage_name, stage, rows=0, num_of_bytes=0):
+    if stage is None:
+        return
+    inclusive_seconds = default_timer() - stage.start
+    stack = _running_stages.stack
+    while stack and stack.pop() is not stage: # Stages left by exceptions are discarded
+        pass
+    if stack:
+        stack[-1].nested_seconds += inclusive_seconds
+    seconds = inclusive_seconds - stage.nested_seconds
+    for collector in stage.collectors:
+        collector.add(stage_name, seconds, inclusive_seconds, rows, num_of_bytes)
+
+
+class _Instrumented(object):
+    '''
+    The per object instrumentation of BaseISC and DataObject, which only records the stages of the object itself and
+    of the stages nested in them.
+    '''
+
+    _instrumentation = None
+
+    def enable_instrumentation(self, callback=None):
+        '''
+        Starts recording the time of each stage of the data conversion, training and scoring of this object.
+
+        :param callback: None or a function that is called as callback(stage, seconds, rows, num_of_bytes) after each
+        instrumented call
+        :return: self
+        '''
+        if self._instrumentation is None:
+            self._instrumentation = _Instrumentation()
+        self._instrumentation.enable(callback)
+        return self
+
+    def disable_instrumentation(self):
+        '''
+        Stops recording and removes all callbacks of this object, the recorded stats are kept.
+
+        :return: self
+        '''
+        if self._instrumentation is not None:
+            self._instrumentation.disable()
+        return self
+
+    def instrumentation_stats(self):
+        '''
+        :return: a dict from stage name to a dict with the stats of this object, as in pyisc.instrumentation_stats
+        '''
+        return {} if self._instrumentation is None else self._instrumentation.get_stats()
+
+    def reset_instrumentation_stats(self):
+        if self._instrumentation is not None:
+            self._instrumentation.reset()
+        return self
+
+
+def enable_instrumentation(callback=None):
+    '''
+    Starts recording the time of each stage of the data conversion, training and scoring in all BaseISC and DataObject
+    instances in the process. Use the methods with the same names of a detector or data object to only record its own
+    stages.
+
+    :param callback: None or a function that is called as callback(stage, seconds, rows, num_of_bytes) after each
+    instrumented call
+    :return:
+    '''
+    _instrumentation.enable(callback)
+
+
+def disable_instrumentation():
+    '''
+    Stops recording and removes all callbacks, the recorded stats are kept until reset_instrumentation_stats is called.
+    '''
+    _instrumentation.disable()
+
+
+def instrumentation_stats():
+    '''
+    :return: a dict from stage name to a dict with the number of calls, the total wall time in seconds excluding the
+    nested stages, the total wall time including them, and the total number of rows processed and bytes converted in
+    the stage
+    '''
+    return _instrumentation.get_stats()
+
+
+def reset_instrumentation_stats():
+    _instrumentation.reset()
@@ -22,10 +22,13 @@ from .AnomalyClustering import AnomalyClustering
 
 class OutlierClustering(AnomalyClustering,SklearnOutlierDetector):
     max_num_of_iterations = 1000
+    # The outlier detectors must be refitted in each iteration since the outliers are excluded when fitting
+    incremental_reassignment = False
 
-    def __init__(self, n_clusters=2, n_repeat=10, *anomaly_detector_params0, **anomaly_detector_params1):
+    def __init__(self, n_clusters=2, n_repeat=10, *anomaly_detector_params0, n_jobs=1, **anomaly_detector_params1):
         self.n_clusters = n_clusters
         self.n_repeat = n_repeat
+        self.n_jobs = n_jobs
         self.ad_parms0 = anomaly_detector_params0
         self.ad_parms1 = anomaly_detector_params1
         self.clf_ = None
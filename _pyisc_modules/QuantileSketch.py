@@ -0,0 +1,120 @@
+"""
+A mergeable quantile sketch used for calibrating anomaly thresholds on data streams.
+"""
+# --------------------------------------------------------------------------
+# Copyright (C) 2014, 2015, 2016, 2017 SICS Swedish ICT AB
+#
+# Main author: Tomas Olsson <tol@sics.se>
+#
+# This code is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This code is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this code.  If not, see <http://www.gnu.org/licenses/>.
+# --------------------------------------------------------------------------
+
+
+from numpy import asarray, concatenate, cumsum, empty, float64, full, ravel, searchsorted, sort
+from numpy.random import RandomState
+
+
+class QuantileSketch(object):
+
+    def __init__(self, k=200, random_state=None):
+        '''
+        A KLL quantile sketch that approximates the quantiles of all values added to it in memory proportional to k,
+        independent of the number of values. The values are kept in compactors, one per level, where a value at level h
+        represents 2^h of the added values. When a compactor becomes full, its values are sorted and every second value
+        is moved to the next level. The rank error of a quantile is about 1.7/k of the number of added values. Sketches
+        with the same k can be merged, so that values can be added by parallel workers.
+
+        :param k: the size of the largest compactor, larger values give more accurate quantiles
+        :param random_state: None, an integer seed or a numpy RandomState used for choosing the values to keep
+        '''
+        assert k >= 8
+        self.k = k
+        self.count = 0
+        self._compactors = [empty(0, dtype=float64)]
+        self._random = random_state if isinstance(random_state, RandomState) else RandomState(random_state)
+
+    def _capacity(self, level):
+        depth = len(self._compactors) - level - 1
+        return max(int(self.k * (2.0 / 3.0) ** depth) + 1, 2)
+
+    def _compress(self):
+        level = 0
+        while level < len(self._compactors):
+            values = self._compactors[level]
+            if len(values) >= self._capacity(level):
+                if level + 1 == len(self._compactors):
+                    self._compactors.append(empty(0, dtype=float64))
+                values = sort(values)
+                # If the number of values is odd, the smallest value is kept at this level
+                keep = len(values) % 2
+                offset = self._random.randint(2)
+                self._compactors[level + 1] = concatenate([self._compactors[level + 1], values[keep + offset::2]])
+                self._compactors[level] = values[:keep]
+            level += 1
+
+    def update(self, values):
+        '''
+        Adds the values to the sketch.
+
+        :param values: a float, or an array or list of floats
+        :return: self
+        '''
+        values = ravel(asarray(values, dtype=float64))
+        self._compactors[0] = concatenate([self._compactors[0], values])
+        self.count += len(values)
+        self._compress()
+        return self
+
+    def merge(self, other):
+        '''
+        Adds all values of another sketch to this sketch.
+
+        :param other: a QuantileSketch with the same k
+        :return: self
+        '''
+        assert isinstance(other, QuantileSketch) and self.k == other.k, "Only sketches with the same k can be merged"
+        while len(self._compactors) < len(other._compactors):
+            self._compactors.append(empty(0, dtype=float64))
+        for level, values in enumerate(other._compactors):
+            self._compactors[level] = concatenate([self._compactors[level], values])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        '''
+        Returns the approximate q-quantile of the added values, that is, the smallest value whose rank is at least q
+        times the number of added values.
+
+        :param q: a float or an array of floats in [0, 1]
+        :return: a float or an array of floats, nan if no values have been added
+        '''
+        q = asarray(q, dtype=float64)
+        if self.count == 0:
+            return full(q.shape, float('nan'))[()]
+        values = concatenate(self._compactors)
+        weights = concatenate([full(len(c), 2 ** level, dtype=float64) for level, c in enumerate(self._compactors)])
+        order = values.argsort(kind='stable')
+        values = values[order]
+        ranks = cumsum(weights[order])
+        index = searchsorted(ranks, q * ranks[-1], side='left')
+        return values[index.clip(0, len(values) - 1)][()]
+
+    def reset(self):
+        '''
+        Removes all values from the sketch.
+        '''
+        self.count = 0
+        self._compactors = [empty(0, dtype=float64)]
+
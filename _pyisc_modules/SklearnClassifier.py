@@ -49,26 +49,47 @@ class SklearnClassifier(BaseISC, BaseEstimator, ClassifierMixin):
         super(SklearnClassifier, self).__init__(component_models,output_combination_rule,training_anomaly_threshold)
 
     @staticmethod
-    def clf(anomaly_detector,classification_threshold=1e12):
+    def clf(anomaly_detector,classification_threshold=1e12, copy=False):
         '''
         Converts a pyisc AnomalyDetector into a SklearnClassifier
         :param self:
         :param anomaly_detector:
         :param classification_threshold:
+        :param copy: if False, the classifier shares the learned model with the anomaly detector, so that training one
+        of them affects both, otherwise the classifier gets a native copy of the model
         :return:
         '''
         assert isinstance(anomaly_detector, pyisc.AnomalyDetector)
         classifier =  SklearnClassifier()
-        classifier._anomaly_detector = anomaly_detector._anomaly_detector
+        if copy:
+            classifier._anomaly_detector = anomaly_detector._clone_inner_detector(anomaly_detector._anomaly_detector)
+        else:
+            classifier._anomaly_detector = anomaly_detector._anomaly_detector
+        classifier.component_models = anomaly_detector.component_models
+        classifier.output_combination_rule = anomaly_detector.output_combination_rule
+        classifier._max_index = anomaly_detector._max_index
         classifier.class_column = anomaly_detector.class_column
         classifier.anomaly_threshold = anomaly_detector.anomaly_threshold
-        classifier.classes_ = anomaly_detector.classes_
+        classifier.classes_ = list(anomaly_detector.classes_) if copy and anomaly_detector.classes_ is not None else anomaly_detector.classes_
         classifier.is_clustering = anomaly_detector.is_clustering
         classifier.num_of_partitions = anomaly_detector.num_of_partitions
         classifier.classification_threshold = classification_threshold
 
         return classifier
 
+    def partial_fit(self, X, y, classes=None):
+        '''
+        Incrementally trains the classifier on a batch of rows, so that it can be trained on a stream without keeping
+        earlier batches. The first call sets up the classifier, so that no prior call to fit is required.
+
+        :param X: an array of arrays
+        :param y: an array with the class of each row in X, new classes are appended to classes_
+        :param classes: None or a list of all classes, which can be provided in the first call to fix their order
+        :return: self
+        '''
+        assert y is not None, "A classifier must be trained with classes"
+        return self._partial_fit(X, y, classes)
+
     def predict(self, X):
         '''
         This method classifies each instance in X with a class, if the anomaly detector was trained with classes.
@@ -113,11 +134,9 @@ class SklearnClassifier(BaseISC, BaseEstimator, ClassifierMixin):
 
         if X1 is not None:
 
-            logps = self.compute_logp(X1)
-
-            LogPs = [x-logsumexp(x) for x in array(logps).T] #normalized
+            logps = array(self.compute_logp(X1)).T
 
-            return array(LogPs)
+            return logps - logsumexp(logps, axis=1)[:, None] #normalized
         else:
             raise ValueError("Unknown type of data to score:", type(X))
 
@@ -21,16 +21,23 @@ classifiers (http://scikit-learn.org)
 # along with this code.  If not, see <http://www.gnu.org/licenses/>.
 # --------------------------------------------------------------------------
 
+import copy
+
 import pyisc
-from numpy import percentile, abs, c_, array
+from numpy import percentile, abs, c_, array, ones
 
 from pyisc import DataObject
+from _pyisc_modules.QuantileSketch import QuantileSketch
 
 
 class SklearnOutlierDetector(pyisc.AnomalyDetector):
     threshold_ = None
+    score_sketch_ = None
+    '''
+    The QuantileSketch of the decision values, or None if the threshold is not calibrated on streams.
+    '''
 
-    def __init__(self,contamination=0.01, *anomaly_detector_params0, **anomaly_detector_params1):
+    def __init__(self,contamination=0.01, *anomaly_detector_params0, sketch_size=None, **anomaly_detector_params1):
         '''
         This class can be used for classifying anomalies when the contamination fraction is known.
         It is implemented to be used together with the methods listed at
@@ -38,9 +45,15 @@ class SklearnOutlierDetector(pyisc.AnomalyDetector):
 
         :param contamination: fraction of outliers in the data set
         :param anomaly_detector_params0: the same parameters as in the pyisc.AnomalyDetector
+        :param sketch_size: None or the k of a QuantileSketch of the decision values. If set, the sketch is updated with
+        the rows trained by fit, fit_incrementally and partial_fit, and the threshold is set from it, so that the
+        threshold follows the contamination of a data stream in constant memory. Scoring does not change the sketch.
         :param anomaly_detector_params1: the same parameters as in the pyisc.AnomalyDetector
         '''
         self.contamination = contamination
+        self.sketch_size = sketch_size
+        if sketch_size is not None:
+            self.score_sketch_ = QuantileSketch(sketch_size)
         super(pyisc.AnomalyDetector,self).__init__(*anomaly_detector_params0, **anomaly_detector_params1)
 
     def fit(self, X, y=None):
@@ -50,20 +63,109 @@ class SklearnOutlierDetector(pyisc.AnomalyDetector):
 
         self._fit(X,y)
 
+        # The rows the model is currently trained on, only rows that change side of the threshold are trained or untrained
+        inliers = ones(len(X), dtype=bool)
+
         count = 0
         while count < 100 and (old_threshold is None or abs(threshold - old_threshold) > 0.01):
             old_threshold = threshold
-            ss = self.decision_function(X,y)
+            ss = self._inverse_score(pyisc.AnomalyDetector.anomaly_score(self, X, y))
             threshold = percentile(ss, 100 * self.contamination)
 
-            self._fit(X[ss > threshold],y[ss > threshold] if y is not None else None)
+            new_inliers = ss > threshold
+            removed = inliers & ~new_inliers
+            added = new_inliers & ~inliers
+            if removed.any():
+                self.unfit_incrementally(X[removed], y[removed] if y is not None else None)
+            if added.any():
+                pyisc.AnomalyDetector.fit_incrementally(self, X[added], y[added] if y is not None else None)
+            inliers = new_inliers
 
             count += 1
 
         self.threshold_ = threshold
 
+        if self.score_sketch_ is not None:
+            self.score_sketch_.reset()
+            self.score_sketch_.update(ss)
+
+        return self
+
+    def _inverse_score(self, scores):
+        return 1.0/(scores+1e-10)
+
+    def _calibrate_threshold(self):
+        if self.score_sketch_ is not None and self.score_sketch_.count > 0:
+            self.threshold_ = self.score_sketch_.quantile(self.contamination)
+
+    def _update_sketch(self, X):
+        self.score_sketch_.update(self._inverse_score(pyisc.AnomalyDetector.anomaly_score(self, X)))
+        self._calibrate_threshold()
+
+    def fit_incrementally(self, X, y=None):
+        '''
+        Incrementally train the anomaly detector. If the threshold is calibrated on streams, the rows are scored before
+        they are trained, so that the threshold is calibrated on the scores of rows that are new to the model.
+
+        :param X: a single array, an array of arrays, or an instance of pyisc DataObject
+        :param y: a single array with classes or None, optional, only required if previously trained with classes
+        :return: self
+        '''
+        if self.score_sketch_ is not None:
+            if not isinstance(X, pyisc.DataObject):
+                X = self._convert_to_data_object_in_scoring(array(X), y)
+                y = None
+            self._update_sketch(X)
+        return pyisc.AnomalyDetector.fit_incrementally(self, X, y)
+
+    def partial_fit(self, X, y=None, classes=None):
+        '''
+        Incrementally trains the outlier detector on a batch of rows, so that it can be trained on a stream without
+        keeping earlier batches. The first call sets up the detector, so that no prior call to fit is required. The
+        threshold is calibrated with a QuantileSketch of the decision values of the rows scored before they are
+        trained, which is created with the default size if sketch_size was not set.
+
+        :param X: an array of arrays
+        :param y: None or an array with the class of each row in X, new classes are appended to classes_
+        :param classes: None or a list of classes
+        :return: self
+        '''
+        if self.score_sketch_ is None:
+            self.score_sketch_ = QuantileSketch() if self.sketch_size is None else QuantileSketch(self.sketch_size)
+        # The classes of the batch are added before it is scored, so that new classes are not scored as unknown classes
+        is_trained = self._num_of_columns is not None
+        data_object = self._to_partial_fit_data_object(X, y, classes)
+        if is_trained:
+            self._update_sketch(data_object)
+        elif self.threshold_ is None:
+            self.threshold_ = 0.0
+        return self._partial_fit_data_object(data_object, is_trained)
+
+    def merge(self, other):
+        '''
+        Merges the model and, if both detectors calibrate the threshold on streams, the sketch of decision values of
+        another detector into this detector, and sets the threshold from the merged sketch.
+
+        :param other: a fitted SklearnOutlierDetector
+        :return: self
+        '''
+        pyisc.AnomalyDetector.merge(self, other)
+        if self.score_sketch_ is not None and getattr(other, 'score_sketch_', None) is not None:
+            self.score_sketch_.merge(other.score_sketch_)
+            self._calibrate_threshold()
         return self
 
+    def reset(self):
+        pyisc.AnomalyDetector.reset(self)
+        if self.score_sketch_ is not None:
+            self.score_sketch_.reset()
+
+    def clone(self):
+        clone = pyisc.AnomalyDetector.clone(self)
+        if self.score_sketch_ is not None:
+            clone.score_sketch_ = copy.deepcopy(self.score_sketch_)
+        return clone
+
     def decision_function(self,X,y=None):
         '''
         Returns a measure of anomaly (the log probability of the data) from smallest (most anomalous) to high (least anomalous).
@@ -72,7 +174,7 @@ class SklearnOutlierDetector(pyisc.AnomalyDetector):
         :return: numpy array
         '''
 
-        ss = (1.0/(self.anomaly_score(X,y)+1e-10) - self.threshold_)
+        ss = (self._inverse_score(self.anomaly_score(X,y)) - self.threshold_)
 
         return ss
 
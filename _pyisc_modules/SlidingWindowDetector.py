@@ -0,0 +1,154 @@
+"""
+The Python Wrapper of an ISC anomaly detector that is trained on a sliding window of the most recent data.
+"""
+# --------------------------------------------------------------------------
+# Copyright (C) 2014, 2015, 2016, 2017 SICS Swedish ICT AB
+#
+# Main author: Tomas Olsson <tol@sics.se>
+#
+# This code is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This code is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this code.  If not, see <http://www.gnu.org/licenses/>.
+# --------------------------------------------------------------------------
+
+from numpy import array, zeros
+
+import pyisc
+from pyisc import AnomalyDetector
+
+
+class SlidingWindowDetector(AnomalyDetector):
+
+    def __init__(self, window_size=10000, max_age=None, *anomaly_detector_params0, **anomaly_detector_params1):
+        '''
+        An anomaly detector that is only trained on the most recent rows. The rows are kept in a ring buffer, and when
+        new rows are added with update, the rows that leave the window are untrained. The window contains at most
+        window_size rows and, if max_age is provided, only rows with a time stamp within max_age of the newest row.
+
+        :param window_size: the maximum number of rows in the window
+        :param max_age: None for no maximum age, or the maximum age of a row in the window, which must be larger than
+        zero, in the same unit as the time stamps
+        :param anomaly_detector_params0: the same parameters as in the pyisc.AnomalyDetector
+        :param anomaly_detector_params1: the same parameters as in the pyisc.AnomalyDetector
+        '''
+        if max_age is not None and max_age <= 0:
+            raise ValueError("The maximum age must be None or larger than zero", max_age)
+        self.window_size = window_size
+        self.max_age = max_age
+        self._window = None
+        AnomalyDetector.__init__(self, *anomaly_detector_params0, **anomaly_detector_params1)
+
+    def fit(self, X, y=None, timestamps=None):
+        '''
+        Restarts the learning and trains the detector on the last rows of X that fit into the window.
+
+        :param X: an array of arrays
+        :param y: None or an array with the classes of the rows
+        :param timestamps: None or an array with non-decreasing time stamps of the rows, required if max_age is set
+        :return: self
+        '''
+        self.reset()
+        return self.update(X, y, timestamps)
+
+    def reset(self):
+        AnomalyDetector.reset(self)
+        self._window = None
+        self.class_column = None
+        self.classes_ = None
+
+    def update(self, X, y=None, timestamps=None):
+        '''
+        Adds the rows in X to the window and trains them in a single call, after the rows that leave the window have
+        been untrained.
+
+        :param X: an array of arrays
+        :param y: None or an array with the classes of the rows, must be consistent with previous updates
+        :param timestamps: None or an array with non-decreasing time stamps of the rows, required if max_age is set, which
+        must not be smaller than the time stamp of the newest row in the window
+        :return: self
+        '''
+        X = array(X)
+        if self._window is None:
+            self.class_column = None if y is None else X.shape[1]
+            self.classes_ = None if y is None else []
+            self._anomaly_detector._SetParams(
+                0,
+                -1 if y is None else X.shape[1],
+                self.anomaly_threshold,
+                1 if self.is_clustering else 0
+            )
+        if y is not None:
+            y = array(y)
+            pyisc.DataObject._class_ids(y, self.classes_, add_new_classes=True)
+
+        data_object = self._convert_to_data_object_in_scoring(X, y)
+
+        if self._window is None:
+            assert self._max_index < data_object.length()  # ensure that data distribution has not to large index into the data
+            self._window = pyisc._RowWindow(self.window_size, data_object.length())
+
+        if timestamps is None:
+            assert self.max_age is None, "Time stamps are required when max_age is set"
+            timestamps = zeros(len(X))
+
+        if not self._anomaly_detector._TrainWindow(self._window, data_object, array(timestamps, dtype=float), self._max_age()):
+            raise ValueError("The time stamps must be non-decreasing and not older than the newest row in the window")
+
+        return self
+
+    def expire(self, timestamp):
+        '''
+        Untrains and removes the rows that are older than max_age relative to timestamp, without adding new rows.
+
+        :param timestamp: the current time
+        :return: self
+        '''
+        if self._window is not None:
+            self._anomaly_detector._ExpireWindow(self._window, float(timestamp), self._max_age())
+        return self
+
+    def clone(self):
+        clone = AnomalyDetector.clone(self)
+        if self._window is not None:
+            num_of_columns = self._window.length()
+            rows = self._window._getRows(self._window.size() * num_of_columns)
+            clone._window = pyisc._RowWindow(self.window_size, num_of_columns)
+            clone._window._putRows(rows.reshape((-1, num_of_columns)), self._window._getTimes(self._window.size()))
+        return clone
+
+    def window_length(self):
+        '''
+        :return: the number of rows in the window
+        '''
+        return 0 if self._window is None else self._window.size()
+
+    def _max_age(self):
+        return -1.0 if self.max_age is None else float(self.max_age)
+
+    def __getstate__(self):
+        odict = AnomalyDetector.__getstate__(self)
+        del odict['_window']
+        if self._window is not None:
+            odict['_window_columns'] = self._window.length()
+            odict['_window_rows'] = self._window._getRows(self._window.size() * self._window.length())
+            odict['_window_times'] = self._window._getTimes(self._window.size())
+        return odict
+
+    def __setstate__(self, dict):
+        num_of_columns = dict.pop('_window_columns', None)
+        rows = dict.pop('_window_rows', None)
+        times = dict.pop('_window_times', None)
+        AnomalyDetector.__setstate__(self, dict)
+        self._window = None
+        if num_of_columns is not None:
+            self._window = pyisc._RowWindow(self.window_size, num_of_columns)
+            self._window._putRows(rows.reshape((-1, num_of_columns)), times)
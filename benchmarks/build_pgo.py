@@ -0,0 +1,78 @@
+"""
+Builds the native extension with profile-guided optimization: an instrumented extension is built, the benchmarks are
+run on a small set of data sets as the training workload, and the extension is rebuilt with the recorded profiles.
+Requires GCC, or Clang with llvm-profdata.
+
+Example:
+
+    python benchmarks/build_pgo.py
+    PYISC_MARCH=native python benchmarks/build_pgo.py --install
+"""
+# --------------------------------------------------------------------------
+# Copyright (C) 2014, 2015, 2016, 2017 SICS Swedish ICT AB
+#
+# Main author: Tomas Olsson <tol@sics.se>
+#
+# This code is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This code is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this code.  If not, see <http://www.gnu.org/licenses/>.
+# --------------------------------------------------------------------------
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The training workload covers all models and benchmarks, but with smaller data sets than the default benchmarks
+workload_args = ['--rows', '1000', '10000', '--columns', '2', '8', '32', '--repeat', '1']
+
+
+def _run(args, env):
+    print(' '.join(args))
+    subprocess.check_call(args, cwd=root_dir, env=env)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Builds pyisc with profile-guided optimization.")
+    parser.add_argument('--profile-dir', default=os.path.join(root_dir, 'build', 'pgo'),
+                        help="the directory where the profiles are written")
+    parser.add_argument('--install', action='store_true',
+                        help="install the optimized extension instead of building it in place")
+    args = parser.parse_args(argv)
+
+    profile_dir = os.path.abspath(args.profile_dir)
+    if os.path.isdir(profile_dir):
+        shutil.rmtree(profile_dir)
+
+    env = dict(os.environ, PYISC_BUILD_PROFILE='optimized', PYISC_PGO_DIR=profile_dir)
+    _run([sys.executable, 'setup.py', 'build_ext', '--inplace', '--force'], dict(env, PYISC_PGO='generate'))
+
+    # The instrumented extension is imported from the source directory when running the workload
+    workload_env = dict(env, PYTHONPATH=os.pathsep.join([root_dir] + [p for p in [os.environ.get('PYTHONPATH')] if p]))
+    _run([sys.executable, os.path.join('benchmarks', 'run_benchmarks.py')] + workload_args, workload_env)
+
+    # Clang writes raw profiles that must be merged before they can be used, GCC writes profiles that are used as they are
+    raw_profiles = [os.path.join(profile_dir, f) for f in os.listdir(profile_dir) if f.endswith('.profraw')]
+    if raw_profiles:
+        _run(['llvm-profdata', 'merge', '-output=%s' % os.path.join(profile_dir, 'default.profdata')] + raw_profiles, env)
+
+    if args.install:
+        _run([sys.executable, 'setup.py', 'build_ext', '--force', 'install'], dict(env, PYISC_PGO='use'))
+    else:
+        _run([sys.executable, 'setup.py', 'build_ext', '--inplace', '--force'], dict(env, PYISC_PGO='use'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Compares two JSON files written by run_benchmarks.py and reports the benchmarks that have become slower.
+
+Example:
+
+    python benchmarks/compare_benchmarks.py baseline.json results.json --threshold 1.2
+"""
+# --------------------------------------------------------------------------
+# Copyright (C) 2014, 2015, 2016, 2017 SICS Swedish ICT AB
+#
+# Main author: Tomas Olsson <tol@sics.se>
+#
+# This code is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This code is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this code.  If not, see <http://www.gnu.org/licenses/>.
+# --------------------------------------------------------------------------
+
+import argparse
+import json
+import sys
+
+
+def _key(result):
+    return (result['benchmark'], result['model'], result['rows'], result['columns'])
+
+
+def compare(baseline, current, threshold=1.2):
+    '''
+    Compares the minimum times of the benchmarks contained in both results.
+
+    :param baseline: a dict loaded from a results file
+    :param current: a dict loaded from a results file
+    :param threshold: the ratio current/baseline time above which a benchmark is considered a regression
+    :return: a list of (key, baseline seconds, current seconds, ratio) sorted by ratio, and a list of the regressions
+    '''
+    baseline_times = dict((_key(r), r['min_seconds']) for r in baseline['results'])
+    comparisons = []
+    for r in current['results']:
+        key = _key(r)
+        if key in baseline_times and baseline_times[key] > 0:
+            comparisons.append((key, baseline_times[key], r['min_seconds'], r['min_seconds'] / baseline_times[key]))
+    comparisons.sort(key=lambda c: c[3], reverse=True)
+    return comparisons, [c for c in comparisons if c[3] > threshold]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compares two pyisc benchmark results.")
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    comparisons, regressions = compare(baseline, current, args.threshold)
+    for (name, model, rows, columns), baseline_seconds, current_seconds, ratio in comparisons:
+        print("%-22s %-30s %8i rows %3i columns %10.6f s %10.6f s %6.2fx%s" %
+              (name, model, rows, columns, baseline_seconds, current_seconds, ratio,
+               " REGRESSION" if ratio > args.threshold else ""))
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Synthetic data generators for the benchmarks, one per type of statistical model.
+"""
+# --------------------------------------------------------------------------
+# Copyright (C) 2014, 2015, 2016, 2017 SICS Swedish ICT AB
+#
+# Main author: Tomas Olsson <tol@sics.se>
+#
+# This code is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This code is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this code.  If not, see <http://www.gnu.org/licenses/>.
+# --------------------------------------------------------------------------
+
+import numpy
+
+import pyisc
+
+
+def gaussian(num_of_rows, num_of_columns, random_state):
+    '''
+    Independent normally distributed columns, modelled by one univariate Gaussian per column and one multivariate
+    Gaussian of all columns.
+    '''
+    X = random_state.normal(random_state.uniform(-5, 5, num_of_columns), random_state.uniform(0.5, 3, num_of_columns),
+                            (num_of_rows, num_of_columns))
+    models = [pyisc.P_Gaussian(col) for col in range(num_of_columns)] + [pyisc.P_Gaussian(list(range(num_of_columns)))]
+    return X, models
+
+
+def _counts(num_of_rows, num_of_columns, random_state):
+    # Pairs of a frequency column followed by a period column
+    num_of_pairs = max(num_of_columns // 2, 1)
+    periods = random_state.randint(1, 10, (num_of_rows, num_of_pairs))
+    frequencies = random_state.poisson(random_state.uniform(1, 20, num_of_pairs) * periods)
+    X = numpy.empty((num_of_rows, 2 * num_of_pairs))
+    X[:, 0::2] = frequencies
+    X[:, 1::2] = periods
+    return X, num_of_pairs
+
+
+def poisson(num_of_rows, num_of_columns, random_state):
+    '''
+    Counts over periods of varying length, modelled by one Poisson distribution per pair of frequency and period columns.
+    '''
+    X, num_of_pairs = _counts(num_of_rows, num_of_columns, random_state)
+    return X, [pyisc.P_Poisson(2 * i, 2 * i + 1) for i in range(num_of_pairs)]
+
+
+def poisson_onesided(num_of_rows, num_of_columns, random_state):
+    '''
+    The same data as poisson, modelled by one sided Poisson distributions.
+    '''
+    X, num_of_pairs = _counts(num_of_rows, num_of_columns, random_state)
+    return X, [pyisc.P_PoissonOnesided(2 * i, 2 * i + 1) for i in range(num_of_pairs)]
+
+
+def gamma(num_of_rows, num_of_columns, random_state):
+    '''
+    The same data as poisson, modelled by Gamma distributions.
+    '''
+    X, num_of_pairs = _counts(num_of_rows, num_of_columns, random_state)
+    return X, [pyisc.P_Gamma(2 * i, 2 * i + 1) for i in range(num_of_pairs)]
+
+
+def _chain(num_of_rows, num_of_columns, random_state):
+    # Each column depends linearly on the previous column
+    X = numpy.empty((num_of_rows, num_of_columns))
+    X[:, 0] = random_state.normal(0, 1, num_of_rows)
+    for col in range(1, num_of_columns):
+        X[:, col] = 0.8 * X[:, col - 1] + random_state.normal(0, 0.5, num_of_rows)
+    return X
+
+
+def conditional_gaussian(num_of_rows, num_of_columns, random_state):
+    '''
+    A Markov chain of columns, modelled by one conditional Gaussian per column given the previous column.
+    '''
+    num_of_columns = max(num_of_columns, 2)
+    X = _chain(num_of_rows, num_of_columns, random_state)
+    return X, [pyisc.P_Gaussian(0)] + [pyisc.P_ConditionalGaussian([col], [col - 1]) for col in range(1, num_of_columns)]
+
+
+def conditional_gaussian_combiner(num_of_rows, num_of_columns, random_state):
+    '''
+    The same data as conditional_gaussian, modelled by a single combiner of the conditional Gaussians.
+    '''
+    num_of_columns = max(num_of_columns, 2)
+    X = _chain(num_of_rows, num_of_columns, random_state)
+    return X, [pyisc.P_ConditionalGaussianCombiner(
+        [pyisc.P_ConditionalGaussian([col], [col - 1]) for col in range(1, num_of_columns)])]
+
+
+def dependency_matrix(num_of_rows, num_of_columns, random_state):
+    '''
+    Columns forming a matrix with two elements per row, modelled by a conditional Gaussian dependency matrix.
+    '''
+    num_of_columns = max(num_of_columns - num_of_columns % 2, 2)
+    X = _chain(num_of_rows, num_of_columns, random_state)
+    return X, [pyisc.P_ConditionalGaussianDependencyMatrix(list(range(num_of_columns)), 2)]
+
+
+generators = {
+    'gaussian': gaussian,
+    'poisson': poisson,
+    'poisson_onesided': poisson_onesided,
+    'gamma': gamma,
+    'conditional_gaussian': conditional_gaussian,
+    'conditional_gaussian_combiner': conditional_gaussian_combiner,
+    'dependency_matrix': dependency_matrix,
+}
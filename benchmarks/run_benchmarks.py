@@ -0,0 +1,163 @@
+"""
+Runs the pyisc benchmarks and writes the results as JSON, so that the results of different commits can be compared
+with compare_benchmarks.py.
+
+Example:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --quick --models gaussian poisson --benchmarks fit anomaly_score
+"""
+# --------------------------------------------------------------------------
+# Copyright (C) 2014, 2015, 2016, 2017 SICS Swedish ICT AB
+#
+# Main author: Tomas Olsson <tol@sics.se>
+#
+# This code is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This code is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this code.  If not, see <http://www.gnu.org/licenses/>.
+# --------------------------------------------------------------------------
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from timeit import default_timer
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pyisc
+from generators import generators
+
+# The clustering is restarted and refitted many times, so it is only run on the smaller data sets
+max_clustering_rows = 10000
+
+
+def _benchmarks(X, models):
+    '''
+    Returns the benchmarks as a list of (name, function) where each function runs the benchmarked operation once.
+    '''
+    detector = pyisc.AnomalyDetector(models).fit(X)
+    incremental_detector = pyisc.AnomalyDetector(models).fit(X)
+    exported_json = detector.exportJSon()
+    exported_binary = detector.exportBinary()
+
+    benchmarks = [
+        ('data_object', lambda: pyisc.DataObject(X)),
+        ('fit', lambda: pyisc.AnomalyDetector(models).fit(X)),
+        ('fit_incrementally', lambda: incremental_detector.fit_incrementally(X)),
+        ('anomaly_score', lambda: detector.anomaly_score(X)),
+        ('anomaly_score_details', lambda: detector.anomaly_score_details(X, as_arrays=True)),
+        ('score_one', lambda: [detector.score_one(x) for x in X[:1000]]),
+        ('export_json', detector.exportJSon),
+        ('import_json', lambda: pyisc.AnomalyDetector(models).importJSon(exported_json)),
+        ('export_binary', detector.exportBinary),
+        ('import_binary', lambda: pyisc.AnomalyDetector(models).importBinary(exported_binary)),
+        ('outlier_detector_fit', lambda: pyisc.SklearnOutlierDetector(0.05, models).fit(X)),
+    ]
+    if len(X) <= max_clustering_rows:
+        benchmarks += [('clustering_fit', lambda: pyisc.AnomalyClustering(2, 2, models).fit(X))]
+    return benchmarks
+
+
+def _time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = default_timer()
+        function()
+        times.append(default_timer() - start)
+    return times
+
+
+def _metadata():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                         stderr=subprocess.STDOUT).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'build': pyisc.build_configuration(),
+    }
+
+
+def run(models, rows, columns, benchmark_names=None, repeat=3, seed=0, verbose=True):
+    '''
+    Runs the benchmarks for all combinations of models, number of rows and number of columns.
+
+    :param models: a list of generator names in generators.generators
+    :param rows: a list of numbers of rows
+    :param columns: a list of numbers of columns
+    :param benchmark_names: None or a list of names of the benchmarks to run, None means all
+    :param repeat: the number of times each benchmark is run
+    :param seed: the random seed of the generated data
+    :param verbose: if True, each result is printed
+    :return: a dict with the metadata and a list of results
+    '''
+    results = []
+    for model in models:
+        for num_of_rows in rows:
+            for num_of_columns in columns:
+                X, components = generators[model](num_of_rows, num_of_columns, numpy.random.RandomState(seed))
+                for name, function in _benchmarks(X, components):
+                    if benchmark_names is not None and name not in benchmark_names:
+                        continue
+                    times = _time(function, repeat)
+                    result = {
+                        'benchmark': name,
+                        'model': model,
+                        'rows': num_of_rows,
+                        'columns': X.shape[1],
+                        'repeat': repeat,
+                        'min_seconds': min(times),
+                        'median_seconds': float(numpy.median(times)),
+                    }
+                    results.append(result)
+                    if verbose:
+                        print("%-22s %-30s %8i rows %3i columns %10.6f s" %
+                              (name, model, num_of_rows, X.shape[1], result['min_seconds']))
+    return {'metadata': _metadata(), 'results': results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Runs the pyisc benchmarks.")
+    parser.add_argument('--models', nargs='+', default=sorted(generators.keys()), choices=sorted(generators.keys()))
+    parser.add_argument('--rows', nargs='+', type=int, default=[1000, 10000, 100000])
+    parser.add_argument('--columns', nargs='+', type=int, default=[2, 8, 32])
+    parser.add_argument('--benchmarks', nargs='+', default=None, help="the names of the benchmarks to run, default all")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quick', action='store_true', help="only run the smallest data sets")
+    parser.add_argument('--output', default=None, help="the JSON file to write the results to")
+    args = parser.parse_args(argv)
+
+    rows = [min(args.rows)] if args.quick else args.rows
+    columns = [min(args.columns)] if args.quick else args.columns
+
+    results = run(args.models, rows, columns, args.benchmarks, args.repeat, args.seed)
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -27,9 +27,15 @@
  #include "isc2/anomalydetector.hh"
  #include "src/_Format.hh"
  #include "src/_DataObject.hh"
+ #include "src/_BufferDataObject.hh"
+ #include "src/_RowWindow.hh"
  #include "src/_AnomalyDetector.hh"
  #include "src/_JSonExporter.hh"
  #include "src/_JSonImporter.hh"
+ #include "src/_BinaryExporter.hh"
+ #include "src/_BinaryImporter.hh"
+ #include "src/_DetectorBank.hh"
+ #include "src/_Scorer.hh"
 
  %}
  %include <typemaps.i>
@@ -40,6 +46,50 @@
  import_array();
  %}
 
+ %{
+ /* The build profile, architecture and profile-guided optimization are defined by setup.py as plain words */
+ #define PYISC_STRINGIFY(x) #x
+ #define PYISC_TO_STRING(x) PYISC_STRINGIFY(x)
+
+ std::string _buildConfiguration() {
+   std::string configuration = "profile=";
+ #ifdef PYISC_BUILD_PROFILE
+   configuration += PYISC_TO_STRING(PYISC_BUILD_PROFILE);
+ #else
+   configuration += "portable";
+ #endif
+ #ifdef PYISC_BUILD_LTO
+   configuration += ";lto=1";
+ #else
+   configuration += ";lto=0";
+ #endif
+ #ifdef PYISC_BUILD_MARCH
+   configuration += ";march=" PYISC_TO_STRING(PYISC_BUILD_MARCH);
+ #endif
+ #ifdef PYISC_BUILD_PGO
+   configuration += ";pgo=" PYISC_TO_STRING(PYISC_BUILD_PGO);
+ #endif
+ #if defined(__clang__)
+   configuration += ";compiler=clang " __clang_version__;
+ #elif defined(__GNUC__)
+   configuration += ";compiler=gcc " __VERSION__;
+ #elif defined(_MSC_VER)
+   configuration += ";compiler=msvc " PYISC_TO_STRING(_MSC_VER);
+ #endif
+ #if defined(__AVX512F__)
+   configuration += ";compiled_simd=avx512f";
+ #elif defined(__AVX2__)
+   configuration += ";compiled_simd=avx2";
+ #else
+   configuration += ";compiled_simd=baseline";
+ #endif
+   return configuration;
+ }
+ %}
+
+ /* Returns the build configuration as key=value pairs separated by semicolons */
+ std::string _buildConfiguration();
+
 
 
 
@@ -163,11 +213,25 @@ void _free_array_int(int* array) {
 
  %apply (double* IN_ARRAY1, int DIM1) {(double* in_array1D, int num_of_columns)}
  %apply (double* IN_ARRAY2, int DIM1, int DIM2) {(double* in_array2D, int num_of_rows, int num_of_columns)}
+ %apply (int* INPLACE_ARRAY2, int DIM1, int DIM2) {(int* in_buffer2D, int num_of_rows, int num_of_columns)}
  %apply (double* ARGOUT_ARRAY1, int DIM1) {(double* deviations, int deviations_length)}
  %apply (int* ARGOUT_ARRAY1, int DIM1) {(int* class_ids, int class_ids_length)}
  %apply (int* ARGOUT_ARRAY1, int DIM1) {(int* cluster_ids, int cluster_ids_length)}
  %apply (double* ARGOUT_ARRAY1, int DIM1) {(double* out_1DArray, int num_of_elements)}
  %apply (double* ARGOUT_ARRAY1, int DIM1) {(double* logp, int size)}
+ %apply (double* INPLACE_ARRAY1, int DIM1) {(double* out_anomalies, int num_of_anomalies)}
+ %apply (int* INPLACE_ARRAY1, int DIM1) {(int* out_classes, int num_of_classes)}
+ %apply (int* INPLACE_ARRAY1, int DIM1) {(int* out_clusters, int num_of_clusters)}
+ %apply (double* INPLACE_ARRAY2, int DIM1, int DIM2) {(double* out_deviations, int deviations_rows, int deviations_columns)}
+ %apply (double* INPLACE_ARRAY2, int DIM1, int DIM2) {(double* out_peak, int peak_rows, int peak_columns)}
+ %apply (double* INPLACE_ARRAY2, int DIM1, int DIM2) {(double* out_min, int min_rows, int min_columns)}
+ %apply (double* INPLACE_ARRAY2, int DIM1, int DIM2) {(double* out_max, int max_rows, int max_columns)}
+ %apply (double* INPLACE_ARRAY2, int DIM1, int DIM2) {(double* out_logp, int logp_rows, int logp_columns)}
+ %apply (double* IN_ARRAY1, int DIM1) {(double* in_timestamps, int num_of_timestamps)}
+ %apply (int* ARGOUT_ARRAY1, int DIM1) {(int* out_rows, int num_of_elements)}
+ %apply (double* ARGOUT_ARRAY1, int DIM1) {(double* out_times, int num_of_times)}
+ %apply (unsigned char* ARGOUT_ARRAY1, int DIM1) {(unsigned char* out_binary, int binary_length)}
+ %apply (unsigned char* IN_ARRAY1, int DIM1) {(unsigned char* in_binary, int binary_length)}
 
   /* Parse the header file to generate wrappers */
 
@@ -181,13 +245,69 @@ void _free_array_int(int* array) {
 
  %rename ("_%s", regexmatch$name="^Isc") "";
 
+ /*
+  * Release the GIL during long-running native calls, so that other Python threads can run, e.g. score other detectors.
+  * The wrapped calls must not use any Python objects, and a detector or data object must still not be changed by one
+  * thread while used by another.
+  */
+ %define RELEASE_GIL(function)
+ %exception function {
+   Py_BEGIN_ALLOW_THREADS
+   $action
+   Py_END_ALLOW_THREADS
+ }
+ %enddef
+
+ RELEASE_GIL(pyisc::_AnomalyDetector::_TrainData)
+ RELEASE_GIL(pyisc::_AnomalyDetector::_TrainDataIncrementally)
+ RELEASE_GIL(pyisc::_AnomalyDetector::_UntrainDataIncrementally)
+ RELEASE_GIL(pyisc::_AnomalyDetector::_TrainWindow)
+ RELEASE_GIL(pyisc::_AnomalyDetector::_CalcAnomaly)
+ RELEASE_GIL(pyisc::_AnomalyDetector::_CalcAnomalyInParallel)
+ RELEASE_GIL(pyisc::_AnomalyDetector::_CalcAnomalyDetailsOfData)
+ RELEASE_GIL(pyisc::_AnomalyDetector::_ClassifyData)
+ RELEASE_GIL(pyisc::_AnomalyDetector::_LogProbabilityOfData)
+ RELEASE_GIL(pyisc::_AnomalyDetector::_LogProbabilityOfDataPerClass)
+ RELEASE_GIL(pyisc::_AnomalyDetector::_Merge)
+ RELEASE_GIL(pyisc::_AnomalyDetector::exportModel)
+ RELEASE_GIL(pyisc::_AnomalyDetector::importModel)
+ RELEASE_GIL(pyisc::_DataObject::_DataObject)
+ RELEASE_GIL(pyisc::_DataObject::add2DArray)
+ RELEASE_GIL(pyisc::_DataObject::_as1DArray)
+ RELEASE_GIL(pyisc::_DataObject::_writeBinaryFile)
+ RELEASE_GIL(pyisc::_JSonExporter::getJSonString)
+ RELEASE_GIL(pyisc::_JSonImporter::parseJSon)
+ RELEASE_GIL(pyisc::_BinaryExporter::getBinaryLength)
+ RELEASE_GIL(pyisc::_BinaryImporter::parseBinary)
+
+ /* The caller owns the copy */
+ %newobject pyisc::_AnomalyDetector::_Clone;
+
  %include "isc2/isc_exportimport.hh"
  %include "src/_Format.hh"
  %include "src/_DataObject.hh"
+ %include "src/_RowWindow.hh"
  %include "src/_AnomalyDetector.hh"
+
+ /* Only the bank is wrapped, not the detectors of its entities, and it keeps the GIL since it must not be used by
+    several threads concurrently */
+ %ignore pyisc::_EntityDetector;
+ %include "src/_DetectorBank.hh"
+ %include "src/_Scorer.hh"
  %include "src/_JSonExporter.hh"
  %include "src/_JSonImporter.hh"
 
+ /* Only the exporter and importer of the binary format are wrapped, not the model tree */
+ %ignore pyisc::_BinaryParameter;
+ %ignore pyisc::_BinaryModelNode;
+ %ignore pyisc::_writeBinaryModel;
+ %ignore pyisc::_copyLittleEndian;
+ %ignore pyisc::_mergeModelNodes;
+ %ignore pyisc::_BinaryExporter::getModel;
+ %ignore pyisc::_BinaryImporter::_BinaryImporter(_BinaryModelNode*);
+ %include "src/_BinaryExporter.hh"
+ %include "src/_BinaryImporter.hh"
+
  %include "isc2/isc_component.hh"
  %include "isc2/isc_micromodel.hh"
  %include "isc2/isc_micromodel_multigaussian.hh"
@@ -201,6 +321,7 @@ void _free_array_int(int* array) {
 
 
  %pythoncode %{
+from _pyisc_modules.Instrumentation import *
 from _pyisc_modules.BaseISC import *
 from _pyisc_modules.AnomalyDetector import *
 from _pyisc_modules.DataObject import *
@@ -208,6 +329,10 @@ from _pyisc_modules.SklearnClassifier import *
 from _pyisc_modules.SklearnOutlierDetector import *
 from _pyisc_modules.AnomalyClustering import *
 from _pyisc_modules.OutlierClustering import *
+from _pyisc_modules.SlidingWindowDetector import *
+from _pyisc_modules.DetectorBank import *
+from _pyisc_modules.QuantileSketch import *
+from _pyisc_modules.BuildConfiguration import *
 from numpy import array, dtype, double
 
 
@@ -67,6 +67,11 @@ py_modules = [
                   "SklearnClassifier",
                   "AnomalyClustering",
                   "OutlierClustering",
+                  "SlidingWindowDetector",
+                  "DetectorBank",
+                  "Instrumentation",
+                  "QuantileSketch",
+                  "BuildConfiguration",
                   ]
                  ]\
              +["pyisc"]
@@ -108,6 +113,62 @@ else: # Default, works for Linux
 
 #extra_flags += ['-std=c++11']
 
+extra_link_args = []
+
+# The anomaly detectors score rows in parallel with std::thread (anomaly_score with n_jobs > 1), which requires POSIX
+# threads to be enabled when compiling and linking on all platforms but Windows, also in the default build
+if sys.platform != "win32":
+    extra_flags += ["-pthread"]
+    extra_link_args += ["-pthread"]
+
+######## optional optimized build profile ##########
+# The default portable build only uses the compiler flags above. PYISC_BUILD_PROFILE=optimized compiles and links with
+# -O3 and link-time optimization. PYISC_MARCH=<arch> also tunes the code for an architecture, e.g. native, which makes
+# the extension unusable on older processors. PYISC_PGO=generate builds an extension that writes execution profiles
+# to PYISC_PGO_DIR when it is used and PYISC_PGO=use builds it with the written profiles, see benchmarks/build_pgo.py.
+# The build configuration is reported at runtime by pyisc.build_configuration().
+
+build_profile = os.environ.get("PYISC_BUILD_PROFILE", "portable")
+build_march = os.environ.get("PYISC_MARCH")
+build_pgo = os.environ.get("PYISC_PGO")
+build_pgo_dir = os.path.abspath(os.environ.get("PYISC_PGO_DIR", os.path.join("build", "pgo")))
+
+define_macros = []
+
+if build_profile not in ["portable", "optimized"]:
+    raise ValueError("Unknown PYISC_BUILD_PROFILE %s, must be portable or optimized" % build_profile)
+if build_pgo not in [None, "generate", "use"]:
+    raise ValueError("Unknown PYISC_PGO %s, must be generate or use" % build_pgo)
+if build_profile == "portable" and (build_march is not None or build_pgo is not None):
+    raise ValueError("PYISC_MARCH and PYISC_PGO require PYISC_BUILD_PROFILE=optimized")
+
+if build_profile == "optimized":
+    define_macros += [("PYISC_BUILD_PROFILE", "optimized"), ("PYISC_BUILD_LTO", "1")]
+    if sys.platform == "win32":
+        extra_flags += ["/O2", "/GL"]
+        extra_link_args += ["/LTCG"]
+        if build_march is not None:
+            extra_flags += ["/arch:%s" % build_march]
+        if build_pgo is not None:
+            raise ValueError("PYISC_PGO is only supported with GCC and Clang")
+    else:
+        extra_flags += ["-O3", "-flto"]
+        extra_link_args += ["-O3", "-flto"]
+        if build_march is not None:
+            extra_flags += ["-march=%s" % build_march]
+            extra_link_args += ["-march=%s" % build_march]
+            define_macros += [("PYISC_BUILD_MARCH", build_march)]
+        if build_pgo == "generate":
+            extra_flags += ["-fprofile-generate=%s" % build_pgo_dir]
+            extra_link_args += ["-fprofile-generate=%s" % build_pgo_dir]
+            define_macros += [("PYISC_BUILD_PGO", "generate")]
+        elif build_pgo == "use":
+            if not os.path.isdir(build_pgo_dir):
+                raise ValueError("No profiles in %s, build with PYISC_PGO=generate and run the workload first" % build_pgo_dir)
+            extra_flags += ["-fprofile-use=%s" % build_pgo_dir, "-fprofile-correction"]
+            extra_link_args += ["-fprofile-use=%s" % build_pgo_dir, "-fprofile-correction"]
+            define_macros += [("PYISC_BUILD_PGO", "use")]
+
 dataframe_sources = [os.path.join(dataframe_src_dir, src)
                      for src in "readtokens.o table.o format.o formatdispatch.o formatbinary.o " \
                                 "formatdiscr.o formatcont.o formatsymbol.o formattime.o formatunknown.o " \
@@ -120,7 +181,7 @@ isc_sources = [os.path.join(isc_src_dir, src)
                           "hmatrix.o gamma.o hgf.o"
                    .replace(".o", ".cc").split()]
 
-pyisc_sources = [os.path.join(pyisc_src_dir, src) for src in ["_Format.cc", "_DataObject.cc", "_AnomalyDetector.cc", "_JSonExporter.cc", "_JSonImporter.cc", "mystring.cc"]]
+pyisc_sources = [os.path.join(pyisc_src_dir, src) for src in ["_Format.cc", "_DataObject.cc", "_BufferDataObject.cc", "_RowWindow.cc", "_AnomalyDetector.cc", "_DetectorBank.cc", "_Scorer.cc", "_JSonExporter.cc", "_JSonImporter.cc", "_BinaryExporter.cc", "_BinaryImporter.cc", "mystring.cc"]]
 pyisc_headers = [s.replace(".cc", ".hh") for s in pyisc_sources]
 
 # Only run when creating the distribution, not when installing it on someone else computer. Removes dependency on Swig
@@ -136,6 +197,8 @@ if os.path.exists('pyisc.i'):
                         sources=["pyisc.i"]+dataframe_sources+isc_sources+pyisc_sources,
                         include_dirs=[disc_dir, isc_src_dir, dataframe_src_dir, pyisc_src_dir, arduinojson_dir]+numpyincdir,
                         extra_compile_args=extra_flags,
+                        extra_link_args=extra_link_args,
+                        define_macros=define_macros,
                         swig_opts=['-c++','-I'+str(disc_dir)])
           ],
           license="LGPLv3",
@@ -156,6 +219,8 @@ setup(name="pyisc",
                         sources=["pyisc.i"]+dataframe_sources+isc_sources+pyisc_sources,
                         include_dirs=[disc_dir, isc_src_dir,dataframe_src_dir,pyisc_src_dir, arduinojson_dir]+numpyincdir,
                         extra_compile_args=extra_flags,
+                        extra_link_args=extra_link_args,
+                        define_macros=define_macros,
                         swig_opts=['-c++', '-I'+str(disc_dir)])
           ],
           py_modules=py_modules,
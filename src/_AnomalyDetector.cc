@@ -20,7 +20,11 @@
  */
 
 #include "_AnomalyDetector.hh"
+#include "_BufferDataObject.hh"
+#include "_BinaryExporter.hh"
+#include "_BinaryImporter.hh"
 #include <math.h>
+#include <thread>
 #ifdef WIN32
 #define _USE_MATH_DEFINES
 #include <cmath>
@@ -49,15 +53,21 @@ _AnomalyDetector::_AnomalyDetector(
 		int cl, ::IscCombinationRule cr,
 		std::vector<IscMicroModel*> component_distribution_creators) :
 				::AnomalyDetector(component_distribution_creators.size(),off,splt,th,cl,cr, inner_create_micro_model) {
+	params_offset = off;
+	params_split = splt;
+	params_threshold = th;
+	params_clustering = cl;
+	params_combination_rule = cr;
 
 	for(int i=0; i <  component_distribution_creators.size(); i++) {
 		this->component_distribution_creators.push_back(component_distribution_creators[i]->create());
 	}
+	score_memo_max_entries = 0;
+	score_memo_hits = 0;
 	if(DEBUG)
 		printf("_AnomalyDetector created\n");
 }
 
-
 void _AnomalyDetector::importModel(IscAbstractModelImporter *importer) {
     if(DEBUG)
         printf("_AnomalyDetector calling importer\n");
@@ -68,6 +78,7 @@ void _AnomalyDetector::importModel(IscAbstractModelImporter *importer) {
         printf("_AnomalyDetector importer cannot reach this far \n");
 
 	::AnomalyDetector::importModel(innerImporter);
+	modelChanged();
 
     delete innerImporter;
 
@@ -90,6 +101,8 @@ _AnomalyDetector::~_AnomalyDetector() {
 	if(DEBUG)
 		printf("_AnomalyDetector deletion started\n");
 
+	deleteIdleReplicas();
+
 	for(int i=0; i <  this->component_distribution_creators.size(); i++) {
 		delete this->component_distribution_creators[i];
 	}
@@ -100,11 +113,64 @@ _AnomalyDetector::~_AnomalyDetector() {
 
 
 void _AnomalyDetector::_SetParams(int off, int splt, double th, int cl) {
+	params_offset = off;
+	params_split = splt;
+	params_threshold = th;
+	params_clustering = cl;
 	::AnomalyDetector::SetParams(off,splt,th,cl);
+	modelChanged();
 }
 
 void _AnomalyDetector::_Reset() {
 	::AnomalyDetector::Reset();
+	modelChanged();
+}
+
+void _AnomalyDetector::modelChanged() {
+	deleteIdleReplicas();
+	std::lock_guard<std::mutex> lock(score_memo_mutex);
+	score_memo.clear();
+}
+
+void _AnomalyDetector::deleteIdleReplicas() {
+	std::lock_guard<std::mutex> lock(replicas_mutex);
+	for(int r=0; r < idle_replicas.size(); r++) {
+		delete idle_replicas[r];
+	}
+	idle_replicas.clear();
+}
+
+_AnomalyDetector* _AnomalyDetector::acquireScorer() {
+	if(scoring_mutex.try_lock()) {
+		return this;
+	}
+	_AnomalyDetector* replica = acquireReplica();
+	if(replica) {
+		return replica;
+	}
+	scoring_mutex.lock();
+	return this;
+}
+
+_AnomalyDetector* _AnomalyDetector::acquireReplica() {
+	{
+		std::lock_guard<std::mutex> lock(replicas_mutex);
+		if(!idle_replicas.empty()) {
+			_AnomalyDetector* replica = idle_replicas.back();
+			idle_replicas.pop_back();
+			return replica;
+		}
+	}
+	return _CreateReplica();
+}
+
+void _AnomalyDetector::releaseScorer(_AnomalyDetector* scorer) {
+	if(scorer == this) {
+		scoring_mutex.unlock();
+		return;
+	}
+	std::lock_guard<std::mutex> lock(replicas_mutex);
+	idle_replicas.push_back(scorer);
 }
 
 void _AnomalyDetector::_TrainOne(Format* format, double* in_array1D, int num_of_columns) {
@@ -118,6 +184,7 @@ void _AnomalyDetector::_TrainOne(Format* format, double* in_array1D, int num_of_
 		}
 	}
 	::AnomalyDetector::TrainOne(vec);
+	modelChanged();
 
 	delete [] vec;
 }
@@ -133,6 +200,7 @@ void _AnomalyDetector::_UntrainOne(Format* format, double* in_array1D, int num_o
 		}
 	}
 	::AnomalyDetector::UntrainOne(vec);
+	modelChanged();
 
 	delete [] vec;
 }
@@ -141,25 +209,233 @@ void _AnomalyDetector::_TrainDataIncrementally(pyisc::_DataObject* d) {
 	for(int i=0; i < d->size(); i++) {
 		::AnomalyDetector::TrainOne((*d->get_isc_data_object())[i]);
 	}
-
+	modelChanged();
 }
 
 void _AnomalyDetector::_UntrainDataIncrementally(pyisc::_DataObject* d) {
 	for(int i=0; i < d->size(); i++) {
 		::AnomalyDetector::UntrainOne((*d->get_isc_data_object())[i]);
 	}
+	modelChanged();
+}
 
+int _AnomalyDetector::_TrainWindow(_RowWindow* window, _DataObject* d, double* in_timestamps, int num_of_timestamps, double max_age) {
+	if(num_of_timestamps != d->size() || window->length() != d->length()) {
+		printf("Wrong number of time stamps or columns");
+		return 0;
+	}
+	for(int i=0; i < num_of_timestamps; i++) {
+		double previous = i > 0 ? in_timestamps[i-1] : window->size() > 0 ? window->newestTime() : in_timestamps[0];
+		if(in_timestamps[i] < previous) {
+			printf("The time stamps must be non-decreasing\n");
+			return 0;
+		}
+	}
+	for(int i=0; i < d->size(); i++) {
+		expireWindow(window, in_timestamps[i], max_age);
+		if(window->size() == window->capacity()) {
+			::AnomalyDetector::UntrainOne(window->oldest());
+			window->removeOldest();
+		}
+		::AnomalyDetector::TrainOne(window->add((*d->get_isc_data_object())[i], in_timestamps[i]));
+	}
+	if(d->size() > 0) {
+		modelChanged();
+	}
+	return 1;
+}
+
+int _AnomalyDetector::_ExpireWindow(_RowWindow* window, double time, double max_age) {
+	int num_of_expired = expireWindow(window, time, max_age);
+	if(num_of_expired > 0) {
+		modelChanged();
+	}
+	return num_of_expired;
+}
+
+int _AnomalyDetector::expireWindow(_RowWindow* window, double time, double max_age) {
+	int num_of_expired = 0;
+	if(max_age <= 0) {
+		return num_of_expired;
+	}
+	while(window->size() > 0 && window->oldestTime() <= time - max_age) {
+		::AnomalyDetector::UntrainOne(window->oldest());
+		window->removeOldest();
+		num_of_expired++;
+	}
+	return num_of_expired;
 }
 
 void _AnomalyDetector::_TrainData(_DataObject* d) {
 	::AnomalyDetector::TrainData(d->get_isc_data_object());
+	modelChanged();
 }
 
 void _AnomalyDetector::_CalcAnomaly(class _DataObject* d,  double* deviations, int deviantions_length) {
 	if(	deviantions_length != d->size()) {
 		printf("Wrong deviations lengths");
 	}
-	::AnomalyDetector::CalcAnomaly(d->get_isc_data_object(), deviations);
+	_AnomalyDetector* scorer = acquireScorer();
+	if(score_memo_max_entries <= 0) {
+		scorer->::AnomalyDetector::CalcAnomaly(d->get_isc_data_object(), deviations);
+		releaseScorer(scorer);
+		return;
+	}
+
+	// The rows are looked up by the bytes of all their values, which determine the score given the model. The table is
+	// only locked while looking up and inserting, not while the micro models score a row.
+	::DataObject* data = d->get_isc_data_object();
+	int row_bytes = d->length()*sizeof(intfloat);
+	std::vector<double> devs(_NumOfComponents() > 0 ? _NumOfComponents() : 1);
+	for(int i=0; i < data->size(); i++) {
+		intfloat* vec = (*data)[i];
+		std::string key((const char*) vec, row_bytes);
+		{
+			std::lock_guard<std::mutex> lock(score_memo_mutex);
+			std::unordered_map<std::string, double>::iterator entry = score_memo.find(key);
+			if(entry != score_memo.end()) {
+				deviations[i] = entry->second;
+				score_memo_hits++;
+				continue;
+			}
+		}
+		double anomaly;
+		int class_id, cluster_id;
+		scorer->::AnomalyDetector::CalcAnomalyDetails(vec, anomaly, class_id, cluster_id, &devs[0]);
+		{
+			std::lock_guard<std::mutex> lock(score_memo_mutex);
+			if((int) score_memo.size() >= score_memo_max_entries) {
+				score_memo.clear();
+			}
+			score_memo[key] = anomaly;
+		}
+		deviations[i] = anomaly;
+	}
+	releaseScorer(scorer);
+}
+
+void _AnomalyDetector::_SetScoreMemoSize(int max_entries) {
+	std::lock_guard<std::mutex> lock(score_memo_mutex);
+	score_memo_max_entries = max_entries > 0 ? max_entries : 0;
+	score_memo.clear();
+	score_memo_hits = 0;
+}
+
+long _AnomalyDetector::_ScoreMemoHits() {
+	std::lock_guard<std::mutex> lock(score_memo_mutex);
+	return score_memo_hits;
+}
+
+_AnomalyDetector* _AnomalyDetector::_CreateReplica() {
+	_BinaryExporter exporter;
+	exportModel(&exporter);
+	if(!exporter.isImplemented()) {
+		if(DEBUG)
+			printf("_AnomalyDetector cannot be replicated\n");
+		return 0;
+	}
+
+	_AnomalyDetector* replica = new _AnomalyDetector(params_offset, params_split, params_threshold,
+			params_clustering, params_combination_rule, component_distribution_creators);
+	_BinaryImporter importer(exporter.getModel());
+	replica->importModel(&importer);
+	replica->_SetParams(params_offset, params_split, params_threshold, params_clustering);
+	replica->score_memo_max_entries = score_memo_max_entries;
+
+	return replica;
+}
+
+_AnomalyDetector* _AnomalyDetector::_Clone() {
+	return _CreateReplica();
+}
+
+int _AnomalyDetector::_Merge(_AnomalyDetector* other) {
+	_BinaryExporter exporter;
+	exportModel(&exporter);
+	_BinaryExporter other_exporter;
+	other->exportModel(&other_exporter);
+
+	// An untrained model tells which parameters are model constants rather than training statistics
+	_AnomalyDetector untrained(params_offset, params_split, params_threshold,
+			params_clustering, params_combination_rule, component_distribution_creators);
+	_BinaryExporter untrained_exporter;
+	untrained.exportModel(&untrained_exporter);
+
+	bool implemented = exporter.isImplemented() && other_exporter.isImplemented() && untrained_exporter.isImplemented();
+
+	// The untrained micro models of each type are used for the models that are created while training, e.g. per class
+	std::vector<_BinaryModelNode> templates(component_distribution_creators.size());
+	for(int i=0; i < component_distribution_creators.size(); i++) {
+		_BinaryExporter template_exporter;
+		component_distribution_creators[i]->exportModel(&template_exporter);
+		implemented = implemented && template_exporter.isImplemented();
+		templates[i] = *template_exporter.getModel();
+	}
+
+	if(!implemented) {
+		printf("_AnomalyDetector cannot be merged since some parts of the model cannot be exported\n");
+		return 0;
+	}
+
+	_BinaryModelNode merged;
+	if(!_mergeModelNodes(*exporter.getModel(), *other_exporter.getModel(), untrained_exporter.getModel(), templates, merged)) {
+		return 0;
+	}
+
+	::AnomalyDetector::Reset();
+	_BinaryImporter importer(&merged);
+	importModel(&importer);
+	_SetParams(params_offset, params_split, params_threshold, params_clustering);
+
+	return 1;
+}
+
+void _AnomalyDetector::_CalcAnomalyInParallel(class _DataObject* d, int num_of_threads, double* deviations, int deviations_length) {
+	if(	deviations_length != d->size()) {
+		printf("Wrong deviations lengths");
+	}
+	::DataObject* data = d->get_isc_data_object();
+	int num_of_rows = data->size();
+	if(num_of_threads > num_of_rows) {
+		num_of_threads = num_of_rows;
+	}
+
+	// The micro models use internal buffers when scoring, so each thread gets its own detector, and fewer threads are
+	// used if the model cannot be replicated
+	std::vector<_AnomalyDetector*> scorers(1, acquireScorer());
+	while((int) scorers.size() < num_of_threads) {
+		_AnomalyDetector* replica = acquireReplica();
+		if(!replica) {
+			break;
+		}
+		scorers.push_back(replica);
+	}
+	num_of_threads = scorers.size();
+	if(num_of_threads <= 1) {
+		scorers[0]->::AnomalyDetector::CalcAnomaly(data, deviations);
+		releaseScorer(scorers[0]);
+		return;
+	}
+
+	std::vector<_DataObjectSlice*> slices;
+	std::vector<std::thread> threads;
+	for(int t=0; t < num_of_threads; t++) {
+		int start_row = (int) (((long) num_of_rows)*t/num_of_threads);
+		int end_row = (int) (((long) num_of_rows)*(t+1)/num_of_threads);
+		_DataObjectSlice* slice = new _DataObjectSlice(data, start_row, end_row);
+		slices.push_back(slice);
+		::AnomalyDetector* scorer = scorers[t];
+		double* slice_deviations = deviations+start_row;
+		threads.push_back(std::thread([scorer, slice, slice_deviations]() {
+			scorer->CalcAnomaly(slice, slice_deviations);
+		}));
+	}
+
+	for(int t=0; t < num_of_threads; t++) {
+		threads[t].join();
+		delete slices[t];
+		releaseScorer(scorers[t]);
+	}
 }
 
 void _AnomalyDetector::_ClassifyData(class _DataObject* d, int* class_ids, int class_ids_length,
@@ -168,14 +444,65 @@ void _AnomalyDetector::_ClassifyData(class _DataObject* d, int* class_ids, int c
 		printf("Wrong number of classes or clusters");
 	}
 
-	::AnomalyDetector::ClassifyData(d->get_isc_data_object(), class_ids, cluster_ids);
+	_AnomalyDetector* scorer = acquireScorer();
+	scorer->::AnomalyDetector::ClassifyData(d->get_isc_data_object(), class_ids, cluster_ids);
+	releaseScorer(scorer);
 
 }
 
 int _AnomalyDetector::_CalcAnomalyDetails(union intfloat* vec,
 		double* anom, int* cla, int* clu, double* devs, union intfloat* peak,
 		union intfloat* min, union intfloat* max, double* expect, double* var) {
-	return ::AnomalyDetector::CalcAnomalyDetails(vec, *anom, *cla, *clu, devs, peak, min, max, expect, var);
+	_AnomalyDetector* scorer = acquireScorer();
+	int result = scorer->::AnomalyDetector::CalcAnomalyDetails(vec, *anom, *cla, *clu, devs, peak, min, max, expect, var);
+	releaseScorer(scorer);
+	return result;
+}
+
+int _AnomalyDetector::_CalcAnomalyDetailsOfData(class _DataObject* d,
+		double* out_anomalies, int num_of_anomalies,
+		int* out_classes, int num_of_classes,
+		int* out_clusters, int num_of_clusters,
+		double* out_deviations, int deviations_rows, int deviations_columns,
+		double* out_peak, int peak_rows, int peak_columns,
+		double* out_min, int min_rows, int min_columns,
+		double* out_max, int max_rows, int max_columns) {
+	int num_of_rows = d->size();
+	int num_of_columns = d->length();
+	if(num_of_anomalies != num_of_rows || num_of_classes != num_of_rows || num_of_clusters != num_of_rows ||
+			deviations_rows != num_of_rows || peak_rows != num_of_rows || min_rows != num_of_rows || max_rows != num_of_rows) {
+		printf("Wrong number of rows in detail arrays\n");
+		return 0;
+	}
+	if(deviations_columns != ::AnomalyDetector::len ||
+			peak_columns != num_of_columns || min_columns != num_of_columns || max_columns != num_of_columns) {
+		printf("Wrong number of columns in detail arrays\n");
+		return 0;
+	}
+
+	::DataObject* data = d->get_isc_data_object();
+	_AnomalyDetector* scorer = acquireScorer();
+	intfloat* peak = new intfloat[num_of_columns];
+	intfloat* min = new intfloat[num_of_columns];
+	intfloat* max = new intfloat[num_of_columns];
+
+	for(int i=0; i < num_of_rows; i++) {
+		for(int j=0; j < num_of_columns; j++) {
+			peak[j].i = min[j].i = max[j].i = 0;
+		}
+		scorer->::AnomalyDetector::CalcAnomalyDetails((*data)[i], out_anomalies[i], out_classes[i], out_clusters[i],
+				out_deviations+i*deviations_columns, peak, min, max);
+		d->_convert_to_numpyarray(peak, out_peak+i*num_of_columns, num_of_columns);
+		d->_convert_to_numpyarray(min, out_min+i*num_of_columns, num_of_columns);
+		d->_convert_to_numpyarray(max, out_max+i*num_of_columns, num_of_columns);
+	}
+
+	releaseScorer(scorer);
+
+	delete [] peak;
+	delete [] min;
+	delete [] max;
+	return 1;
 }
 
 void _AnomalyDetector::_LogProbabilityOfData(class _DataObject* data, double* logp, int size) {
@@ -184,15 +511,36 @@ void _AnomalyDetector::_LogProbabilityOfData(class _DataObject* data, double* lo
 	intfloat* vec;
 	int n = d->size();
 	double min_logp=HUGE_VALF;
+	_AnomalyDetector* scorer = acquireScorer();
 	for (i=0; i<n; i++) {
 		vec = (*d)[i];
 		if (split_attr != -1)
 			id = vec[split_attr].i;
-		logp[i] = isc->logp(vec+offset, id);
+		logp[i] = scorer->isc->logp(vec+offset, id);
 		if(logp[i] < min_logp) {
 			min_logp = logp[i];
 		}
 	}
+	releaseScorer(scorer);
+}
+
+int _AnomalyDetector::_LogProbabilityOfDataPerClass(class _DataObject* data, double* out_logp, int logp_rows, int logp_columns) {
+	::DataObject *d = data->get_isc_data_object();
+	int n = d->size();
+	if(logp_rows != n || logp_columns < 1) {
+		printf("Wrong number of rows or classes in log probability array\n");
+		return 0;
+	}
+	intfloat* vec;
+	_AnomalyDetector* scorer = acquireScorer();
+	for (int i=0; i<n; i++) {
+		vec = (*d)[i];
+		for (int id=0; id < logp_columns; id++) {
+			out_logp[i*logp_columns+id] = scorer->isc->logp(vec+offset, id);
+		}
+	}
+	releaseScorer(scorer);
+	return 1;
 }
 
 /*
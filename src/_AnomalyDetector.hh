@@ -28,8 +28,12 @@
 #include <isc_micromodel.hh>
 #include <anomalydetector.hh>
 #include "_DataObject.hh"
+#include "_RowWindow.hh"
 #include <isc_micromodel_markovgaussian.hh>
 #include <vector>
+#include <string>
+#include <unordered_map>
+#include <mutex>
 #include "isc_exportimport.hh"
 
 
@@ -75,13 +79,80 @@ public:
 	virtual void _TrainDataIncrementally(_DataObject* d);
 	virtual void _UntrainDataIncrementally(_DataObject* d);
 
+	/**
+	 * Trains the rows in d incrementally and adds them to the window. Before a row is added, the rows in the window
+	 * that are older than max_age time units relative the row's time stamp (if max_age > 0) and the oldest row if the
+	 * window is full are removed from the window and untrained. Returns 0 without training any row if the number of
+	 * time stamps or columns is wrong, or if the time stamps decrease, also relative to the newest row in the window,
+	 * otherwise 1.
+	 */
+	virtual int _TrainWindow(_RowWindow* window, _DataObject* d, double* in_timestamps, int num_of_timestamps, double max_age);
+
+	/**
+	 * Untrains and removes the rows in the window that are older than max_age time units relative to time (if
+	 * max_age > 0). Returns the number of removed rows.
+	 */
+	virtual int _ExpireWindow(_RowWindow* window, double time, double max_age);
+
+	/**
+	 * Adds the training statistics of another anomaly detector with the same micro models, trained on other data,
+	 * to this anomaly detector. Returns 0 if the models could not be merged, in which case this model is unchanged.
+	 */
+	virtual int _Merge(_AnomalyDetector* other);
+
+	/**
+	 * Returns a new anomaly detector with the same parameters and an exact copy of the trained model, or 0 if some part
+	 * of the model cannot be exported. The copy is independent of this anomaly detector.
+	 */
+	virtual _AnomalyDetector* _Clone();
+
 	virtual void _CalcAnomaly(class _DataObject* d, double* deviations, int deviations_length);
+
+	/**
+	 * Makes _CalcAnomaly remember the anomaly scores of at most max_entries distinct rows, so that rows that are
+	 * repeated, like rows of small counts and periods, are scored by a table lookup instead of by the micro models.
+	 * There is a single table per detector, not per micro model, which is keyed by the bytes of all values of a row,
+	 * including the class column, and locked so that several threads can score concurrently. Hence, it only hits when
+	 * whole rows are repeated, which is rare if a row has a continuous column. It is only used by _CalcAnomaly, not by
+	 * the other scoring methods. The remembered scores are forgotten when the model is changed, and all of them are
+	 * forgotten when the table is full. A max_entries of 0 turns it off, which is the default.
+	 */
+	virtual void _SetScoreMemoSize(int max_entries);
+	virtual int _ScoreMemoSize() {return score_memo_max_entries;};
+	/**
+	 * Returns the number of rows scored by a lookup in the table since the last call to _SetScoreMemoSize.
+	 */
+	virtual long _ScoreMemoHits();
+
+	/**
+	 * Computes the same anomaly scores as _CalcAnomaly, but splits the rows of d into num_of_threads consecutive ranges
+	 * that are scored concurrently, each by its own exact copy of the model.
+	 *
+	 * The micro models use internal buffers when scoring, so all scoring methods use this detector only if no other
+	 * thread is scoring with it, and otherwise an idle replica of it. The replicas are kept until the model is changed.
+	 * Hence, several threads can score with the same detector concurrently, but not while it is trained.
+	 */
+	virtual void _CalcAnomalyInParallel(class _DataObject* d, int num_of_threads, double* deviations, int deviations_length);
 	virtual void _ClassifyData(class _DataObject* d, int* class_ids, int class_ids_length, int* cluster_ids, int cluster_ids_length);
 
 	virtual int _CalcAnomalyDetails(union intfloat* vec, double* anom, int* cla,
 			int* clu, double* devs = 0, union intfloat* peak = 0,
 			union intfloat* min = 0, union intfloat* max = 0,
 			double* expect = 0, double* var = 0);
+	/**
+	 * Computes the anomaly details of all rows in d in a single call. The output arrays must be preallocated with one
+	 * row per row in d. The deviations must have one column per mixture component and the peak, min and max arrays
+	 * must have one column per column in d. Returns 0 if the arrays have the wrong sizes, otherwise 1.
+	 */
+	virtual int _CalcAnomalyDetailsOfData(class _DataObject* d,
+			double* out_anomalies, int num_of_anomalies,
+			int* out_classes, int num_of_classes,
+			int* out_clusters, int num_of_clusters,
+			double* out_deviations, int deviations_rows, int deviations_columns,
+			double* out_peak, int peak_rows, int peak_columns,
+			double* out_min, int min_rows, int min_columns,
+			double* out_max, int max_rows, int max_columns);
+
 	/*virtual int CalcAnomalyDetailsSingle(union intfloat* vec, int mmind,
 			int cla, int clu, double* devs = 0, union intfloat* peak = 0,
 			union intfloat* min = 0, union intfloat* max = 0,
@@ -91,12 +162,70 @@ public:
 
 	virtual ::AnomalyDetector* get_isc_anomaly_detector() {return this;};
 
+	/**
+	 * Returns the number of mixture components.
+	 */
+	virtual int _NumOfComponents() {return component_distribution_creators.size();};
+
 	virtual void _CalcAnomalyDetailPerformanceTest(pyisc::_DataObject* obj);
 
 	virtual void _LogProbabilityOfData(class _DataObject* d, double* logp, int size);
 
+	/**
+	 * Computes the log probability of each row in d for each class id in a single pass over the rows, where
+	 * logp is a preallocated (number of rows, number of classes) array. Returns 0 if the array has the wrong number of
+	 * rows or no columns, otherwise 1.
+	 */
+	virtual int _LogProbabilityOfDataPerClass(class _DataObject* d, double* out_logp, int logp_rows, int logp_columns);
+
+protected:
+
+	/**
+	 * Creates a new anomaly detector with the same parameters and an exact copy of the trained model,
+	 * or returns 0 if some part of the model cannot be exported.
+	 */
+	virtual _AnomalyDetector* _CreateReplica();
+
+	friend class _DetectorBank;
+
 private:
+	/**
+	 * Must be called whenever the model is changed, so that the memoized scores and the idle replicas of the old model
+	 * are deleted.
+	 */
+	void modelChanged();
+
+	/**
+	 * Returns this detector if no other thread is scoring with it, otherwise an idle replica. If the model cannot be
+	 * replicated, it waits until this detector is free. The returned detector must be given back to releaseScorer.
+	 */
+	_AnomalyDetector* acquireScorer();
+
+	/**
+	 * Returns an idle replica or a new replica, or 0 if the model cannot be replicated.
+	 */
+	_AnomalyDetector* acquireReplica();
+	void releaseScorer(_AnomalyDetector* scorer);
+	void deleteIdleReplicas();
+
+	/**
+	 * Untrains and removes the expired rows of the window, as _ExpireWindow, without notifying that the model changed.
+	 */
+	int expireWindow(_RowWindow* window, double time, double max_age);
+
 	std::vector<IscMicroModel*> component_distribution_creators;
+	int score_memo_max_entries;
+	std::unordered_map<std::string, double> score_memo;
+	long score_memo_hits;
+	std::mutex score_memo_mutex;
+	std::mutex scoring_mutex; // Held by the thread that is scoring with this detector
+	std::mutex replicas_mutex;
+	std::vector<_AnomalyDetector*> idle_replicas;
+	int params_offset;
+	int params_split;
+	double params_threshold;
+	int params_clustering;
+	::IscCombinationRule params_combination_rule;
 };
 
 
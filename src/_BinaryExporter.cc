@@ -0,0 +1,289 @@
+/*
+ * _BinaryExporter.cc
+ *
+ *  Created on: Oct 18, 2026
+ */
+
+#include "_BinaryExporter.hh"
+#include <string.h>
+#include <math.h>
+
+
+namespace pyisc {
+
+double _BinaryParameter::get(int index) const {
+	switch(type) {
+	case 'i': {
+		int value;
+		memcpy(&value, &data[index*sizeof(int)], sizeof(int));
+		return value;
+	}
+	case 'f': {
+		float value;
+		memcpy(&value, &data[index*sizeof(float)], sizeof(float));
+		return value;
+	}
+	case 'd': {
+		double value;
+		memcpy(&value, &data[index*sizeof(double)], sizeof(double));
+		return value;
+	}
+	default:
+		printf("Parameter of type %c is not a number\n", type);
+		return 0;
+	}
+}
+
+int _BinaryParameter::elementSize() const {
+	switch(type) {
+	case 'i':
+		return sizeof(int);
+	case 'f':
+		return sizeof(float);
+	case 'd':
+		return sizeof(double);
+	default:
+		return 1;
+	}
+}
+
+static bool is_little_endian() {
+	unsigned int value = 1;
+	return *((unsigned char*) &value) == 1;
+}
+
+void _copyLittleEndian(void* out, const void* in, int element_size, int length) {
+	if(is_little_endian() || element_size == 1) {
+		memcpy(out, in, element_size*length);
+		return;
+	}
+	for(int i=0; i < length; i++) {
+		for(int b=0; b < element_size; b++) {
+			((char*) out)[i*element_size+b] = ((const char*) in)[i*element_size+element_size-1-b];
+		}
+	}
+}
+
+static void write_count(unsigned int value, std::string& out) {
+	char bytes[4];
+	_copyLittleEndian(bytes, &value, 4, 1);
+	out.append(bytes, 4);
+}
+
+static void write_name(const std::string& name, std::string& out) {
+	write_count(name.size(), out);
+	out.append(name);
+}
+
+static void write_node(const _BinaryModelNode& node, std::string& out) {
+	write_count(node.parameters.size(), out);
+	std::map<std::string, _BinaryParameter>::const_iterator p;
+	for(p = node.parameters.begin(); p != node.parameters.end(); p++) {
+		write_name(p->first, out);
+		out.push_back(p->second.type);
+		write_count(p->second.length, out);
+		if(p->second.length > 0) {
+			std::vector<char> data(p->second.data.size());
+			_copyLittleEndian(&data[0], &p->second.data[0], p->second.elementSize(), p->second.length);
+			out.append(&data[0], data.size());
+		}
+	}
+	write_count(node.models.size(), out);
+	std::map<std::string, _BinaryModelNode>::const_iterator m;
+	for(m = node.models.begin(); m != node.models.end(); m++) {
+		write_name(m->first, out);
+		write_node(m->second, out);
+	}
+}
+
+void _writeBinaryModel(const _BinaryModelNode& model, std::string& out) {
+	out.append(PYISC_BINARY_MAGIC, PYISC_BINARY_MAGIC_LENGTH);
+	write_count(PYISC_BINARY_FORMAT_VERSION, out);
+	write_node(model, out);
+}
+
+void _BinaryParameter::set(int index, double value) {
+	switch(type) {
+	case 'i': {
+		int v = (int) floor(value + 0.5);
+		memcpy(&data[index*sizeof(int)], &v, sizeof(int));
+		break;
+	}
+	case 'f': {
+		float v = (float) value;
+		memcpy(&data[index*sizeof(float)], &v, sizeof(float));
+		break;
+	}
+	case 'd':
+		memcpy(&data[index*sizeof(double)], &value, sizeof(double));
+		break;
+	default:
+		printf("Parameter of type %c is not a number\n", type);
+	}
+}
+
+/**
+ * Returns the untrained micro model in templates that has the same parameters as model and the same values of all
+ * integer parameters, that is, the same type of micro model for the same columns, or 0 if there is none.
+ */
+static const _BinaryModelNode* _matchingTemplate(const _BinaryModelNode& model, const std::vector<_BinaryModelNode>& templates) {
+	for(size_t t=0; t < templates.size(); t++) {
+		const _BinaryModelNode& candidate = templates[t];
+		if(candidate.parameters.size() != model.parameters.size() || candidate.models.size() != model.models.size()) {
+			continue;
+		}
+		bool matches = true;
+		std::map<std::string, _BinaryParameter>::const_iterator pc;
+		for(pc = candidate.parameters.begin(); matches && pc != candidate.parameters.end(); pc++) {
+			std::map<std::string, _BinaryParameter>::const_iterator pm = model.parameters.find(pc->first);
+			matches = pm != model.parameters.end() && pm->second.type == pc->second.type &&
+					pm->second.length == pc->second.length &&
+					(pc->second.type == 'f' || pc->second.type == 'd' || pm->second.data == pc->second.data);
+		}
+		if(matches) {
+			return &candidate;
+		}
+	}
+	return 0;
+}
+
+bool _mergeModelNodes(const _BinaryModelNode& a, const _BinaryModelNode& b, const _BinaryModelNode* base,
+		const std::vector<_BinaryModelNode>& templates, _BinaryModelNode& merged) {
+	merged = a;
+
+	if(!base) {
+		base = _matchingTemplate(a, templates);
+	}
+
+	std::map<std::string, _BinaryParameter>::const_iterator pb;
+	for(pb = b.parameters.begin(); pb != b.parameters.end(); pb++) {
+		std::map<std::string, _BinaryParameter>::iterator pm = merged.parameters.find(pb->first);
+		if(pm == merged.parameters.end()) {
+			merged.parameters[pb->first] = pb->second;
+			continue;
+		}
+		_BinaryParameter& parameter = pm->second;
+		if(parameter.type != pb->second.type || parameter.length != pb->second.length) {
+			printf("Parameter %s cannot be merged, the models have different types or sizes\n", pb->first.c_str());
+			return false;
+		}
+		if(parameter.type == 's') {
+			if(parameter.data != pb->second.data) {
+				printf("Parameter %s cannot be merged, the models have different values\n", pb->first.c_str());
+				return false;
+			}
+			continue;
+		}
+		if(parameter.type == 'i') {
+			// Identifiers, column indexes and sizes describe the model and are never added. An integer that differs
+			// between the models cannot be told apart from an integer count, so the merge is rejected.
+			if(parameter.data != pb->second.data) {
+				printf("Integer parameter %s cannot be merged, it differs between the models, which is only supported "
+						"for floating point statistics\n", pb->first.c_str());
+				return false;
+			}
+			continue;
+		}
+
+		const _BinaryParameter* base_parameter = 0;
+		if(base) {
+			std::map<std::string, _BinaryParameter>::const_iterator pbase = base->parameters.find(pb->first);
+			if(pbase != base->parameters.end() && pbase->second.type == parameter.type && pbase->second.length == parameter.length) {
+				base_parameter = &pbase->second;
+			}
+		}
+		for(int i=0; i < parameter.length; i++) {
+			parameter.set(i, parameter.get(i) + pb->second.get(i) - (base_parameter ? base_parameter->get(i) : 0.0));
+		}
+	}
+
+	std::map<std::string, _BinaryModelNode>::const_iterator mb;
+	for(mb = b.models.begin(); mb != b.models.end(); mb++) {
+		std::map<std::string, _BinaryModelNode>::const_iterator ma = a.models.find(mb->first);
+		if(ma == a.models.end()) {
+			merged.models[mb->first] = mb->second;
+			continue;
+		}
+		const _BinaryModelNode* base_model = 0;
+		if(base) {
+			std::map<std::string, _BinaryModelNode>::const_iterator mbase = base->models.find(mb->first);
+			if(mbase != base->models.end()) {
+				base_model = &mbase->second;
+			}
+		}
+		if(!_mergeModelNodes(ma->second, mb->second, base_model, templates, merged.models[mb->first])) {
+			return false;
+		}
+	}
+
+	return true;
+}
+
+void _BinaryExporter::notImplemented() {
+	*is_implemented = false;
+}
+
+void _BinaryExporter::addRawParameter(const char* parameter_name, char type, const void* values, int element_size, int length) {
+	_BinaryParameter& parameter = root->parameters[std::string(parameter_name)];
+	parameter.type = type;
+	parameter.length = length;
+	parameter.data.resize(element_size*length);
+	if(length > 0) {
+		memcpy(&parameter.data[0], values, element_size*length);
+	}
+}
+
+void _BinaryExporter::addParameter(const char* parameter_name, const char* value) {
+	addRawParameter(parameter_name, 's', value, 1, strlen(value));
+}
+
+void _BinaryExporter::addParameter(const char* parameter_name, int value) {
+	addRawParameter(parameter_name, 'i', &value, sizeof(int), 1);
+}
+
+void _BinaryExporter::addParameter(const char* parameter_name, float value) {
+	addRawParameter(parameter_name, 'f', &value, sizeof(float), 1);
+}
+
+void _BinaryExporter::addParameter(const char* parameter_name, double value) {
+	addRawParameter(parameter_name, 'd', &value, sizeof(double), 1);
+}
+
+void _BinaryExporter::addParameter(const char* parameter_name, int *values, int length) {
+	addRawParameter(parameter_name, 'i', values, sizeof(int), length);
+}
+
+void _BinaryExporter::addParameter(const char* parameter_name, float *values, int length) {
+	addRawParameter(parameter_name, 'f', values, sizeof(float), length);
+}
+
+void _BinaryExporter::addParameter(const char* parameter_name, double *values, int length) {
+	addRawParameter(parameter_name, 'd', values, sizeof(double), length);
+}
+
+int _BinaryExporter::getBinaryLength() {
+	binary.clear();
+	_writeBinaryModel(*root, binary);
+	return binary.size();
+}
+
+void _BinaryExporter::_getBinaryData(unsigned char* out_binary, int binary_length) {
+	if(binary.empty()) {
+		getBinaryLength();
+	}
+	if(binary_length != (int) binary.size()) {
+		printf("Wrong binary length %i, expected %i\n", binary_length, (int) binary.size());
+		return;
+	}
+	memcpy(out_binary, binary.data(), binary.size());
+}
+
+IscAbstractModelExporter* _BinaryExporter::createModelExporter(const char * parameter_name) {
+	return new _BinaryExporter(&root->models[std::string(parameter_name)], is_implemented);
+}
+
+IscAbstractModelExporter* _BinaryExporter::createModelExporter(int parameter_id) {
+	return new _BinaryExporter(&root->models[to_string(parameter_id)], is_implemented);
+}
+
+}
@@ -0,0 +1,132 @@
+/*
+ * _BinaryExporter.hh
+ *
+ *  Created on: Oct 18, 2026
+ */
+
+#ifndef BINARYEXPORTER_HH_
+#define BINARYEXPORTER_HH_
+
+#include "isc_exportimport.hh"
+#include <map>
+#include <string>
+#include <vector>
+#include "mystring.hh"
+
+#ifndef DEBUG
+#define DEBUG 0
+#endif
+
+namespace pyisc {
+
+/**
+ * A parameter value stored as raw bytes together with its element type and number of elements.
+ */
+struct _BinaryParameter {
+	char type; // 's' string, 'i' int, 'f' float, 'd' double
+	int length;
+	std::vector<char> data;
+
+	double get(int index) const;
+	void set(int index, double value);
+	int elementSize() const;
+};
+
+/**
+ * The exported parameters and sub models of a model, stored exactly as their in-memory representation.
+ */
+struct _BinaryModelNode {
+	std::map<std::string, _BinaryParameter> parameters;
+	std::map<std::string, _BinaryModelNode> models;
+};
+
+/*
+ * The binary format starts with a header with the magic string PYISCBIN and the format version as an unsigned 32 bit
+ * integer, followed by the root model. A model is stored as the number of parameters, each parameter as its name, type
+ * character, number of elements and elements, followed by the number of sub models, each as its name and model.
+ * Names are stored as their length followed by their characters. All numbers are stored in little-endian byte order,
+ * counts and lengths as unsigned 32 bit integers, and the parameter elements as 32 bit ints, 32 bit floats or 64 bit
+ * doubles.
+ */
+#define PYISC_BINARY_MAGIC "PYISCBIN"
+#define PYISC_BINARY_MAGIC_LENGTH 8
+#define PYISC_BINARY_FORMAT_VERSION 1
+
+/**
+ * Appends the binary format of the model, including the header, to out.
+ */
+void _writeBinaryModel(const _BinaryModelNode& model, std::string& out);
+
+/**
+ * Copies length elements of element_size bytes from in to out and converts them between the host and little-endian byte order.
+ */
+void _copyLittleEndian(void* out, const void* in, int element_size, int length);
+
+/**
+ * Merges the training statistics of two models a and b that were trained on different data into merged.
+ *
+ * The statistics of the micro models are floating point parameters and are combined as a + b - base, where base is
+ * the corresponding untrained model, so that the statistics are added while model constants are kept. Integer
+ * parameters such as identifiers, column indexes and sizes are never added, they must be the same in a and b, and
+ * the merge is rejected if they are not, since they cannot be told apart from integer counts. Models
+ * without a counterpart in base, such as the micro models of each class, use the untrained micro model among
+ * templates that has the same parameters and integer values as base, and if there is none, their statistics are
+ * simply added. Parameters and models that only exist in one of a and b are copied. Returns false if a and b have
+ * incompatible parameters.
+ */
+bool _mergeModelNodes(const _BinaryModelNode& a, const _BinaryModelNode& b, const _BinaryModelNode* base,
+		const std::vector<_BinaryModelNode>& templates, _BinaryModelNode& merged);
+
+class _BinaryExporter : public ::IscAbstractModelExporter {
+public:
+	_BinaryExporter():root(&model),is_implemented(&implemented),implemented(true){};
+	virtual ~_BinaryExporter(){};
+
+	virtual void notImplemented();
+
+	virtual void addParameter(const char* parameter_name, const char* value);
+	virtual void addParameter(const char* parameter_name, int value);
+	virtual void addParameter(const char* parameter_name, float value);
+	virtual void addParameter(const char* parameter_name, double value);
+	virtual void addParameter(const char* parameter_name, int *value, int length);
+	virtual void addParameter(const char* parameter_name, float *value, int length);
+	virtual void addParameter(const char* parameter_name, double *value, int length);
+
+	virtual IscAbstractModelExporter* createModelExporter(const char * parameter_name);
+	virtual IscAbstractModelExporter* createModelExporter(int parameter_id);
+
+	/**
+	 * Returns false if any of the exported models did not implement the export.
+	 */
+	virtual bool isImplemented() {return *is_implemented;};
+
+	virtual _BinaryModelNode* getModel() {return root;};
+
+	/**
+	 * Returns the number of bytes of the exported model in the binary format.
+	 */
+	virtual int getBinaryLength();
+
+	/**
+	 * Returns the exported model in the binary format as a numpy array of bytes.
+	 */
+	virtual void _getBinaryData(unsigned char* out_binary, int binary_length);
+
+protected:
+	_BinaryExporter(_BinaryModelNode* root, bool* is_implemented):root(root),is_implemented(is_implemented),implemented(true){
+	};
+
+	virtual void addRawParameter(const char* parameter_name, char type, const void* values, int element_size, int length);
+
+private:
+	_BinaryModelNode model;
+	_BinaryModelNode* root;
+	std::string binary;
+	bool* is_implemented;
+	bool implemented;
+};
+
+}
+
+
+#endif /* BINARYEXPORTER_HH_ */
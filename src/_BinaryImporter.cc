@@ -0,0 +1,163 @@
+/*
+ * _BinaryImporter.cc
+ *
+ *  Created on: Oct 18, 2026
+ */
+
+
+#include "_BinaryImporter.hh"
+#include <string.h>
+
+namespace pyisc {
+
+static bool read_count(const unsigned char*& in, const unsigned char* end, unsigned int& value) {
+	if(end - in < 4) {
+		return false;
+	}
+	_copyLittleEndian(&value, in, 4, 1);
+	in += 4;
+	return true;
+}
+
+static bool read_name(const unsigned char*& in, const unsigned char* end, std::string& name) {
+	unsigned int length;
+	if(!read_count(in, end, length) || (unsigned long) (end - in) < length) {
+		return false;
+	}
+	name.assign((const char*) in, length);
+	in += length;
+	return true;
+}
+
+static bool read_node(const unsigned char*& in, const unsigned char* end, _BinaryModelNode& node) {
+	unsigned int num_of_parameters, num_of_models;
+	if(!read_count(in, end, num_of_parameters)) {
+		return false;
+	}
+	for(unsigned int i=0; i < num_of_parameters; i++) {
+		std::string name;
+		unsigned int length;
+		if(!read_name(in, end, name) || end - in < 1) {
+			return false;
+		}
+		_BinaryParameter& parameter = node.parameters[name];
+		parameter.type = (char) *in++;
+		if(!read_count(in, end, length)) {
+			return false;
+		}
+		parameter.length = length;
+		unsigned long num_of_bytes = ((unsigned long) length)*parameter.elementSize();
+		if((unsigned long) (end - in) < num_of_bytes) {
+			return false;
+		}
+		parameter.data.resize(num_of_bytes);
+		if(length > 0) {
+			_copyLittleEndian(&parameter.data[0], in, parameter.elementSize(), length);
+		}
+		in += num_of_bytes;
+	}
+	if(!read_count(in, end, num_of_models)) {
+		return false;
+	}
+	for(unsigned int i=0; i < num_of_models; i++) {
+		std::string name;
+		if(!read_name(in, end, name) || !read_node(in, end, node.models[name])) {
+			return false;
+		}
+	}
+	return true;
+}
+
+bool _BinaryImporter::parseBinary(unsigned char* in_binary, int binary_length) {
+	const unsigned char* in = in_binary;
+	const unsigned char* end = in_binary + binary_length;
+	unsigned int version;
+
+	if(binary_length < PYISC_BINARY_MAGIC_LENGTH || memcmp(in, PYISC_BINARY_MAGIC, PYISC_BINARY_MAGIC_LENGTH) != 0) {
+		printf("Not a binary pyisc model\n");
+		return false;
+	}
+	in += PYISC_BINARY_MAGIC_LENGTH;
+	if(!read_count(in, end, version) || version > PYISC_BINARY_FORMAT_VERSION) {
+		printf("Unsupported binary model version\n");
+		return false;
+	}
+
+	model = _BinaryModelNode();
+	root = &model;
+	if(!read_node(in, end, model)) {
+		printf("Binary model is truncated\n");
+		return false;
+	}
+	return true;
+}
+
+void _BinaryImporter::notImplemented(){
+	printf("Binary importer not implemented\n");
+}
+
+const _BinaryParameter* _BinaryImporter::getParameter(const char* parameter_name, int length) {
+	std::map<std::string, _BinaryParameter>::const_iterator it = root->parameters.find(std::string(parameter_name));
+	if(it == root->parameters.end()) {
+		printf("Parameter %s is missing\n", parameter_name);
+		return 0;
+	}
+	if(it->second.length < length) {
+		printf("Parameter %s has %i elements, expected %i\n", parameter_name, it->second.length, length);
+		return 0;
+	}
+	return &it->second;
+}
+
+template<class T> void _BinaryImporter::fill(const char* parameter_name, char type, T* values, int length) {
+	if(DEBUG)
+		printf("Import %s as binary of type %c", parameter_name, type);
+
+	const _BinaryParameter* parameter = getParameter(parameter_name, length);
+	if(!parameter) {
+		return;
+	}
+	if(parameter->type == type) {
+		if(length > 0) {
+			memcpy(values, &parameter->data[0], sizeof(T)*length);
+		}
+	} else {
+		for(int i=0; i < length; i++) {
+			values[i] = (T) parameter->get(i);
+		}
+	}
+}
+
+void _BinaryImporter::fillParameter(const char* parameter_name, int& value){
+	fill(parameter_name, 'i', &value, 1);
+}
+void _BinaryImporter::fillParameter(const char* parameter_name, float& value){
+	fill(parameter_name, 'f', &value, 1);
+}
+void _BinaryImporter::fillParameter(const char* parameter_name, double& value){
+	fill(parameter_name, 'd', &value, 1);
+}
+void _BinaryImporter::fillParameter(const char* parameter_name, int *values, int length){
+	fill(parameter_name, 'i', values, length);
+}
+void _BinaryImporter::fillParameter(const char* parameter_name, float *values, int length){
+	fill(parameter_name, 'f', values, length);
+}
+void _BinaryImporter::fillParameter(const char* parameter_name, double *values, int length){
+	fill(parameter_name, 'd', values, length);
+}
+
+IscAbstractModelImporter* _BinaryImporter::getModelImporter(const char * parameter_name) {
+	if(DEBUG)
+		printf("Import %s as binary object", parameter_name);
+
+	return new _BinaryImporter(&root->models[std::string(parameter_name)]);
+}
+IscAbstractModelImporter* _BinaryImporter::getModelImporter(int parameter_id){
+	if(DEBUG)
+		printf("Import %i as binary object", parameter_id);
+
+	return new _BinaryImporter(&root->models[to_string(parameter_id)]);
+}
+
+}  // namespace pyisc
@@ -0,0 +1,61 @@
+/*
+ * _BinaryImporter.hh
+ *
+ *  Created on: Oct 18, 2026
+ */
+
+#ifndef SRC__BINARYIMPORTER_HH_
+#define SRC__BINARYIMPORTER_HH_
+
+#include "isc_exportimport.hh"
+#include "_BinaryExporter.hh"
+
+#ifndef DEBUG
+#define DEBUG 0
+#endif
+
+namespace pyisc {
+
+class _BinaryImporter : public IscAbstractModelImporter {
+public:
+	_BinaryImporter():root(&model){
+	};
+	_BinaryImporter(_BinaryModelNode* root):root(root){
+	};
+	virtual ~_BinaryImporter(){};
+	virtual void notImplemented();
+
+	// Methods that sets the values to the provided data structure
+	virtual void fillParameter(const char* parameter_name, int &value);
+	virtual void fillParameter(const char* parameter_name, float &value);
+	virtual void fillParameter(const char* parameter_name, double &value);
+
+	virtual void fillParameter(const char* parameter_name, int *value, int length);
+	virtual void fillParameter(const char* parameter_name, float *value, int length);
+	virtual void fillParameter(const char* parameter_name, double *value, int length);
+	virtual IscAbstractModelImporter* getModelImporter(const char * parameter_name);
+	virtual IscAbstractModelImporter* getModelImporter(int parameter_id);
+
+	// Return True if succeeds
+	virtual bool parseBinary(unsigned char* in_binary, int binary_length);
+
+protected:
+	/**
+	 * Returns the named parameter if it contains at least length elements, otherwise 0.
+	 */
+	virtual const _BinaryParameter* getParameter(const char* parameter_name, int length);
+
+	/**
+	 * Copies the raw bytes of the named parameter if it has the given type, otherwise converts it element by element.
+	 */
+	template<class T> void fill(const char* parameter_name, char type, T* values, int length);
+
+private:
+	_BinaryModelNode model;
+	_BinaryModelNode* root;
+};
+
+}  // namespace pyisc
+
+
+#endif /* SRC__BINARYIMPORTER_HH_ */
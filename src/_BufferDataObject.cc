@@ -0,0 +1,151 @@
+/*
+ --------------------------------------------------------------------------
+ Copyright (C) 2014, 2015, 2016 SICS Swedish ICT AB
+
+ Main author: Tomas Olsson <tol@sics.se>
+
+ This code is free software: you can redistribute it and/or modify it
+ under the terms of the GNU Lesser General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ This code is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Lesser General Public License for more details.
+
+ You should have received a copy of the GNU Lesser General Public License
+ along with this code.  If not, see <http://www.gnu.org/licenses/>.
+ --------------------------------------------------------------------------
+ */
+
+#include "_BufferDataObject.hh"
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+namespace pyisc {
+
+_BufferDataObject::_BufferDataObject(::Format* f, union intfloat* buffer0, int num_of_rows0, int num_of_columns0) :
+		::DataObject(f) {
+	buffer = buffer0;
+	num_of_rows = num_of_rows0;
+	num_of_columns = num_of_columns0;
+	capacity = num_of_rows0;
+
+	if(DEBUG)
+		printf("Create _BufferDataObject with %i rows\n", num_of_rows);
+}
+
+_BufferDataObject::~_BufferDataObject() {
+	if(DEBUG)
+		printf("Delete _BufferDataObject\n");
+}
+
+int _BufferDataObject::size() {
+	return num_of_rows;
+}
+
+union intfloat* _BufferDataObject::operator[](int i) {
+	return buffer + ((long) i)*num_of_columns;
+}
+
+void _BufferDataObject::setSize(int num_of_rows0) {
+	if(num_of_rows0 < 0 || num_of_rows0 > capacity) {
+		printf("Cannot use %i rows of a buffer with %i rows\n", num_of_rows0, capacity);
+		return;
+	}
+	num_of_rows = num_of_rows0;
+}
+
+_MappedDataObject::_MappedDataObject(::Format* f, void* mapping0, size_t mapping_length0, size_t data_offset,
+		int num_of_rows, int num_of_columns) :
+		_BufferDataObject(f, (union intfloat*) (((char*) mapping0) + data_offset), num_of_rows, num_of_columns) {
+	mapping = mapping0;
+	mapping_length = mapping_length0;
+}
+
+_MappedDataObject::~_MappedDataObject() {
+	unmapFile(mapping, mapping_length);
+}
+
+void* _MappedDataObject::mapFile(const char* filename, size_t* mapping_length) {
+#ifdef _WIN32
+	HANDLE file = CreateFileA(filename, GENERIC_READ, FILE_SHARE_READ, NULL, OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, NULL);
+	if(file == INVALID_HANDLE_VALUE) {
+		return 0;
+	}
+	LARGE_INTEGER file_size;
+	if(!GetFileSizeEx(file, &file_size) || file_size.QuadPart == 0) {
+		CloseHandle(file);
+		return 0;
+	}
+	HANDLE file_mapping = CreateFileMappingA(file, NULL, PAGE_READONLY, 0, 0, NULL);
+	CloseHandle(file);
+	if(file_mapping == NULL) {
+		return 0;
+	}
+	// The view keeps the mapping alive after its handle is closed
+	void* mapping = MapViewOfFile(file_mapping, FILE_MAP_READ, 0, 0, 0);
+	CloseHandle(file_mapping);
+	if(mapping == NULL) {
+		return 0;
+	}
+	*mapping_length = (size_t) file_size.QuadPart;
+	return mapping;
+#else
+	int fd = open(filename, O_RDONLY);
+	if(fd < 0) {
+		return 0;
+	}
+	struct stat file_stat;
+	if(fstat(fd, &file_stat) != 0 || file_stat.st_size == 0) {
+		close(fd);
+		return 0;
+	}
+	void* mapping = mmap(0, file_stat.st_size, PROT_READ, MAP_SHARED, fd, 0);
+	close(fd);
+	if(mapping == MAP_FAILED) {
+		return 0;
+	}
+	*mapping_length = (size_t) file_stat.st_size;
+	return mapping;
+#endif
+}
+
+void _MappedDataObject::unmapFile(void* mapping, size_t mapping_length) {
+	if(!mapping) {
+		return;
+	}
+#ifdef _WIN32
+	UnmapViewOfFile(mapping);
+#else
+	munmap(mapping, mapping_length);
+#endif
+}
+
+_DataObjectSlice::_DataObjectSlice(::DataObject* d, int start_row0, int end_row0) :
+		::DataObject(d->format()) {
+	data_object = d;
+	start_row = start_row0;
+	end_row = end_row0;
+}
+
+_DataObjectSlice::~_DataObjectSlice() {
+}
+
+int _DataObjectSlice::size() {
+	return end_row - start_row;
+}
+
+union intfloat* _DataObjectSlice::operator[](int i) {
+	return (*data_object)[start_row + i];
+}
+
+} /* namespace pyisc */
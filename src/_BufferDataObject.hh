@@ -0,0 +1,100 @@
+/*
+ --------------------------------------------------------------------------
+ Copyright (C) 2014, 2015, 2016 SICS Swedish ICT AB
+
+ Main author: Tomas Olsson <tol@sics.se>
+
+ This code is free software: you can redistribute it and/or modify it
+ under the terms of the GNU Lesser General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ This code is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Lesser General Public License for more details.
+
+ You should have received a copy of the GNU Lesser General Public License
+ along with this code.  If not, see <http://www.gnu.org/licenses/>.
+ --------------------------------------------------------------------------
+ */
+
+#ifndef BUFFERDATAOBJECT_HH_
+#define BUFFERDATAOBJECT_HH_
+
+#include <format.hh>
+#include <data.hh>
+#include <stddef.h>
+
+#ifndef DEBUG
+#define DEBUG 0
+#endif
+
+namespace pyisc {
+
+/**
+ * An isc data object that uses an externally owned buffer of intfloat values as its row storage.
+ *
+ * The buffer is not copied nor freed, so the owner must keep it alive as long as this object is used.
+ */
+class _BufferDataObject : public ::DataObject {
+public:
+	_BufferDataObject(::Format* f, union intfloat* buffer, int num_of_rows, int num_of_columns);
+	virtual ~_BufferDataObject();
+
+	virtual int size();
+	virtual union intfloat* operator[](int i);
+
+	/**
+	 * Sets the number of rows in use, which cannot be larger than the number of rows of the buffer.
+	 */
+	virtual void setSize(int num_of_rows);
+
+protected:
+	union intfloat* buffer;
+	int num_of_rows;
+	int num_of_columns;
+	int capacity;
+};
+
+/**
+ * A read-only isc data object whose rows are stored in a memory-mapped file, so that the pages can be shared by
+ * many processes. The mapping is released when the object is deleted.
+ */
+class _MappedDataObject : public _BufferDataObject {
+public:
+	_MappedDataObject(::Format* f, void* mapping, size_t mapping_length, size_t data_offset, int num_of_rows, int num_of_columns);
+	virtual ~_MappedDataObject();
+
+	/**
+	 * Maps the whole file read-only into memory. Returns 0 if the file cannot be mapped, otherwise the mapping
+	 * that must be released with unmapFile.
+	 */
+	static void* mapFile(const char* filename, size_t* mapping_length);
+	static void unmapFile(void* mapping, size_t mapping_length);
+
+protected:
+	void* mapping;
+	size_t mapping_length;
+};
+
+/**
+ * An isc data object that references a range of rows in another isc data object without copying them.
+ */
+class _DataObjectSlice : public ::DataObject {
+public:
+	_DataObjectSlice(::DataObject* d, int start_row, int end_row);
+	virtual ~_DataObjectSlice();
+
+	virtual int size();
+	virtual union intfloat* operator[](int i);
+
+protected:
+	::DataObject* data_object;
+	int start_row;
+	int end_row;
+};
+
+} /* namespace pyisc */
+
+#endif /* BUFFERDATAOBJECT_HH_ */
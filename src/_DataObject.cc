@@ -6,7 +6,24 @@
  */
 
 #include "_DataObject.hh"
+#include "_BufferDataObject.hh"
 #include <formattypes.hh>
+#include <stdint.h>
+#include <string.h>
+#include <string>
+
+/*
+ * A binary row file starts with a header with the magic string PYISCROW, the format version, a byte order marker,
+ * the number of columns and rows as unsigned 32 bit integers and the offset of the rows from the start of the file as
+ * an unsigned 64 bit integer, followed by the columns, each as its pyisc::Format::ColumnType, name and number of symbol
+ * names followed by the symbol names. Names are stored as their length followed by their characters. The rows start at
+ * the next multiple of 8 bytes and are stored as num_of_rows*num_of_columns intfloat values. All numbers are stored in
+ * the byte order of the machine that wrote the file, since the rows are used as they are when mapped.
+ */
+#define PYISC_ROW_FILE_MAGIC "PYISCROW"
+#define PYISC_ROW_FILE_MAGIC_LENGTH 8
+#define PYISC_ROW_FILE_VERSION 1
+#define PYISC_ROW_FILE_BYTE_ORDER 0x01020304
 
 
 namespace pyisc {
@@ -62,6 +79,10 @@ _DataObject::~_DataObject() {
 }
 
 void _DataObject::add2DArray(double* in_array2D, int num_of_rows, int num_of_columns) {
+	if(is_buffer_wrapped) {
+		printf("Cannot add rows to a data object that wraps an external buffer\n");
+		return;
+	}
 	intfloat* vec;
 	for (int i = 0; i < num_of_rows; i++) {
 		vec = isc_data_obj->newentry();
@@ -69,6 +90,179 @@ void _DataObject::add2DArray(double* in_array2D, int num_of_rows, int num_of_col
 	}
 }
 
+void _DataObject::_wrapBuffer(int* in_buffer2D, int num_of_rows, int num_of_columns) {
+	if(num_of_columns != data_format->size()) {
+		printf("Wrong number of columns in buffer, expected %i\n", data_format->size());
+		return;
+	}
+	if (is_data_obj_created && isc_data_obj) {
+		delete isc_data_obj;
+	}
+	isc_data_obj = new _BufferDataObject(data_format->get_isc_format(), (intfloat*) in_buffer2D, num_of_rows, num_of_columns);
+	is_data_obj_created = 1;
+	is_buffer_wrapped = 1;
+}
+
+void _DataObject::_setBufferSize(int num_of_rows) {
+	if(!is_buffer_wrapped || is_read_only) {
+		printf("Only data objects that wrap an external buffer can be resized\n");
+		return;
+	}
+	((_BufferDataObject*) isc_data_obj)->setSize(num_of_rows);
+}
+
+static void append_uint32(std::string& out, uint32_t value) {
+	out.append((const char*) &value, sizeof(value));
+}
+
+static void append_name(std::string& out, const char* name) {
+	append_uint32(out, strlen(name));
+	out.append(name);
+}
+
+static bool read_uint32(const char*& in, const char* end, uint32_t& value) {
+	if(end - in < (long) sizeof(value)) {
+		return false;
+	}
+	memcpy(&value, in, sizeof(value));
+	in += sizeof(value);
+	return true;
+}
+
+static bool read_name(const char*& in, const char* end, std::string& name) {
+	uint32_t length;
+	if(!read_uint32(in, end, length) || (unsigned long) (end - in) < length) {
+		return false;
+	}
+	name.assign(in, length);
+	in += length;
+	return true;
+}
+
+int _DataObject::_writeBinaryFile(const char* filename) {
+	::Format* format = data_format->get_isc_format();
+	int num_of_columns = data_format->size();
+	int num_of_rows = isc_data_obj->size();
+
+	std::string header(PYISC_ROW_FILE_MAGIC, PYISC_ROW_FILE_MAGIC_LENGTH);
+	append_uint32(header, PYISC_ROW_FILE_VERSION);
+	append_uint32(header, PYISC_ROW_FILE_BYTE_ORDER);
+	append_uint32(header, num_of_columns);
+	append_uint32(header, num_of_rows);
+	size_t data_offset_position = header.size();
+	header.append(sizeof(uint64_t), 0);
+
+	for (int j = 0; j < num_of_columns; j++) {
+		::FormatSpec* spec = format->nth(j);
+		uint32_t num_of_symbols = 0;
+		switch(spec->type()) {
+		case FORMATSPEC_CONT:
+			append_uint32(header, Format::Continuous);
+			break;
+		case FORMATSPEC_SYMBOL:
+			append_uint32(header, Format::Symbol);
+			num_of_symbols = spec->getnum();
+			break;
+		case FormatSpecDatetimeType:
+			append_uint32(header, Format::TIME);
+			break;
+		default:
+			append_uint32(header, Format::Discrete);
+		}
+		append_name(header, spec->name);
+		append_uint32(header, num_of_symbols);
+		for(uint32_t k = 0; k < num_of_symbols; k++) {
+			append_name(header, spec->represent(intfloat((int) k)));
+		}
+	}
+	header.append((8 - header.size() % 8) % 8, 0);
+	uint64_t data_offset = header.size();
+	memcpy(&header[data_offset_position], &data_offset, sizeof(data_offset));
+
+	FILE* file = fopen(filename, "wb");
+	if(!file) {
+		printf("Cannot open %s for writing\n", filename);
+		return 0;
+	}
+	int success = fwrite(header.data(), 1, header.size(), file) == header.size();
+	for (int i = 0; success && i < num_of_rows; i++) {
+		success = fwrite((*isc_data_obj)[i], sizeof(intfloat), num_of_columns, file) == (size_t) num_of_columns;
+	}
+	if(fclose(file) != 0 || !success) {
+		printf("Cannot write %s\n", filename);
+		return 0;
+	}
+	return 1;
+}
+
+int _DataObject::_mapBinaryFile(const char* filename) {
+	size_t mapping_length;
+	void* mapping = _MappedDataObject::mapFile(filename, &mapping_length);
+	if(!mapping) {
+		printf("Cannot map %s\n", filename);
+		return 0;
+	}
+
+	const char* in = (const char*) mapping;
+	const char* end = in + mapping_length;
+	uint32_t version, byte_order, num_of_columns, num_of_rows;
+	uint64_t data_offset;
+	if(mapping_length < PYISC_ROW_FILE_MAGIC_LENGTH || memcmp(in, PYISC_ROW_FILE_MAGIC, PYISC_ROW_FILE_MAGIC_LENGTH) != 0) {
+		printf("%s is not a binary row file\n", filename);
+		_MappedDataObject::unmapFile(mapping, mapping_length);
+		return 0;
+	}
+	in += PYISC_ROW_FILE_MAGIC_LENGTH;
+	if(!read_uint32(in, end, version) || version > PYISC_ROW_FILE_VERSION ||
+			!read_uint32(in, end, byte_order) || byte_order != PYISC_ROW_FILE_BYTE_ORDER) {
+		printf("Unsupported version or byte order of binary row file %s\n", filename);
+		_MappedDataObject::unmapFile(mapping, mapping_length);
+		return 0;
+	}
+	if(!read_uint32(in, end, num_of_columns) || !read_uint32(in, end, num_of_rows) || end - in < (long) sizeof(data_offset) ||
+			(data_format->size() != 0 && data_format->size() != (int) num_of_columns)) {
+		printf("Wrong number of columns in binary row file %s\n", filename);
+		_MappedDataObject::unmapFile(mapping, mapping_length);
+		return 0;
+	}
+	memcpy(&data_offset, in, sizeof(data_offset));
+	in += sizeof(data_offset);
+	if(data_offset > mapping_length || (mapping_length - data_offset)/sizeof(intfloat)/(num_of_columns ? num_of_columns : 1) < num_of_rows) {
+		printf("Binary row file %s is truncated\n", filename);
+		_MappedDataObject::unmapFile(mapping, mapping_length);
+		return 0;
+	}
+
+	if(data_format->size() == 0) {
+		for (uint32_t j = 0; j < num_of_columns; j++) {
+			uint32_t type, num_of_symbols;
+			std::string name;
+			if(!read_uint32(in, end, type) || !read_name(in, end, name) || !read_uint32(in, end, num_of_symbols)) {
+				printf("Binary row file %s is truncated\n", filename);
+				_MappedDataObject::unmapFile(mapping, mapping_length);
+				return 0;
+			}
+			data_format->addColumn(name.c_str(), (Format::ColumnType) type);
+			for(uint32_t k = 0; k < num_of_symbols; k++) {
+				if(!read_name(in, end, name)) {
+					printf("Binary row file %s is truncated\n", filename);
+					_MappedDataObject::unmapFile(mapping, mapping_length);
+					return 0;
+				}
+				data_format->get_isc_format()->nth(j)->add(name.c_str());
+			}
+		}
+	}
+
+	if (is_data_obj_created && isc_data_obj) {
+		delete isc_data_obj;
+	}
+	isc_data_obj = new _MappedDataObject(data_format->get_isc_format(), mapping, mapping_length, data_offset, num_of_rows, num_of_columns);
+	is_data_obj_created = 1;
+	is_buffer_wrapped = 1;
+	is_read_only = 1;
+	return 1;
+}
 
 void _DataObject::_convert_to_intfloat(double* in_array1D, int num_of_columns, intfloat* vec) {
 	for (int j = 0; j < num_of_columns; j++) {
@@ -145,6 +339,10 @@ void pyisc::_DataObject::_convert_to_numpyarray(intfloat* vec, double* out_1DArr
 }
 
 void _DataObject::set_column_values(int column_index, double* in_array1D, int num_of_columns) {
+	if(is_read_only) {
+		printf("Cannot change the rows of a memory-mapped data object\n");
+		return;
+	}
 	if(isc_data_obj->size() != num_of_columns) {
 		printf("Array is not of same size as column array");
 		return;
@@ -32,6 +32,8 @@ namespace pyisc {
 class _DataObject {
 	int is_data_obj_created = 0;
 	int is_data_format_created = 0;
+	int is_buffer_wrapped = 0;
+	int is_read_only = 0;
 
 protected:
 	pyisc::Format* data_format;
@@ -68,6 +70,32 @@ public:
 	 */
 	virtual void add2DArray(double* in_array2D, int num_of_rows, int num_of_columns);
 
+	/**
+	 * Use a C-contiguous numpy array with 4 bytes per element (int32 or float32 viewed as int32) as row storage
+	 * without copying it. The element types must match the column types of the format. The array must be kept
+	 * alive by the caller as long as this data object is used and no rows can be added afterwards.
+	 */
+	virtual void _wrapBuffer(int* in_buffer2D, int num_of_rows, int num_of_columns);
+
+	/**
+	 * Sets the number of rows in use of a wrapped buffer, so that the buffer can be reused for fewer rows.
+	 */
+	virtual void _setBufferSize(int num_of_rows);
+
+	/**
+	 * Writes the format and the rows to a binary row file, that is, a header with the format followed by the rows
+	 * as fixed-width intfloat records in the byte order of this machine. Returns 1 if succeeds, otherwise 0.
+	 */
+	virtual int _writeBinaryFile(const char* filename);
+
+	/**
+	 * Uses the rows of a binary row file as row storage by memory-mapping the file read-only, so that the rows are
+	 * neither read nor copied until used and can be shared by processes mapping the same file. If the format of this
+	 * data object is empty, the columns are added from the file, otherwise the number of columns must match.
+	 * No rows can be added nor changed afterwards. Returns 1 if succeeds, otherwise 0.
+	 */
+	virtual int _mapBinaryFile(const char* filename);
+
 	/**
 	 * Returns number of rows.
 	 */
@@ -0,0 +1,214 @@
+/*
+ --------------------------------------------------------------------------
+ Copyright (C) 2014, 2015, 2016 SICS Swedish ICT AB
+
+ Main author: Tomas Olsson <tol@sics.se>
+
+ This code is free software: you can redistribute it and/or modify it
+ under the terms of the GNU Lesser General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ This code is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Lesser General Public License for more details.
+
+ You should have received a copy of the GNU Lesser General Public License
+ along with this code.  If not, see <http://www.gnu.org/licenses/>.
+ --------------------------------------------------------------------------
+ */
+
+#include "_DetectorBank.hh"
+#include <math.h>
+
+/**
+ * Creates a micro model for a given mixture component of an entity detector.
+ *
+ * co is the creating object, that is, the entity detector.
+ */
+::IscMicroModel *entity_create_micro_model(const void* co, int mixtureCompIndex)
+{
+	return ((pyisc::_EntityDetector*)co)->_CreateMixtureComponet(mixtureCompIndex);
+}
+
+namespace pyisc {
+
+_EntityDetector::_EntityDetector(
+		int off, int splt, double th,
+		int cl, ::IscCombinationRule cr,
+		std::vector<IscMicroModel*>* component_distribution_creators) :
+				::AnomalyDetector(component_distribution_creators->size(),off,splt,th,cl,cr, entity_create_micro_model) {
+	this->component_distribution_creators = component_distribution_creators;
+}
+
+::IscMicroModel *_EntityDetector::_CreateMixtureComponet(int mixtureComponentIndex) {
+	return (*component_distribution_creators)[mixtureComponentIndex]->create();
+}
+
+void _EntityDetector::importModel(IscAbstractModelImporter *importer) {
+	IscAbstractModelImporter *innerImporter = importer->getModelImporter("AnomalyDetector");
+	::AnomalyDetector::importModel(innerImporter);
+	delete innerImporter;
+}
+
+void _EntityDetector::exportModel(IscAbstractModelExporter *exporter) {
+	IscAbstractModelExporter *innerExporter = exporter->createModelExporter("AnomalyDetector");
+	::AnomalyDetector::exportModel(innerExporter);
+	delete innerExporter;
+}
+
+_DetectorBank::_DetectorBank(
+		int off, int splt, double th,
+		int cl, ::IscCombinationRule cr,
+		std::vector<IscMicroModel*> component_distribution_creators) {
+	prototype = new _AnomalyDetector(off, splt, th, cl, cr, component_distribution_creators);
+}
+
+_DetectorBank::~_DetectorBank() {
+	_Reset();
+	delete prototype;
+}
+
+void _DetectorBank::_SetParams(int off, int splt, double th, int cl) {
+	prototype->_SetParams(off, splt, th, cl);
+	for(unsigned int i=0; i < detectors.size(); i++) {
+		if(detectors[i]) {
+			detectors[i]->SetParams(off, splt, th, cl);
+		}
+	}
+}
+
+void _DetectorBank::_Reset() {
+	for(unsigned int i=0; i < detectors.size(); i++) {
+		delete detectors[i];
+	}
+	detectors.clear();
+}
+
+void _DetectorBank::_ResetEntity(int entity_id) {
+	if(entity_id >= 0 && entity_id < (int) detectors.size()) {
+		delete detectors[entity_id];
+		detectors[entity_id] = 0;
+	}
+}
+
+int _DetectorBank::_NumOfEntities() {
+	return detectors.size();
+}
+
+int _DetectorBank::_IsTrained(int entity_id) {
+	return getDetector(entity_id, 0) != 0;
+}
+
+_EntityDetector* _DetectorBank::getDetector(int entity_id, int create) {
+	if(entity_id < 0) {
+		return 0;
+	}
+	if(entity_id >= (int) detectors.size()) {
+		if(!create) {
+			return 0;
+		}
+		detectors.resize(entity_id+1, 0);
+	}
+	if(!detectors[entity_id] && create) {
+		detectors[entity_id] = new _EntityDetector(prototype->params_offset, prototype->params_split,
+				prototype->params_threshold, prototype->params_clustering, prototype->params_combination_rule,
+				&prototype->component_distribution_creators);
+	}
+	return detectors[entity_id];
+}
+
+void _DetectorBank::_TrainData(_DataObject* d, int entity_column) {
+	if(entity_column < 0 || entity_column >= d->length()) {
+		printf("Wrong entity column %i\n", entity_column);
+		return;
+	}
+	::DataObject* data = d->get_isc_data_object();
+	for(int i=0; i < data->size(); i++) {
+		intfloat* vec = (*data)[i];
+		_EntityDetector* detector = getDetector(vec[entity_column].i, 1);
+		if(detector) {
+			detector->TrainOne(vec);
+		}
+	}
+}
+
+void _DetectorBank::_UntrainData(_DataObject* d, int entity_column) {
+	if(entity_column < 0 || entity_column >= d->length()) {
+		printf("Wrong entity column %i\n", entity_column);
+		return;
+	}
+	::DataObject* data = d->get_isc_data_object();
+	for(int i=0; i < data->size(); i++) {
+		intfloat* vec = (*data)[i];
+		_EntityDetector* detector = getDetector(vec[entity_column].i, 0);
+		if(detector) {
+			detector->UntrainOne(vec);
+		}
+	}
+}
+
+void _DetectorBank::_CalcAnomaly(_DataObject* d, int entity_column, double* deviations, int deviations_length) {
+	if(deviations_length != d->size()) {
+		printf("Wrong deviations lengths");
+		return;
+	}
+	if(entity_column < 0 || entity_column >= d->length()) {
+		printf("Wrong entity column %i\n", entity_column);
+		return;
+	}
+	::DataObject* data = d->get_isc_data_object();
+	std::vector<double> devs(prototype->component_distribution_creators.size());
+	for(int i=0; i < data->size(); i++) {
+		intfloat* vec = (*data)[i];
+		_EntityDetector* detector = getDetector(vec[entity_column].i, 0);
+		int cla, clu;
+		if(detector) {
+			detector->CalcAnomalyDetails(vec, deviations[i], cla, clu, &devs[0]);
+		} else {
+			deviations[i] = NAN;
+		}
+	}
+}
+
+void _DetectorBank::exportModel(IscAbstractModelExporter *exporter) {
+	std::vector<int> entities;
+	for(unsigned int i=0; i < detectors.size(); i++) {
+		if(detectors[i]) {
+			entities.push_back(i);
+		}
+	}
+	IscAbstractModelExporter *bankExporter = exporter->createModelExporter("DetectorBank");
+	bankExporter->addParameter("num_of_entities", (int) entities.size());
+	if(entities.size() > 0) {
+		bankExporter->addParameter("entities", &entities[0], entities.size());
+	}
+	for(unsigned int i=0; i < entities.size(); i++) {
+		IscAbstractModelExporter *entityExporter = bankExporter->createModelExporter(entities[i]);
+		detectors[entities[i]]->exportModel(entityExporter);
+		delete entityExporter;
+	}
+	delete bankExporter;
+}
+
+void _DetectorBank::importModel(IscAbstractModelImporter *importer) {
+	_Reset();
+	IscAbstractModelImporter *bankImporter = importer->getModelImporter("DetectorBank");
+	int num_of_entities = 0;
+	bankImporter->fillParameter("num_of_entities", num_of_entities);
+	std::vector<int> entities(num_of_entities);
+	if(num_of_entities > 0) {
+		bankImporter->fillParameter("entities", &entities[0], num_of_entities);
+	}
+	for(int i=0; i < num_of_entities; i++) {
+		_EntityDetector* detector = getDetector(entities[i], 1);
+		IscAbstractModelImporter *entityImporter = bankImporter->getModelImporter(entities[i]);
+		detector->importModel(entityImporter);
+		detector->SetParams(prototype->params_offset, prototype->params_split, prototype->params_threshold, prototype->params_clustering);
+		delete entityImporter;
+	}
+	delete bankImporter;
+}
+
+} /* namespace pyisc */
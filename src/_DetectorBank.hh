@@ -0,0 +1,131 @@
+/*
+ --------------------------------------------------------------------------
+ Copyright (C) 2014, 2015, 2016 SICS Swedish ICT AB
+
+ Main author: Tomas Olsson <tol@sics.se>
+
+ This code is free software: you can redistribute it and/or modify it
+ under the terms of the GNU Lesser General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ This code is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Lesser General Public License for more details.
+
+ You should have received a copy of the GNU Lesser General Public License
+ along with this code.  If not, see <http://www.gnu.org/licenses/>.
+ --------------------------------------------------------------------------
+ */
+
+#ifndef DETECTORBANK_HH_
+#define DETECTORBANK_HH_
+
+#include <vector>
+#include "_AnomalyDetector.hh"
+#include "_DataObject.hh"
+#include "isc_exportimport.hh"
+
+namespace pyisc {
+
+/**
+ * The anomaly detector of an entity in a bank. It only holds the trained mixture and creates its micro models with
+ * the micro model creators of the bank, so it has none of the locks, score memo and replicas of _AnomalyDetector.
+ * It is exported and imported in the same format as _AnomalyDetector.
+ */
+class _EntityDetector : public ::AnomalyDetector {
+public:
+	_EntityDetector(
+			int off,
+			int splt,
+			double th,
+			int cl,
+			::IscCombinationRule cr,
+			std::vector<IscMicroModel*>* component_distribution_creators);
+	virtual ~_EntityDetector() {};
+
+	virtual void importModel(IscAbstractModelImporter *importer);
+	virtual void exportModel(IscAbstractModelExporter *exporter);
+
+	virtual ::IscMicroModel *_CreateMixtureComponet(int mixtureComponentIndex);
+
+protected:
+	std::vector<IscMicroModel*>* component_distribution_creators;
+};
+
+/**
+ * A bank of anomaly detectors with the same parameters and micro models, one per entity (e.g. host or customer),
+ * where the rows of a data object are routed to the detector of the entity whose id is in the entity column.
+ *
+ * Entity ids are dense non-negative integers. A detector is only created when its entity is first trained and it
+ * shares the micro model creators of the bank, so an entity costs little more than its trained model. Rows with a
+ * negative entity id are ignored.
+ *
+ * The micro models use internal buffers when scoring, so a bank must not be used by several threads concurrently.
+ */
+class _DetectorBank {
+public:
+	_DetectorBank(
+			int off,
+			int splt,
+			double th,
+			int cl,
+			::IscCombinationRule cr,
+			std::vector<IscMicroModel*> component_distribution_creators);
+	virtual ~_DetectorBank();
+
+	/**
+	 * Sets the parameters of all current and future detectors.
+	 */
+	virtual void _SetParams(int off, int splt, double th, int cl);
+
+	/**
+	 * Removes the detectors of all entities.
+	 */
+	virtual void _Reset();
+
+	/**
+	 * Removes the detector of an entity.
+	 */
+	virtual void _ResetEntity(int entity_id);
+
+	/**
+	 * Returns one more than the largest entity id that has been trained.
+	 */
+	virtual int _NumOfEntities();
+
+	/**
+	 * Returns 1 if the entity has a detector, otherwise 0.
+	 */
+	virtual int _IsTrained(int entity_id);
+
+	/**
+	 * Trains each row in d incrementally on the detector of the entity in the entity column.
+	 */
+	virtual void _TrainData(_DataObject* d, int entity_column);
+
+	/**
+	 * Untrains each row in d incrementally from the detector of the entity in the entity column.
+	 */
+	virtual void _UntrainData(_DataObject* d, int entity_column);
+
+	/**
+	 * Computes the anomaly score of each row in d using the detector of the entity in the entity column,
+	 * or NaN if the entity has not been trained.
+	 */
+	virtual void _CalcAnomaly(_DataObject* d, int entity_column, double* deviations, int deviations_length);
+
+	virtual void importModel(IscAbstractModelImporter *importer);
+	virtual void exportModel(IscAbstractModelExporter *exporter);
+
+protected:
+	virtual _EntityDetector* getDetector(int entity_id, int create);
+
+	_AnomalyDetector* prototype; // Holds the parameters and the micro model creators shared by all detectors
+	std::vector<_EntityDetector*> detectors;
+};
+
+} /* namespace pyisc */
+
+#endif /* DETECTORBANK_HH_ */
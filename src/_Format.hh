@@ -77,6 +77,11 @@ public:
 	virtual void add(FormatSpec*);
 	virtual int size();
 
+	/**
+	 * Returns 1 if the nth column holds continuous (float) values, otherwise 0 since all other column types hold int values.
+	 */
+	virtual int _isContinuousColumn(int n) {return isc_format->nth(n)->type() == FORMATSPEC_CONT;};
+
 	virtual void printColumnNames();
 
 	virtual ::Format* get_isc_format();
@@ -0,0 +1,128 @@
+/*
+ --------------------------------------------------------------------------
+ Copyright (C) 2014, 2015, 2016 SICS Swedish ICT AB
+
+ Main author: Tomas Olsson <tol@sics.se>
+
+ This code is free software: you can redistribute it and/or modify it
+ under the terms of the GNU Lesser General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ This code is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Lesser General Public License for more details.
+
+ You should have received a copy of the GNU Lesser General Public License
+ along with this code.  If not, see <http://www.gnu.org/licenses/>.
+ --------------------------------------------------------------------------
+ */
+
+#include "_RowWindow.hh"
+#include <string.h>
+
+namespace pyisc {
+
+_RowWindow::_RowWindow(int max_num_of_rows0, int num_of_columns0) {
+	max_num_of_rows = max_num_of_rows0 > 0 ? max_num_of_rows0 : 1;
+	num_of_columns = num_of_columns0;
+	rows = new intfloat[((long) max_num_of_rows)*num_of_columns];
+	times = new double[max_num_of_rows];
+	first = 0;
+	num_of_rows = 0;
+
+	if(DEBUG)
+		printf("Create _RowWindow with %i rows\n", max_num_of_rows);
+}
+
+_RowWindow::~_RowWindow() {
+	delete [] rows;
+	delete [] times;
+
+	if(DEBUG)
+		printf("Delete _RowWindow\n");
+}
+
+int _RowWindow::size() {
+	return num_of_rows;
+}
+
+int _RowWindow::length() {
+	return num_of_columns;
+}
+
+int _RowWindow::capacity() {
+	return max_num_of_rows;
+}
+
+union intfloat* _RowWindow::oldest() {
+	return rows + ((long) first)*num_of_columns;
+}
+
+double _RowWindow::oldestTime() {
+	return times[first];
+}
+
+double _RowWindow::newestTime() {
+	return times[(first + num_of_rows - 1) % max_num_of_rows];
+}
+
+void _RowWindow::removeOldest() {
+	if(num_of_rows == 0) {
+		return;
+	}
+	first = (first + 1) % max_num_of_rows;
+	num_of_rows--;
+}
+
+union intfloat* _RowWindow::add(union intfloat* vec, double time) {
+	if(num_of_rows == max_num_of_rows) {
+		printf("Cannot add a row to a full window\n");
+		return 0;
+	}
+	int last = (first + num_of_rows) % max_num_of_rows;
+	union intfloat* row = rows + ((long) last)*num_of_columns;
+	memcpy(row, vec, sizeof(intfloat)*num_of_columns);
+	times[last] = time;
+	num_of_rows++;
+	return row;
+}
+
+void _RowWindow::clear() {
+	first = 0;
+	num_of_rows = 0;
+}
+
+void _RowWindow::_getRows(int* out_rows, int num_of_elements) {
+	if(num_of_elements != num_of_rows*num_of_columns) {
+		printf("Wrong number of elements");
+		return;
+	}
+	for(int i=0; i < num_of_rows; i++) {
+		memcpy(out_rows+((long) i)*num_of_columns, rows + ((long) ((first + i) % max_num_of_rows))*num_of_columns,
+				sizeof(intfloat)*num_of_columns);
+	}
+}
+
+void _RowWindow::_getTimes(double* out_times, int num_of_times) {
+	if(num_of_times != num_of_rows) {
+		printf("Wrong number of time stamps");
+		return;
+	}
+	for(int i=0; i < num_of_rows; i++) {
+		out_times[i] = times[(first + i) % max_num_of_rows];
+	}
+}
+
+void _RowWindow::_putRows(int* in_buffer2D, int num_of_rows0, int num_of_columns0, double* in_timestamps, int num_of_timestamps) {
+	if(num_of_columns0 != num_of_columns || num_of_timestamps != num_of_rows0 || num_of_rows + num_of_rows0 > max_num_of_rows) {
+		printf("Rows do not fit into window\n");
+		return;
+	}
+	for(int i=0; i < num_of_rows0; i++) {
+		add((intfloat*) (in_buffer2D+((long) i)*num_of_columns), in_timestamps[i]);
+	}
+}
+
+} /* namespace pyisc */
@@ -0,0 +1,95 @@
+/*
+ --------------------------------------------------------------------------
+ Copyright (C) 2014, 2015, 2016 SICS Swedish ICT AB
+
+ Main author: Tomas Olsson <tol@sics.se>
+
+ This code is free software: you can redistribute it and/or modify it
+ under the terms of the GNU Lesser General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ This code is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Lesser General Public License for more details.
+
+ You should have received a copy of the GNU Lesser General Public License
+ along with this code.  If not, see <http://www.gnu.org/licenses/>.
+ --------------------------------------------------------------------------
+ */
+
+#ifndef ROWWINDOW_HH_
+#define ROWWINDOW_HH_
+
+#include <format.hh>
+
+#ifndef DEBUG
+#define DEBUG 0
+#endif
+
+namespace pyisc {
+
+/**
+ * A ring buffer with a fixed maximum number of rows of intfloat values and a time stamp per row,
+ * used for keeping the rows that an anomaly detector is currently trained on.
+ */
+class _RowWindow {
+public:
+	_RowWindow(int max_num_of_rows, int num_of_columns);
+	virtual ~_RowWindow();
+
+	/**
+	 * Returns number of rows in the window.
+	 */
+	virtual int size();
+
+	/**
+	 * Returns number of columns of a row.
+	 */
+	virtual int length();
+
+	/**
+	 * Returns the maximum number of rows in the window.
+	 */
+	virtual int capacity();
+
+	virtual union intfloat* oldest();
+	virtual double oldestTime();
+	virtual double newestTime();
+	virtual void removeOldest();
+
+	/**
+	 * Copies vec into the window as the newest row and returns the copy. The window must not be full.
+	 */
+	virtual union intfloat* add(union intfloat* vec, double time);
+
+	virtual void clear();
+
+	/**
+	 * Returns the rows from the oldest to the newest as a 1D array of the raw intfloat values.
+	 */
+	virtual void _getRows(int* out_rows, int num_of_elements);
+
+	/**
+	 * Returns the time stamps of the rows from the oldest to the newest.
+	 */
+	virtual void _getTimes(double* out_times, int num_of_times);
+
+	/**
+	 * Adds rows of raw intfloat values, as returned by _getRows, with the given time stamps.
+	 */
+	virtual void _putRows(int* in_buffer2D, int num_of_rows, int num_of_columns, double* in_timestamps, int num_of_timestamps);
+
+protected:
+	union intfloat* rows;
+	double* times;
+	int max_num_of_rows;
+	int num_of_columns;
+	int first;
+	int num_of_rows;
+};
+
+} /* namespace pyisc */
+
+#endif /* ROWWINDOW_HH_ */
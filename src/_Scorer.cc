@@ -0,0 +1,64 @@
+/*
+ --------------------------------------------------------------------------
+ Copyright (C) 2014, 2015, 2016 SICS Swedish ICT AB
+
+ Main author: Tomas Olsson <tol@sics.se>
+
+ This code is free software: you can redistribute it and/or modify it
+ under the terms of the GNU Lesser General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ This code is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Lesser General Public License for more details.
+
+ You should have received a copy of the GNU Lesser General Public License
+ along with this code.  If not, see <http://www.gnu.org/licenses/>.
+ --------------------------------------------------------------------------
+ */
+
+#include "_Scorer.hh"
+#include <math.h>
+#include <formattypes.hh>
+
+namespace pyisc {
+
+_Scorer::_Scorer(_AnomalyDetector* detector0, Format* format) {
+	detector = detector0;
+	int num_of_columns = format->size();
+	for (int j = 0; j < num_of_columns; j++) {
+		is_int_column.push_back(format->get_isc_format()->nth(j)->type() != FORMATSPEC_CONT);
+	}
+	vec = new intfloat[num_of_columns > 0 ? num_of_columns : 1];
+	deviations.resize(detector->_NumOfComponents() > 0 ? detector->_NumOfComponents() : 1);
+}
+
+_Scorer::~_Scorer() {
+	delete [] vec;
+}
+
+int _Scorer::length() {
+	return is_int_column.size();
+}
+
+double _Scorer::_ScoreOne(double* in_array1D, int num_of_columns) {
+	if(num_of_columns != (int) is_int_column.size()) {
+		printf("Wrong number of columns %i, expected %i\n", num_of_columns, (int) is_int_column.size());
+		return NAN;
+	}
+	for (int j = 0; j < num_of_columns; j++) {
+		if(is_int_column[j]) {
+			vec[j].i = (int) in_array1D[j];
+		} else {
+			vec[j].f = (float) in_array1D[j];
+		}
+	}
+	double anomaly;
+	int class_id, cluster_id;
+	detector->_CalcAnomalyDetails(vec, &anomaly, &class_id, &cluster_id, &deviations[0]);
+	return anomaly;
+}
+
+} /* namespace pyisc */
@@ -0,0 +1,61 @@
+/*
+ --------------------------------------------------------------------------
+ Copyright (C) 2014, 2015, 2016 SICS Swedish ICT AB
+
+ Main author: Tomas Olsson <tol@sics.se>
+
+ This code is free software: you can redistribute it and/or modify it
+ under the terms of the GNU Lesser General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ This code is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Lesser General Public License for more details.
+
+ You should have received a copy of the GNU Lesser General Public License
+ along with this code.  If not, see <http://www.gnu.org/licenses/>.
+ --------------------------------------------------------------------------
+ */
+
+#ifndef SCORER_HH_
+#define SCORER_HH_
+
+#include <vector>
+#include "_AnomalyDetector.hh"
+#include "_Format.hh"
+
+namespace pyisc {
+
+/**
+ * Scores single rows with an anomaly detector without creating a data object per row. The column types of the
+ * format are looked up once and each row is converted into a preallocated intfloat buffer.
+ *
+ * The scorer does not own the anomaly detector, which must outlive it, but always scores with its current model.
+ */
+class _Scorer {
+public:
+	_Scorer(_AnomalyDetector* detector, Format* format);
+	virtual ~_Scorer();
+
+	/**
+	 * Returns the anomaly score of a row with one value per column of the format, or NaN if the number of values is wrong.
+	 */
+	virtual double _ScoreOne(double* in_array1D, int num_of_columns);
+
+	/**
+	 * Returns the number of columns of the rows.
+	 */
+	virtual int length();
+
+protected:
+	_AnomalyDetector* detector;
+	std::vector<char> is_int_column;
+	std::vector<double> deviations;
+	union intfloat* vec;
+};
+
+} /* namespace pyisc */
+
+#endif /* SCORER_HH_ */
@@ -0,0 +1,30 @@
+import unittest
+
+import numpy as np
+import pyisc
+
+
+class MyTestCase(unittest.TestCase):
+    def test_clustering_in_parallel(self):
+        X = np.r_[np.random.normal(0, 1, (500, 2)), np.random.normal(20, 1, (500, 2))]
+        truth = np.array([0] * 500 + [1] * 500)
+
+        clustering = pyisc.AnomalyClustering(2, 4, pyisc.P_Gaussian([0, 1]), n_jobs=2).fit(X)
+
+        labels = clustering.clf_.predict(X)
+        agreement = (labels == labels[0]) == (truth == truth[0])
+        self.assertGreater(agreement.mean(), 0.95)
+
+    def test_empty_clusters_are_removed(self):
+        X = np.random.normal(0, 1, (200, 2))
+
+        clustering = pyisc.AnomalyClustering(5, 1, pyisc.P_Gaussian([0, 1]))
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1]))
+        labels = clustering._train_clf(ad, X, 5)
+
+        # The detector is only trained with the clusters that have rows, as when refitting in each iteration
+        self.assertEqual(sorted(np.unique(labels)), sorted(ad.classes_))
+
+
+if __name__ == '__main__':
+    unittest.main()
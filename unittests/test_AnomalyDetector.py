@@ -1,4 +1,5 @@
 import unittest
+from multiprocessing.pool import ThreadPool
 import pyisc
 import numpy as np
 class MyTestCase(unittest.TestCase):
@@ -18,6 +19,112 @@ class MyTestCase(unittest.TestCase):
 
         self.assertTrue(np.array_equal(ad.anomaly_score(X), ad.anomaly_score(X)))
 
+    def test_anomaly_score_in_parallel(self):
+        X = np.c_[np.random.normal(0, 1, 10000), np.random.normal(5, 2, 10000)]
+
+        ad = pyisc.AnomalyDetector([pyisc.P_Gaussian(0), pyisc.P_Gaussian([0, 1])]).fit(X)
+
+        self.assertTrue(np.array_equal(ad.anomaly_score(X), ad.anomaly_score(X, n_jobs=4)))
+        self.assertTrue(np.array_equal(ad.anomaly_score(X), ad.anomaly_score(X, n_jobs=-1)))
+
+    def test_anomaly_score_details_as_arrays(self):
+        X = np.c_[np.random.normal(0, 1, 1000), np.random.normal(5, 2, 1000)]
+
+        ad = pyisc.AnomalyDetector([pyisc.P_Gaussian(0), pyisc.P_Gaussian(1)]).fit(X)
+
+        details = ad.anomaly_score_details(X, as_arrays=True)
+
+        np.testing.assert_allclose(details['anomaly_score'], ad.anomaly_score(X))
+        self.assertEqual(details['deviations'].shape, (1000, 2))
+        self.assertEqual(details['peak'].shape, (1000, 2))
+        self.assertTrue(np.all(details['min'] <= details['max']))
+
+        # The arrays contain the same details as computed row by row
+        for i, row_details in enumerate(ad.anomaly_score_details(X[:100])):
+            anomaly_score, deviations, peak, min, max = row_details
+            np.testing.assert_allclose(details['anomaly_score'][i], anomaly_score)
+            np.testing.assert_allclose(details['deviations'][i], deviations)
+            np.testing.assert_allclose(details['peak'][i], peak)
+            np.testing.assert_allclose(details['min'][i], min)
+            np.testing.assert_allclose(details['max'][i], max)
+
+        y = np.array(['a', 'b'] * 500)
+        ad = pyisc.AnomalyDetector([pyisc.P_Gaussian(0), pyisc.P_Gaussian(1)]).fit(X, y)
+        details = ad.anomaly_score_details(X, y, as_arrays=True)
+        for i, row_details in enumerate(ad.anomaly_score_details(X[:100], y[:100])):
+            anomaly_score, class_id, deviations, peak, min, max = row_details
+            np.testing.assert_allclose(details['anomaly_score'][i], anomaly_score)
+            self.assertEqual(details['class'][i], class_id)
+            np.testing.assert_allclose(details['deviations'][i], deviations)
+            np.testing.assert_allclose(details['peak'][i], peak)
+            np.testing.assert_allclose(details['min'][i], min)
+            np.testing.assert_allclose(details['max'][i], max)
+
+        # Arrays of the wrong size are rejected instead of being returned uninitialized
+        data_object = ad._convert_to_data_object_in_scoring(X, y)
+        ad.num_of_partitions = 3
+        self.assertRaises(ValueError, ad._anomaly_score_details_arrays, data_object)
+
+    def test_anomaly_score_in_threads(self):
+        X = np.c_[np.random.normal(0, 1, 10000), np.random.normal(5, 2, 10000)]
+
+        detectors = [pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[i::4]) for i in range(4)]
+        expected = [ad.anomaly_score(X) for ad in detectors]
+
+        # The native scoring releases the GIL, so the detectors are scored concurrently
+        pool = ThreadPool(4)
+        try:
+            scores = pool.map(lambda ad: ad.anomaly_score(X), detectors)
+        finally:
+            pool.close()
+            pool.join()
+
+        for s, e in zip(scores, expected):
+            self.assertTrue(np.array_equal(s, e))
+
+    def test_score_memo(self):
+        period = np.random.randint(1, 4, 10000)
+        X = np.c_[np.random.poisson(3 * period), period]
+
+        ad = pyisc.AnomalyDetector([pyisc.P_Poisson(0, 1), pyisc.P_Gamma(0, 1)]).fit(X)
+        expected = ad.anomaly_score(X)
+
+        ad.set_score_memo_size(1000)
+        np.testing.assert_allclose(ad.anomaly_score(X), expected)
+        # All but the distinct rows are scored by a lookup
+        num_of_distinct_rows = len(set(map(tuple, X)))
+        self.assertEqual(len(X) - num_of_distinct_rows, ad._anomaly_detector._ScoreMemoHits())
+        np.testing.assert_allclose(ad.anomaly_score(X), expected)
+        self.assertEqual(2 * len(X) - num_of_distinct_rows, ad._anomaly_detector._ScoreMemoHits())
+
+        # The remembered scores are forgotten when the model is trained
+        ad.fit_incrementally(X[:1000] * 2)
+        scores = ad.anomaly_score(X)
+        ad.set_score_memo_size(0)
+        np.testing.assert_allclose(scores, ad.anomaly_score(X))
+
+    def test_score_one(self):
+        X = np.c_[np.random.normal(0, 1, 1000), np.random.normal(5, 2, 1000)]
+        y = np.array(['a', 'b'] * 500)
+
+        ad = pyisc.AnomalyDetector([pyisc.P_Gaussian(0), pyisc.P_Gaussian([0, 1])]).fit(X)
+        scores = ad.anomaly_score(X)
+        np.testing.assert_allclose([ad.score_one(x) for x in X[:100]], scores[:100])
+        np.testing.assert_allclose(ad.score_one(list(X[0])), scores[0])
+
+        ad = pyisc.AnomalyDetector([pyisc.P_Gaussian(0), pyisc.P_Gaussian([0, 1])]).fit(X, y)
+        scores = ad.anomaly_score(X, y)
+        np.testing.assert_allclose([ad.score_one(x, c) for x, c in zip(X[:100], y[:100])], scores[:100])
+
+        # The classes are looked up again when the detector is refitted with other classes of the same number
+        y2 = np.array(['c', 'd'] * 500)
+        ad.fit(X, y2)
+        scores = ad.anomaly_score(X, y2)
+        np.testing.assert_allclose([ad.score_one(x, c) for x, c in zip(X[:100], y2[:100])], scores[:100])
+
+        self.assertRaises(ValueError, ad.score_one, X[0])
+        self.assertRaises(ValueError, pyisc.AnomalyDetector(pyisc.P_Gaussian(0)).fit(X).score_one, X[0], 'a')
+
 
 
 if __name__ == '__main__':
@@ -0,0 +1,90 @@
+import unittest
+
+import pickle
+import pyisc;
+import numpy as np
+from scipy.stats import norm
+from numpy.testing.utils import assert_allclose
+
+
+class MyTestCase(unittest.TestCase):
+    def _data(self):
+        po_normal = norm(1.1, 5)
+        po_anomaly = norm(1.5, 7)
+
+        po_normal2 = norm(2.2, 10)
+        po_anomaly2 = norm(3, 12)
+
+        gs_normal = norm(1, 12)
+        gs_anomaly = norm(2, 30)
+
+        normal_len = 100
+        anomaly_len = 15
+
+        return np.column_stack(
+            [
+                list(po_normal.rvs(normal_len)) + list(po_anomaly.rvs(anomaly_len)),
+                list(po_normal2.rvs(normal_len)) + list(po_anomaly2.rvs(anomaly_len)),
+                list(gs_normal.rvs(normal_len)) + list(gs_anomaly.rvs(anomaly_len)),
+            ]
+        )
+
+    def _detector(self):
+        return pyisc.AnomalyDetector(
+            component_models=[
+                pyisc.P_Gaussian(0),
+                pyisc.P_Gaussian(1),
+                pyisc.P_ConditionalGaussian([2], [0])
+            ],
+            output_combination_rule=pyisc.cr_max
+        )
+
+    def test_binary_export_import(self):
+        data = self._data()
+
+        anomaly_detector = self._detector()
+        anomaly_detector.fit(data);
+
+        binary = anomaly_detector.exportBinary()
+        self.assertTrue(binary.startswith(b"PYISCBIN"))
+        self.assertLess(len(binary), len(anomaly_detector.exportJSon()))
+
+        anomaly_detector2 = self._detector()
+        self.assertTrue(anomaly_detector2.importBinary(binary))
+
+        assert_allclose(anomaly_detector.anomaly_score(data), anomaly_detector2.anomaly_score(data))
+        self.assertEqual(binary, anomaly_detector2.exportBinary())
+        self.assertEqual(anomaly_detector.exportJSon(), anomaly_detector2.exportJSon())
+
+    def test_invalid_binary(self):
+        data = self._data()
+
+        anomaly_detector = self._detector()
+        anomaly_detector.fit(data);
+        binary = anomaly_detector.exportBinary()
+
+        anomaly_detector2 = self._detector()
+        self.assertFalse(anomaly_detector2.importBinary(b"NOTPYISC" + binary[8:]))
+        self.assertFalse(anomaly_detector2.importBinary(binary[:len(binary)//2]))
+
+    def test_pickle_json_state(self):
+        data = self._data()
+
+        anomaly_detector = self._detector()
+        anomaly_detector.fit(data);
+
+        # Pickles created before the binary format store the model as json
+        state = anomaly_detector.__getstate__()
+        del state['_anomaly_detector_binary']
+        state['_anomaly_detector_json'] = anomaly_detector.exportJSon()
+
+        anomaly_detector2 = pyisc.AnomalyDetector.__new__(pyisc.AnomalyDetector)
+        anomaly_detector2.__setstate__(state)
+        assert_allclose(anomaly_detector.anomaly_score(data), anomaly_detector2.anomaly_score(data))
+
+        anomaly_detector3 = pickle.loads(pickle.dumps(anomaly_detector))
+        assert_allclose(anomaly_detector.anomaly_score(data), anomaly_detector3.anomaly_score(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
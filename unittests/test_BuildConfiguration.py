@@ -0,0 +1,19 @@
+import unittest
+
+import pyisc
+
+
+class test_BuildConfiguration(unittest.TestCase):
+    def test_build_configuration(self):
+        configuration = pyisc.build_configuration()
+
+        self.assertIn(configuration['profile'], ['portable', 'optimized'])
+        self.assertEqual(configuration['lto'], configuration['profile'] == 'optimized')
+        self.assertIn(configuration['compiled_simd'], ['avx512f', 'avx2', 'baseline'])
+        if configuration['profile'] == 'portable':
+            self.assertNotIn('march', configuration)
+            self.assertNotIn('pgo', configuration)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,11 @@
+import os
+import tempfile
 import unittest
 
+import pyisc
+
 from pyisc import DataObject
-from numpy import array, c_,unique
+from numpy import array, c_,unique, float32, int32, zeros
 from scipy.stats import norm
 from numpy.testing.utils import assert_allclose, assert_equal
 
@@ -34,6 +38,84 @@ class test_DataObject(unittest.TestCase):
         assert_equal(X2.T[-1], new_y)
 
 
+    def test_dataobject_without_copy(self):
+        X = norm(1.0).rvs((1000, 3)).astype(float32)
+
+        DO = DataObject(X, copy=False)
+        assert_equal(DO.size(), 1000)
+        assert_equal(DO.length(), 3)
+        assert_allclose(DO.as_2d_array().astype(float), X)
+
+        # The data object shares memory with the wrapped array
+        X[0,0] = 42.0
+        assert_allclose(DO[0][0], 42.0)
+
+        S = zeros(1000, dtype=[('x', float32), ('y', float32), ('label', int32)])
+        S['x'] = X.T[0]
+        S['y'] = X.T[1]
+        S['label'] = [i % 2 for i in range(1000)]
+
+        DO = DataObject(S, class_column=2, classes=['a', 'b'], copy=False)
+        assert_equal(['a', 'b'], DO.classes_)
+        X2 = DO.as_2d_array()
+        assert_allclose(X2.T[:-1].T.astype(float), X.T[:2].T)
+        assert_equal(X2.T[-1], ['a' if i % 2 == 0 else 'b' for i in range(1000)])
+
+        # The element types of the columns must match the column types of a provided format
+        format = pyisc.Format()
+        format.addColumn("x", pyisc.Format.Continuous)
+        format.addColumn("y", pyisc.Format.Discrete)
+        format.addColumn("label", pyisc.Format.Symbol)
+        self.assertRaises(ValueError, DataObject, S, format=format, class_column=2, classes=['a', 'b'], copy=False)
+        format = pyisc.Format()
+        for name in ['x', 'y', 'label']:
+            format.addColumn(name, pyisc.Format.Continuous)
+        self.assertRaises(ValueError, DataObject, S, format=format, class_column=2, classes=['a', 'b'], copy=False)
+
+    def test_dataobject_class_encoding(self):
+        X = norm(1.0).rvs((1000, 2))
+        y = array(['b', 'a', 'c', 'a'] * 250, dtype=object)
+
+        DO = DataObject(c_[X, y], class_column=2)
+        assert_equal(['a', 'b', 'c'], DO.classes_)
+        assert_equal(DO.as_2d_array(numeric=True).T[-1], [1, 0, 2, 0] * 250)
+        assert_equal(DO.as_2d_array().T[-1], y)
+
+        # Unknown labels are encoded as -1 and decoded as None
+        DO = DataObject(c_[X, y], class_column=2, classes=['a', 'b'])
+        assert_equal(DO.as_2d_array(numeric=True).T[-1], [1, 0, -1, 0] * 250)
+        assert_equal(DO.as_2d_array().T[-1], ['b', 'a', None, 'a'] * 250)
+        self.assertRaises(ValueError, DO.set_column_values, 2, y)
+
+        # New labels are added in order of first appearance
+        classes = ['c']
+        ids = DataObject._class_ids(array([3, 1, 3, 2]), classes, add_new_classes=True)
+        assert_equal(['c', 3, 1, 2], classes)
+        assert_equal(ids, [1, 2, 1, 3])
+        ids = DataObject._class_ids([None, 'c', 1, None], classes, add_new_classes=True)
+        assert_equal(['c', 3, 1, 2, None], classes)
+        assert_equal(ids, [4, 0, 2, 4])
+
+    def test_dataobject_binary_file(self):
+        X = c_[norm(1.0).rvs((100, 2)), [i % 3 for i in range(100)]]
+        DO = DataObject(X, class_column=2)
+
+        filename = os.path.join(tempfile.mkdtemp(), "rows.bin")
+        DO.save_binary(filename)
+
+        DO2 = DataObject.load_binary(filename, class_column=2, classes=DO.classes_)
+        assert_equal(DO2.size(), 100)
+        assert_equal(DO2.length(), 3)
+        assert_equal(DO2.getFormat().get_nth_column(2).getnum(), 3)
+        assert_allclose(DO2.as_2d_array().astype(float), DO.as_2d_array().astype(float))
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0,1]))
+        ad.fit(DO)
+        assert_allclose(ad.anomaly_score(DO2), ad.anomaly_score(DO))
+
+        self.assertRaises(IOError, DataObject.load_binary, filename + ".missing")
+
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,70 @@
+import pickle
+import unittest
+
+import numpy as np
+import pyisc
+from numpy.testing.utils import assert_allclose
+
+
+class MyTestCase(unittest.TestCase):
+    def _data(self):
+        X = np.r_[np.random.normal(0, 1, (500, 2)), np.random.normal(10, 3, (500, 2))]
+        entities = np.array(['host a'] * 500 + ['host b'] * 500)
+        order = np.random.permutation(len(X))
+        return X[order], entities[order]
+
+    def test_bank_equals_one_detector_per_entity(self):
+        X, entities = self._data()
+        models = [pyisc.P_Gaussian(0), pyisc.P_Gaussian([0, 1])]
+
+        bank = pyisc.DetectorBank(models)
+        bank.fit(X, entities)
+        self.assertEqual(['host a', 'host b'] if entities[0] == 'host a' else ['host b', 'host a'], bank.entities_)
+        self.assertTrue(bank.is_trained('host a'))
+        self.assertFalse(bank.is_trained('host c'))
+
+        scores = bank.anomaly_score(X, entities)
+        for entity in ['host a', 'host b']:
+            ad = pyisc.AnomalyDetector(models).fit(X[entities == entity])
+            assert_allclose(ad.anomaly_score(X[entities == entity]), scores[entities == entity], rtol=1e-3)
+
+        # Rows of unknown entities are not scored
+        self.assertTrue(np.isnan(bank.anomaly_score(X[:3], ['host c'] * 3)).all())
+
+        bank.reset_entity('host a')
+        self.assertFalse(bank.is_trained('host a'))
+        self.assertTrue(np.isnan(bank.anomaly_score(X[:3], ['host a'] * 3)).all())
+
+    def test_unfit(self):
+        X, entities = self._data()
+
+        bank = pyisc.DetectorBank(pyisc.P_Gaussian([0, 1]))
+        bank.fit(X, entities)
+        bank.fit(X[:100], entities[:100])
+        bank.unfit(X[:100], entities[:100])
+
+        bank2 = pyisc.DetectorBank(pyisc.P_Gaussian([0, 1])).fit(X, entities)
+        assert_allclose(bank.anomaly_score(X, entities), bank2.anomaly_score(X, entities), rtol=1e-3)
+
+    def test_pickle(self):
+        X, entities = self._data()
+
+        bank = pyisc.DetectorBank(pyisc.P_Gaussian([0, 1])).fit(X, entities)
+        bank2 = pickle.loads(pickle.dumps(bank))
+
+        self.assertEqual(bank.entities_, bank2.entities_)
+        assert_allclose(bank.anomaly_score(X, entities), bank2.anomaly_score(X, entities))
+
+    def test_clone(self):
+        X, entities = self._data()
+
+        bank = pyisc.DetectorBank(pyisc.P_Gaussian([0, 1])).fit(X, entities)
+        clone = bank.clone()
+        assert_allclose(bank.anomaly_score(X, entities), clone.anomaly_score(X, entities))
+
+        # The copy is trained independently of the bank
+        clone.fit(X[:100] + 5, entities[:100])
+        self.assertFalse(np.allclose(bank.anomaly_score(X, entities), clone.anomaly_score(X, entities)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+import pyisc
+
+
+class MyTestCase(unittest.TestCase):
+    def tearDown(self):
+        pyisc.disable_instrumentation()
+        pyisc.reset_instrumentation_stats()
+
+    def test_stats_and_callback(self):
+        X = np.c_[np.random.normal(0, 1, 1000), np.random.normal(5, 2, 1000)]
+        y = np.array(['a', 'b'] * 500)
+
+        calls = []
+        pyisc.enable_instrumentation(lambda stage, seconds, rows, num_of_bytes: calls.append((stage, rows)))
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X, y)
+        ad.anomaly_score(X, y)
+
+        stats = pyisc.instrumentation_stats()
+        for stage in ['convert_to_data_object', 'DataObject', 'class_mapping', 'TrainData', 'CalcAnomaly']:
+            self.assertIn(stage, stats)
+        self.assertEqual(stats['TrainData'], dict(stats['TrainData'], calls=1, rows=1000))
+        self.assertEqual(stats['CalcAnomaly']['rows'], 1000)
+        self.assertGreater(stats['DataObject']['bytes'], 0)
+        self.assertIn(('CalcAnomaly', 1000), calls)
+
+    def test_disabled(self):
+        X = np.random.normal(0, 1, (100, 1))
+
+        pyisc.AnomalyDetector(pyisc.P_Gaussian(0)).fit(X).anomaly_score(X)
+
+        self.assertEqual({}, pyisc.instrumentation_stats())
+
+    def test_nested_stages_are_exclusive(self):
+        X = np.c_[np.random.normal(0, 1, 1000), np.random.normal(5, 2, 1000)]
+
+        pyisc.enable_instrumentation()
+        pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X)
+
+        # The DataObject is created within convert_to_data_object, so its time is excluded from the conversion
+        stats = pyisc.instrumentation_stats()
+        conversion = stats['convert_to_data_object']
+        self.assertGreaterEqual(conversion['inclusive_seconds'], conversion['seconds'] + stats['DataObject']['seconds'])
+        self.assertEqual(stats['DataObject']['seconds'], stats['DataObject']['inclusive_seconds'])
+
+    def test_per_detector(self):
+        X = np.random.normal(0, 1, (100, 1))
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian(0)).enable_instrumentation()
+        ad.fit(X).anomaly_score(X)
+        pyisc.AnomalyDetector(pyisc.P_Gaussian(0)).fit(X).anomaly_score(X)
+
+        # Only the stages of the instrumented detector are recorded, including the data objects it creates
+        stats = ad.instrumentation_stats()
+        self.assertEqual(1, stats['TrainData']['calls'])
+        self.assertEqual(2, stats['DataObject']['calls'])
+        self.assertEqual({}, pyisc.instrumentation_stats())
+
+    def test_threads(self):
+        from threading import Thread
+        X = np.random.normal(0, 1, (100, 1))
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian(0)).fit(X)
+        ad.enable_instrumentation()
+
+        threads = [Thread(target=lambda: [ad.anomaly_score(X) for _ in range(50)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = ad.instrumentation_stats()
+        self.assertEqual(200, stats['CalcAnomaly']['calls'])
+        self.assertEqual(200 * len(X), stats['CalcAnomaly']['rows'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+import pyisc
+
+
+class test_QuantileSketch(unittest.TestCase):
+    def test_quantiles(self):
+        values = np.random.RandomState(1).normal(0, 1, 100000)
+
+        sketch = pyisc.QuantileSketch(200, random_state=1)
+        for chunk in np.array_split(values, 100):
+            sketch.update(chunk)
+
+        self.assertEqual(sketch.count, len(values))
+        self.assertLess(sum([len(c) for c in sketch._compactors]), 1000)
+        for q in [0.01, 0.1, 0.5, 0.9, 0.99]:
+            rank = (values <= sketch.quantile(q)).mean()
+            self.assertAlmostEqual(rank, q, delta=0.02)
+
+        self.assertTrue(np.isnan(pyisc.QuantileSketch().quantile(0.5)))
+
+    def test_merge(self):
+        values = np.random.RandomState(2).exponential(1, 20000)
+
+        sketches = [pyisc.QuantileSketch(200, random_state=i).update(part) for i, part in enumerate(np.array_split(values, 4))]
+        sketch = sketches[0]
+        for other in sketches[1:]:
+            sketch.merge(other)
+
+        self.assertEqual(sketch.count, len(values))
+        ranks = [(values <= x).mean() for x in sketch.quantile([0.05, 0.5, 0.95])]
+        np.testing.assert_allclose(ranks, [0.05, 0.5, 0.95], atol=0.02)
+
+    def test_streaming_threshold(self):
+        X = np.random.RandomState(3).normal(0, 1, (4000, 2))
+
+        outlier_detector = pyisc.SklearnOutlierDetector(0.05, pyisc.P_Gaussian([0, 1]), sketch_size=200)
+        outlier_detector.fit(X[:1000])
+        for start in range(1000, len(X), 500):
+            outlier_detector.fit_incrementally(X[start:start + 500])
+
+        self.assertEqual(outlier_detector.score_sketch_.count, len(X))
+        self.assertAlmostEqual((outlier_detector.predict(X) == -1).mean(), 0.05, delta=0.02)
+
+    def test_scoring_does_not_change_threshold(self):
+        X = np.random.RandomState(4).normal(0, 1, (2000, 2))
+
+        outlier_detector = pyisc.SklearnOutlierDetector(0.05, pyisc.P_Gaussian([0, 1]), sketch_size=200)
+        outlier_detector.fit(X[:1000])
+        outlier_detector.fit_incrementally(X[1000:])
+        threshold = outlier_detector.threshold_
+        count = outlier_detector.score_sketch_.count
+
+        predictions = outlier_detector.predict(X)
+        np.testing.assert_array_equal(predictions, outlier_detector.predict(X))
+        outlier_detector.decision_function(X)
+        outlier_detector.anomaly_score(X)
+        self.assertEqual(threshold, outlier_detector.threshold_)
+        self.assertEqual(count, outlier_detector.score_sketch_.count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+import pyisc
+from numpy.testing.utils import assert_allclose, assert_equal
+
+
+class test_SklearnClassifier(unittest.TestCase):
+    def test_classify_many_classes(self):
+        num_of_classes = 20
+        y = np.array([i % num_of_classes for i in range(4000)])
+        X = np.c_[np.random.normal(y, 0.1), np.random.normal(-y, 0.1)]
+
+        clf = pyisc.SklearnClassifier(pyisc.P_Gaussian([0, 1])).fit(X, y)
+
+        logps = clf.compute_logp(X)
+        assert_equal(np.array(logps).shape, (num_of_classes, len(X)))
+
+        # The native call rejects a log probability array of the wrong size instead of leaving it uninitialized
+        data_object = pyisc.DataObject(np.c_[X, y], class_column=2, classes=clf.classes_)
+        self.assertFalse(clf._anomaly_detector._LogProbabilityOfDataPerClass(data_object, np.empty((len(X) - 1, num_of_classes))))
+        self.assertFalse(clf._anomaly_detector._LogProbabilityOfDataPerClass(data_object, np.empty((len(X), 0))))
+
+        probs = clf.predict_proba(X)
+        assert_equal(probs.shape, (len(X), num_of_classes))
+        assert_allclose(probs.sum(1), 1.0)
+
+        self.assertGreater((clf.predict(X) == y).mean(), 0.95)
+
+    def test_partial_fit(self):
+        y = np.array(['a', 'b', 'c', 'd'] * 1000)
+        centers = np.array([['a', 'b', 'c', 'd'].index(c) for c in y]) * 2.0
+        X = np.c_[np.random.normal(centers, 0.1), np.random.normal(-centers, 0.1)]
+
+        clf = pyisc.SklearnClassifier(pyisc.P_Gaussian([0, 1]))
+        clf.partial_fit(X[:1000][y[:1000] != 'd'], y[:1000][y[:1000] != 'd'], classes=['b', 'a'])
+        assert_equal(clf.classes_, ['b', 'a', 'c'])
+        for start in range(1000, len(X), 1000):
+            clf.partial_fit(X[start:start + 1000], y[start:start + 1000])
+        assert_equal(clf.classes_, ['b', 'a', 'c', 'd'])
+
+        self.assertGreater((clf.predict(X) == y).mean(), 0.95)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -39,6 +39,36 @@ class test_SklearnOutlierDetection(unittest.TestCase):
         print("accuracy", accuracy)
         self.assertGreater(accuracy, 0.85)
 
+    def test_partial_fit(self):
+        X = np.random.RandomState(4).normal(0, 1, (5000, 2))
+        X[-100:] = np.random.RandomState(5).uniform(-10, 10, (100, 2))
+
+        outlier_detector = pyisc.SklearnOutlierDetector(0.02, pyisc.P_Gaussian([0, 1]))
+        for start in range(0, len(X), 500):
+            outlier_detector.partial_fit(X[start:start + 500])
+
+        self.assertEqual(outlier_detector.score_sketch_.count, len(X) - 500)
+        predictions = outlier_detector.predict(X)
+        self.assertGreater((predictions[-100:] == -1).mean(), 0.5)
+        self.assertLess((predictions[:-100] == -1).mean(), 0.05)
+
+    def test_partial_fit_first_batch_and_new_classes(self):
+        X = np.random.RandomState(6).normal(0, 1, (2000, 2))
+        y = np.array(['a'] * 1000 + ['a', 'b'] * 500)
+        X[y == 'b'] += 10
+
+        # The first batch is trained as by fit
+        outlier_detector = pyisc.SklearnOutlierDetector(0.02, pyisc.P_Gaussian([0, 1]))
+        outlier_detector.partial_fit(X[:1000], y[:1000])
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[:1000], y[:1000])
+        np.testing.assert_allclose(ad.anomaly_score(X[:1000], y[:1000]),
+                                   pyisc.AnomalyDetector.anomaly_score(outlier_detector, X[:1000], y[:1000]))
+
+        # The class that is new in the second batch is added before the batch is scored and trained
+        outlier_detector.partial_fit(X[1000:], y[1000:])
+        self.assertEqual(['a', 'b'], outlier_detector.classes_)
+        self.assertEqual(1000, outlier_detector.score_sketch_.count)
+
 
 
 
@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+import pyisc
+from numpy.testing.utils import assert_allclose
+
+
+class MyTestCase(unittest.TestCase):
+    def test_count_based_window(self):
+        X = np.c_[np.random.normal(0, 1, 3000), np.random.normal(5, 2, 3000)]
+
+        detector = pyisc.SlidingWindowDetector(1000, None, [pyisc.P_Gaussian(0), pyisc.P_Gaussian([0, 1])])
+        for i in range(0, len(X), 250):
+            detector.update(X[i:i + 250])
+
+        self.assertEqual(detector.window_length(), 1000)
+
+        ad = pyisc.AnomalyDetector([pyisc.P_Gaussian(0), pyisc.P_Gaussian([0, 1])]).fit(X[-1000:])
+
+        assert_allclose(ad.anomaly_score(X), detector.anomaly_score(X), rtol=1e-3)
+
+    def test_time_based_window(self):
+        X = np.random.normal(0, 1, (1000, 1))
+        timestamps = np.arange(1000)
+
+        detector = pyisc.SlidingWindowDetector(10000, 100, pyisc.P_Gaussian(0))
+        detector.update(X, timestamps=timestamps)
+
+        # Only rows with time stamps within 100 time units of the newest row are kept
+        self.assertEqual(detector.window_length(), 100)
+
+        detector.expire(timestamps[-1] + 50)
+        self.assertEqual(detector.window_length(), 50)
+
+        # Expiring relative to an earlier time does not remove any rows
+        detector.expire(timestamps[-1])
+        self.assertEqual(detector.window_length(), 50)
+
+    def test_out_of_order_time_stamps(self):
+        X = np.random.normal(0, 1, (300, 1))
+
+        detector = pyisc.SlidingWindowDetector(10000, 100, pyisc.P_Gaussian(0))
+        detector.update(X[:200], timestamps=np.arange(200))
+        scores = detector.anomaly_score(X)
+
+        # Time stamps that decrease within a batch or relative to the newest row are rejected without training any row
+        self.assertRaises(ValueError, detector.update, X[200:300], timestamps=np.r_[200:250, 240:290])
+        self.assertRaises(ValueError, detector.update, X[200:300], timestamps=np.arange(150, 250))
+        self.assertEqual(detector.window_length(), 100)
+        assert_allclose(scores, detector.anomaly_score(X))
+
+        # A time stamp equal to the newest is accepted, and only the rows with time stamps after 198 are kept
+        detector.update(X[200:300], timestamps=np.arange(199, 299))
+        self.assertEqual(detector.window_length(), 101)
+
+    def test_max_age(self):
+        self.assertRaises(ValueError, pyisc.SlidingWindowDetector, 1000, 0, pyisc.P_Gaussian(0))
+        self.assertRaises(ValueError, pyisc.SlidingWindowDetector, 1000, -1, pyisc.P_Gaussian(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
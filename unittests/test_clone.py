@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+import pyisc
+from numpy.testing.utils import assert_allclose
+
+
+class MyTestCase(unittest.TestCase):
+    def test_clone_is_independent(self):
+        X = np.c_[np.random.normal(0, 1, 2000), np.random.normal(5, 2, 2000)]
+
+        ad = pyisc.AnomalyDetector([pyisc.P_Gaussian(0), pyisc.P_ConditionalGaussian([1], [0])]).fit(X[:1000])
+        scores = ad.anomaly_score(X)
+
+        clone = ad.clone()
+        self.assertIsInstance(clone, pyisc.AnomalyDetector)
+        assert_allclose(clone.anomaly_score(X), scores)
+
+        # Training the clone does not change the original and equals training a detector on all data
+        clone.fit_incrementally(X[1000:])
+        assert_allclose(ad.anomaly_score(X), scores)
+        assert_allclose(clone.anomaly_score(X),
+                        pyisc.AnomalyDetector([pyisc.P_Gaussian(0), pyisc.P_ConditionalGaussian([1], [0])]).fit(X).anomaly_score(X),
+                        rtol=1e-3)
+
+    def test_clone_with_classes(self):
+        X = np.c_[np.random.normal(0, 1, 1000), np.random.normal(5, 2, 1000)]
+        y = np.array(['a', 'b'] * 500)
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X, y)
+        clone = ad.clone()
+
+        self.assertEqual(ad.classes_, clone.classes_)
+        self.assertIsNot(ad.classes_, clone.classes_)
+        assert_allclose(clone.anomaly_score(X, y), ad.anomaly_score(X, y))
+
+    def test_copied_classifier(self):
+        X = np.c_[np.random.normal(0, 1, 1000), np.random.normal(5, 2, 1000)]
+        y = np.array(['a', 'b'] * 500)
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X, y)
+        scores = ad.anomaly_score(X, y)
+
+        clf = pyisc.SklearnClassifier.clf(ad, copy=True)
+        self.assertIsNot(ad._anomaly_detector, clf._anomaly_detector)
+        clf.fit_incrementally(X[:100], y[:100])
+        assert_allclose(ad.anomaly_score(X, y), scores)
+
+        shared = pyisc.SklearnClassifier.clf(ad)
+        self.assertIs(ad._anomaly_detector, shared._anomaly_detector)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+import pyisc
+from numpy.testing.utils import assert_allclose, assert_equal
+
+
+class MyTestCase(unittest.TestCase):
+    def test_fit_stream(self):
+        X = np.c_[np.random.normal(0, 1, 5000), np.random.normal(5, 2, 5000)]
+
+        component_models = [pyisc.P_Gaussian(0), pyisc.P_Gaussian([0, 1])]
+
+        ad = pyisc.AnomalyDetector(component_models).fit(X)
+
+        chunks = (X[i:i + 1500] for i in range(0, len(X), 1500))
+        ad_stream = pyisc.AnomalyDetector(component_models).fit_stream(chunks, chunk_rows=1000)
+
+        assert_allclose(ad.anomaly_score(X), ad_stream.anomaly_score(X), rtol=1e-4)
+
+    def test_fit_stream_with_classes(self):
+        y = np.array(['a', 'b'] * 2500)
+        X = np.c_[np.random.normal(0, 1, 5000), np.random.normal(5, 2, 5000)]
+        X[y == 'b'] += 10
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X, y)
+
+        chunks = ((X[i:i + 1500], y[i:i + 1500]) for i in range(0, len(X), 1500))
+        ad_stream = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit_stream(chunks, chunk_rows=1000)
+
+        assert_equal(ad.classes_, ad_stream.classes_)
+        assert_allclose(ad.anomaly_score(X, y), ad_stream.anomaly_score(X, y), rtol=1e-4)
+
+    def test_fit_stream_in_snapshot_mode(self):
+        X = np.c_[np.random.normal(0, 1, 5000), np.random.normal(5, 2, 5000)]
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[:1000])
+        ad_stream = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[:1000]).set_snapshot_mode()
+        published = ad_stream._anomaly_detector
+        scores = ad_stream.anomaly_score(X)
+
+        chunks = (X[i:i + 1500] for i in range(0, len(X), 1500))
+        ad_stream.fit_stream(chunks, chunk_rows=1000)
+
+        # The stream is trained on a copy of the model, which is published at the end
+        self.assertIsNot(published, ad_stream._anomaly_detector)
+        assert_allclose(published._CalcAnomaly(pyisc.DataObject(X), len(X)), scores)
+        assert_allclose(ad.fit(X).anomaly_score(X), ad_stream.anomaly_score(X), rtol=1e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
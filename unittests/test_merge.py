@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+import pyisc
+from numpy.testing.utils import assert_allclose
+
+
+class MyTestCase(unittest.TestCase):
+    def test_merge_gaussian(self):
+        X = np.c_[np.random.normal(0, 1, 2000), np.random.normal(5, 2, 2000)]
+
+        component_models = [pyisc.P_Gaussian(0), pyisc.P_Gaussian([0, 1])]
+
+        ad = pyisc.AnomalyDetector(component_models).fit(X)
+
+        ad1 = pyisc.AnomalyDetector(component_models).fit(X[:500])
+        ad2 = pyisc.AnomalyDetector(component_models).fit(X[500:1200])
+        ad3 = pyisc.AnomalyDetector(component_models).fit(X[1200:])
+
+        ad1.merge(ad2).merge(ad3)
+
+        assert_allclose(ad.anomaly_score(X), ad1.anomaly_score(X), rtol=1e-4)
+
+    def test_merge_poisson(self):
+        X = np.c_[np.random.poisson(10, 2000), np.ones(2000)]
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Poisson(0, 1)).fit(X)
+        ad1 = pyisc.AnomalyDetector(pyisc.P_Poisson(0, 1)).fit(X[:1000])
+        ad2 = pyisc.AnomalyDetector(pyisc.P_Poisson(0, 1)).fit(X[1000:])
+
+        assert_allclose(ad.anomaly_score(X), ad1.merge(ad2).anomaly_score(X), rtol=1e-4)
+
+    def test_merge_classes(self):
+        X = np.r_[np.c_[np.random.normal(0, 1, 1000), np.random.normal(5, 2, 1000)],
+                  np.c_[np.random.normal(3, 2, 1000), np.random.normal(-1, 1, 1000)]]
+        y = np.array([0] * 1000 + [1] * 1000)
+
+        # Both shards have the same number of rows of each class, so that their per class statistics are equal
+        shard1 = np.r_[0:500, 1000:1500]
+        shard2 = np.r_[500:1000, 1500:2000]
+
+        component_models = [pyisc.P_Gaussian(0), pyisc.P_Gaussian([0, 1])]
+
+        ad = pyisc.AnomalyDetector(component_models).fit(X, y)
+        ad1 = pyisc.AnomalyDetector(component_models).fit(X[shard1], y[shard1])
+        ad2 = pyisc.AnomalyDetector(component_models).fit(X[shard2], y[shard2])
+
+        assert_allclose(ad.anomaly_score(X, y), ad1.merge(ad2).anomaly_score(X, y), rtol=1e-4)
+
+    def test_merge_classes_unequal_shards(self):
+        X = np.r_[np.c_[np.random.poisson(10, 1000), np.ones(1000)],
+                  np.c_[np.random.poisson(3, 1000), np.ones(1000)]]
+        y = np.array([0] * 1000 + [1] * 1000)
+
+        # The shards have different numbers of rows in total and of each class
+        shard1 = np.r_[0:200, 1000:1700]
+        shard2 = np.r_[200:1000, 1700:2000]
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Poisson(0, 1)).fit(X, y)
+        ad1 = pyisc.AnomalyDetector(pyisc.P_Poisson(0, 1)).fit(X[shard1], y[shard1])
+        ad2 = pyisc.AnomalyDetector(pyisc.P_Poisson(0, 1)).fit(X[shard2], y[shard2])
+
+        assert_allclose(ad.anomaly_score(X, y), ad1.merge(ad2).anomaly_score(X, y), rtol=1e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
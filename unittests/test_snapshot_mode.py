@@ -0,0 +1,180 @@
+import threading
+import unittest
+
+import numpy as np
+import pyisc
+from numpy.testing.utils import assert_allclose
+
+
+class MyTestCase(unittest.TestCase):
+    def test_snapshot_training_equals_incremental_training(self):
+        X = np.c_[np.random.normal(0, 1, 2000), np.random.normal(5, 2, 2000)]
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[:1000])
+        ad2 = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[:1000]).set_snapshot_mode()
+
+        published = ad2._anomaly_detector
+        scores = ad2.anomaly_score(X)
+        for i in range(1000, 2000, 100):
+            ad.fit_incrementally(X[i:i + 100])
+            ad2.fit_incrementally(X[i:i + 100])
+        ad.unfit_incrementally(X[:100])
+        ad2.unfit_incrementally(X[:100])
+
+        assert_allclose(ad.anomaly_score(X), ad2.anomaly_score(X))
+
+        # The previously published model is not changed by the training
+        self.assertIsNot(published, ad2._anomaly_detector)
+        assert_allclose(published._CalcAnomaly(pyisc.DataObject(X), len(X)), scores)
+
+    def test_scoring_during_training(self):
+        X = np.c_[np.random.normal(0, 1, 5000), np.random.normal(5, 2, 5000)]
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[:1000]).set_snapshot_mode()
+
+        errors = []
+
+        def score():
+            try:
+                for _ in range(20):
+                    self.assertFalse(np.isnan(ad.anomaly_score(X[:1000])).any())
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=score) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for i in range(1000, 5000, 100):
+            ad.fit_incrementally(X[i:i + 100])
+        for reader in readers:
+            reader.join()
+
+        self.assertEqual([], errors)
+        assert_allclose(ad.anomaly_score(X), pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X).anomaly_score(X), rtol=1e-3)
+
+    def _score_concurrently(self, ad, X, train=lambda: None):
+        results = []
+
+        def score():
+            for _ in range(20):
+                scores = ad.anomaly_score(X)
+                logps = ad.compute_logp(X)
+                results.append((scores, logps))
+
+        readers = [threading.Thread(target=score) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        train()
+        for reader in readers:
+            reader.join()
+        self.assertEqual(4 * 20, len(results))
+        return results
+
+    def test_concurrent_scores_equal_serial_scores(self):
+        X = np.c_[np.random.normal(0, 1, 1000), np.random.normal(5, 2, 1000)]
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X)
+        serial = (ad.anomaly_score(X), ad.compute_logp(X))
+
+        for scores, logps in self._score_concurrently(ad, X):
+            self.assertTrue(np.array_equal(serial[0], scores))
+            self.assertTrue(np.array_equal(serial[1], logps))
+
+    def test_concurrent_scores_during_training_equal_serial_scores(self):
+        X = np.c_[np.random.normal(0, 1, 5000), np.random.normal(5, 2, 5000)]
+
+        # The scores of each model that is published while training, computed serially
+        serial_ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[:1000])
+        serial = [(serial_ad.anomaly_score(X[:1000]), serial_ad.compute_logp(X[:1000]))]
+        for i in range(1000, 5000, 100):
+            serial_ad.fit_incrementally(X[i:i + 100])
+            serial.append((serial_ad.anomaly_score(X[:1000]), serial_ad.compute_logp(X[:1000])))
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[:1000]).set_snapshot_mode()
+
+        def train():
+            for i in range(1000, 5000, 100):
+                ad.fit_incrementally(X[i:i + 100])
+
+        # The scores and log probabilities may have been computed with different published models
+        for scores, logps in self._score_concurrently(ad, X[:1000], train):
+            self.assertTrue(any(np.allclose(expected_scores, scores) for expected_scores, _ in serial))
+            self.assertTrue(any(np.allclose(expected_logps, logps) for _, expected_logps in serial))
+
+    def test_publish_interval(self):
+        X = np.c_[np.random.normal(0, 1, 2000), np.random.normal(5, 2, 2000)]
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[:1000])
+        ad2 = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[:1000]).set_snapshot_mode(publish_rows=300)
+
+        # The changes are not published until 300 rows have been trained
+        published = ad2._anomaly_detector
+        for i in range(1000, 1300, 100):
+            self.assertIs(published, ad2._anomaly_detector)
+            ad.fit_incrementally(X[i:i + 100])
+            ad2.fit_incrementally(X[i:i + 100])
+        self.assertIsNot(published, ad2._anomaly_detector)
+        assert_allclose(ad.anomaly_score(X), ad2.anomaly_score(X))
+
+        # Pending changes are published on request
+        published = ad2._anomaly_detector
+        ad.fit_incrementally(X[1300:1400])
+        ad2.fit_incrementally(X[1300:1400])
+        self.assertIs(published, ad2._anomaly_detector)
+        ad2.publish()
+        self.assertIsNot(published, ad2._anomaly_detector)
+        assert_allclose(ad.anomaly_score(X), ad2.anomaly_score(X))
+
+        # Pending changes are published when the detector is copied or snapshot mode is disabled
+        ad.fit_incrementally(X[1400:1500])
+        ad2.fit_incrementally(X[1400:1500])
+        assert_allclose(ad.anomaly_score(X), ad2.clone().anomaly_score(X))
+        ad.fit_incrementally(X[1500:1600])
+        ad2.fit_incrementally(X[1500:1600])
+        ad2.set_snapshot_mode(False)
+        assert_allclose(ad.anomaly_score(X), ad2.anomaly_score(X))
+
+        self.assertRaises(ValueError, ad2.set_snapshot_mode, publish_rows=0)
+        self.assertRaises(ValueError, ad2.set_snapshot_mode, publish_seconds=-1)
+
+    def test_fit_and_reset_publish_a_new_model(self):
+        X = np.c_[np.random.normal(0, 1, 2000), np.random.normal(5, 2, 2000)]
+
+        ad = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[:1000]).set_snapshot_mode()
+        published = ad._anomaly_detector
+        scores = ad.anomaly_score(X)
+
+        ad.fit(X[1000:] + 3)
+        self.assertIsNot(published, ad._anomaly_detector)
+        assert_allclose(published._CalcAnomaly(pyisc.DataObject(X), len(X)), scores)
+        assert_allclose(ad.anomaly_score(X), pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[1000:] + 3).anomaly_score(X))
+
+        published = ad._anomaly_detector
+        ad.reset()
+        self.assertIsNot(published, ad._anomaly_detector)
+        ad.fit_incrementally(X[:1000])
+        ad2 = pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[:1000])
+        ad2.reset()
+        ad2.fit_incrementally(X[:1000])
+        assert_allclose(ad.anomaly_score(X), ad2.anomaly_score(X))
+
+        ad.merge(pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[1000:]))
+        ad2.merge(pyisc.AnomalyDetector(pyisc.P_Gaussian([0, 1])).fit(X[1000:]))
+        assert_allclose(ad.anomaly_score(X), ad2.anomaly_score(X))
+
+    def test_replicas_are_replaced_when_the_model_changes(self):
+        X = np.c_[np.random.normal(0, 1, 10000), np.random.normal(5, 2, 10000)]
+
+        ad = pyisc.AnomalyDetector([pyisc.P_Gaussian(0), pyisc.P_Gaussian([0, 1])]).fit(X)
+        self.assertTrue(np.array_equal(ad.anomaly_score(X), ad.anomaly_score(X, n_jobs=4)))
+
+        # The idle replicas used by the threads are deleted when the model is trained
+        ad.fit_incrementally(X[:1000] + 3)
+        self.assertTrue(np.array_equal(ad.anomaly_score(X), ad.anomaly_score(X, n_jobs=4)))
+        ad.reset()
+        ad.fit_incrementally(X[:1000])
+        self.assertTrue(np.array_equal(ad.anomaly_score(X), ad.anomaly_score(X, n_jobs=4)))
+
+
+if __name__ == '__main__':
+    unittest.main()